@@ -0,0 +1,33 @@
+"""
+서버 실행 진입점 (`python -m app`)
+
+MP3 인코더 프로세스 풀은 spawn 방식이라 자식 프로세스가 실행 중인 메인 모듈을 다시 import합니다.
+`python -m app.main`으로 띄우면 자식마다 app.main(라우터, LLM/TTS SDK, 저장소)을 통째로 불러오므로,
+이름이 `*.__main__`인 메인 모듈은 다시 불러오지 않는 점을 이용해 실행기를 이 모듈에 둡니다.
+"""
+
+from app.config import settings
+
+
+def run():
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=14056,
+        reload=settings.debug,
+        log_level="info",
+        # 🚀 타임아웃 설정 대폭 증가 (무제한에 가깝게)
+        timeout_keep_alive=7200,  # 2시간
+        timeout_graceful_shutdown=60,  # 60초
+        access_log=True,
+        # 워커 설정 (2개 이상이면 작업 상태는 SQLite, 알림은 Unix 소켓 브로커로 공유)
+        workers=settings.app_workers,
+        # 추가 설정 - limit 파라미터들 제거 (None이나 생략하면 무제한)
+        loop="asyncio"
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -1,122 +1,88 @@
+import importlib
+import sys
+import time
+from collections import Counter
+from typing import Dict, Any, List
+
 from fastapi import APIRouter
 
-from app.api.v1.tts import router as tts_router
-from app.api.v1.stt import router as stt_router
-from app.api.v1.orthography import router as orthography_router
-from app.api.v1.quiz import router as quiz_router
-from app.api.v1.lyrics import router as lyrics_router
-from app.api.v1.translation import router as translation_router
-from app.api.v1.summary import router as summary_router
-from app.api.v1.explanation import router as explanation_router
-from app.api.v1.main_crawler import router as main_crawler_router
-from app.api.v1.crawler_analysis import router as crawler_analysis_router
-from app.api.v1.song import router as song_router
-from app.api.v1.language_detection import router as language_detection_router
-from app.api.v1.content_category import router as content_category_router
-from app.api.v1.finger_detection import router as finger_detection_router
-from app.api.v1.visualization import router as visualization_router
-from app.api.v1.play import router as play_router
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('router')
 
 
 api_prefix = "/api/v1"
 
+# (라우터 모듈, 태그) - 등록 순서 유지
+_ROUTERS = [
+    ("app.api.v1.tts", "TTS 서비스"),
+    ("app.api.v1.stt", "STT 서비스"),
+    ("app.api.v1.orthography", "텍스트 처리 서비스"),
+    ("app.api.v1.quiz", "퀴즈 생성 서비스"),
+    ("app.api.v1.lyrics", "가사 생성 서비스"),
+    ("app.api.v1.translation", "번역 서비스"),
+    ("app.api.v1.summary", "요약 생성 서비스"),
+    ("app.api.v1.explanation", "문제 풀이 서비스"),
+    ("app.api.v1.main_crawler", "메인 크롤러 서비스"),
+    ("app.api.v1.crawler_analysis", "크롤러 분석 서비스"),
+    ("app.api.v1.song", "노래 생성 서비스"),
+    ("app.api.v1.language_detection", "언어 감지 서비스"),
+    ("app.api.v1.content_category", "콘텐츠 카테고리 서비스"),
+    ("app.api.v1.finger_detection", "손가락 인식 서비스"),
+    ("app.api.v1.visualization", "시각화 생성 서비스"),
+    ("app.api.v1.play", "연극 서비스"),
+]
+
+# 라우터별 import 시간 리포트 (콜드 스타트 추적용)
+_import_report: List[Dict[str, Any]] = []
+
+
+def _import_router(module_path: str) -> APIRouter:
+    """라우터 모듈을 import하고 소요 시간과 새로 불러온 모듈 수를 기록
+
+    앞선 라우터가 이미 불러온 의존성은 다시 계산하지 않으므로 (import 순서 기준 증분)
+    공통 의존성은 처음 불러온 라우터에 잡힙니다. 모듈 단위 상세는 `python -X importtime -c "import app.main"`.
+    """
+    before = set(sys.modules)
+    started = time.perf_counter()
+    module = importlib.import_module(module_path)
+    seconds = time.perf_counter() - started
+    new_modules = set(sys.modules) - before
+    packages = Counter(name.split(".")[0] for name in new_modules)
+    _import_report.append({
+        "router": module_path.rsplit(".", 1)[-1],
+        "seconds": round(seconds, 3),
+        "new_modules": len(new_modules),
+        "top_packages": dict(packages.most_common(5)),
+    })
+    return module.router
+
+
+def get_import_report() -> Dict[str, Any]:
+    """라우터별 import 시간 (느린 순)"""
+    return {
+        "total_seconds": round(sum(item["seconds"] for item in _import_report), 3),
+        "routers": sorted(_import_report, key=lambda item: item["seconds"], reverse=True),
+    }
+
+
+def log_import_report(top: int = 5):
+    """시작 시 라우터 import 시간 요약 로그"""
+    report = get_import_report()
+    logger.info(f"⏱️ 라우터 import 총 {report['total_seconds']:.2f}초 ({len(report['routers'])}개)")
+    for item in report["routers"][:top]:
+        packages = ", ".join(f"{name}({count})" for name, count in item["top_packages"].items())
+        logger.info(f"   {item['router']}: {item['seconds']:.2f}초, 모듈 {item['new_modules']}개 [{packages}]")
+
+
 def get_integrated_router():
     integrated_router = APIRouter()
-    
-    integrated_router.include_router(
-        tts_router,
-        prefix=api_prefix,
-        tags=["TTS 서비스"]
-    )
-
-    integrated_router.include_router(
-        stt_router,
-        prefix=api_prefix,
-        tags=["STT 서비스"]
-    )
-
-    integrated_router.include_router(
-        orthography_router,
-        prefix=api_prefix,
-        tags=["텍스트 처리 서비스"]
-    )
-
-    integrated_router.include_router(
-        quiz_router,
-        prefix=api_prefix,
-        tags=["퀴즈 생성 서비스"]
-    )
-
-    integrated_router.include_router(
-        lyrics_router,
-        prefix=api_prefix,
-        tags=["가사 생성 서비스"]
-    )
-
-    integrated_router.include_router(
-        translation_router,
-        prefix=api_prefix,
-        tags=["번역 서비스"]
-    )
-
-    integrated_router.include_router(
-        summary_router,
-        prefix=api_prefix,
-        tags=["요약 생성 서비스"]
-    )
-
-    integrated_router.include_router(
-        explanation_router,
-        prefix=api_prefix,
-        tags=["문제 풀이 서비스"]
-    )
-
-    integrated_router.include_router(
-        main_crawler_router,
-        prefix=api_prefix,
-        tags=["메인 크롤러 서비스"]
-    )
-
-    integrated_router.include_router(
-        crawler_analysis_router,
-        prefix=api_prefix,
-        tags=["크롤러 분석 서비스"]
-    )
-    
-    integrated_router.include_router(
-        song_router,
-        prefix=api_prefix,
-        tags=["노래 생성 서비스"]
-    )
-    
-    integrated_router.include_router(
-        language_detection_router,
-        prefix=api_prefix,
-        tags=["언어 감지 서비스"]
-    )
-    
-    integrated_router.include_router(
-        content_category_router,
-        prefix=api_prefix,
-        tags=["콘텐츠 카테고리 서비스"]
-    )
-    
-    integrated_router.include_router(
-        finger_detection_router,
-        prefix=api_prefix,
-        tags=["손가락 인식 서비스"]
-    )
-
-    integrated_router.include_router(
-        visualization_router,
-        prefix=api_prefix,
-        tags=["시각화 생성 서비스"]
-    )
-    
-    integrated_router.include_router(
-        play_router,
-        prefix=api_prefix,
-        tags=["연극 서비스"]
-    )
-    
-    return integrated_router
\ No newline at end of file
+
+    for module_path, tag in _ROUTERS:
+        integrated_router.include_router(
+            _import_router(module_path),
+            prefix=api_prefix,
+            tags=[tag]
+        )
+
+    return integrated_router
@@ -1,21 +1,40 @@
 import os, asyncio, json, time
-from fastapi import APIRouter, HTTPException, status, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, status, WebSocket, WebSocketDisconnect, Header, Query
+from fastapi.responses import StreamingResponse, RedirectResponse
 
 from app.config import settings
 from app.models.voice.tts import (
     TTSRequest, SingleTTSRequest, TTSResponse, SingleTTSResponse,
-    JobStatusResponse, VoiceListResponse,
+    JobStatusResponse, VoiceListResponse, TTSJobStatus,
     PlayTTSRequest, SupportedTTSModelsResponse, SUPPORTED_TTS_MODELS
 )
 from app.services.voice.tts.generator import TTSService
 from app.services.voice.tts.notification import notification_service
+from app.services.voice.tts.chapter import chapter_stitcher
+from app.repositories.tts import (
+    get_rate_limiter_stats, mp3_encoder, tts_audio_cache, tts_job_store, tts_scheduler,
+    tts_latency_tracker, murf_http_client, murf_phase_metrics
+)
 
 # 로깅 설정
 from app.utils.logger.setup import setup_logger
 logger = setup_logger('tts_api', 'logs/tts')
 
 router = APIRouter(prefix="/tts")
+
+
+def _format_sse(data: dict) -> str:
+    """SSE 이벤트 문자열 (seq가 있으면 id로 지정해 재연결 시 Last-Event-ID로 돌려받음)"""
+    if data.get("seq") is not None:
+        return f"id: {data['seq']}\ndata: {json.dumps(data)}\n\n"
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def _parse_event_id(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
 @router.get("/models", response_model=SupportedTTSModelsResponse)
 async def get_supported_models() -> SupportedTTSModelsResponse:
     """지원되는 TTS 모델 목록을 반환합니다."""
@@ -69,6 +88,38 @@ async def generate_single_tts(request: SingleTTSRequest):
             detail=f"TTS 생성 중 오류가 발생했습니다: {str(e)}"
         )
 
+@router.post("/generate/stream")
+async def generate_single_tts_stream(request: SingleTTSRequest):
+    """단일 TTS 스트리밍 생성 (오디오를 생성되는 대로 chunked 전송)
+
+    캐시에 있으면 NCP 파일로 리다이렉트합니다. 생성된 오디오는 스트림 완료 후
+    X-TTS-NCP-URL 헤더의 경로로 업로드됩니다.
+    """
+    try:
+        result = await tts_service.stream_single_tts(request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"TTS 스트리밍 시작 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    if result.get("stream") is None:
+        return RedirectResponse(
+            url=f"{settings.naver_endpoint_url}/{result['ncp_url']}",
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        )
+
+    return StreamingResponse(
+        result["stream"],
+        media_type="audio/mpeg",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-TTS-NCP-URL": result["ncp_url"],
+            "X-TTS-Provider": result["provider"],
+            "X-TTS-Voice": result["voice"],
+        }
+    )
+
 @router.post("/generate/batch", response_model=TTSResponse)
 async def generate_batch_tts(request: TTSRequest):
     """배치 TTS 파일 생성"""
@@ -101,12 +152,12 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
     
     connection_start_time = time.time()
     last_ping_time = time.time()
-    ping_interval = 15  # 15초마다 핑
-    max_idle_time = 60  # 60초 이상 응답 없으면 연결 종료
+    # 서버 핑과 유휴 타임아웃은 알림 서비스의 타이머 휠이 처리
+    ping_interval = settings.notification_ws_ping_interval
     
     try:
         # 초기 상태 전송
-        job_status = tts_service.get_job_status(job_id)
+        job_status = await tts_service.get_job_status(job_id)
         if job_status:
             await websocket.send_json({
                 "type": "initial_status",
@@ -116,7 +167,9 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
                     "progress": job_status.progress,
                     "total_files": job_status.total_files,
                     "completed_files": job_status.completed_files,
-                    "failed_files": job_status.failed_files
+                    "failed_files": job_status.failed_files,
+                    # 재연결 시 놓친 변경분 대신 전체 파일 상태 전달 (이후에는 변경분만 전송)
+                    "files": job_status.files
                 },
                 "connection_info": {
                     "connected_at": connection_start_time,
@@ -131,23 +184,14 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
             await websocket.close()
             return
         
-        # 연결 유지 및 핑-퐁 (개선된 로직)
+        # 연결 유지 및 핑-퐁 (서버 핑/유휴 타임아웃은 타이머 휠에서 처리)
         while True:
             try:
-                # 동적 타임아웃 계산 (연결 시간에 따라 조정)
-                connection_duration = time.time() - connection_start_time
-                if connection_duration > 300:  # 5분 이상 연결된 경우
-                    current_timeout = 10  # 더 짧은 타임아웃
-                else:
-                    current_timeout = 20  # 기본 타임아웃
-                
                 # 클라이언트로부터 메시지 대기
-                message = await asyncio.wait_for(
-                    websocket.receive_text(), 
-                    timeout=current_timeout
-                )
+                message = await websocket.receive_text()
                 
                 current_time = time.time()
+                notification_service.touch_websocket(websocket)
                 
                 if message == "ping":
                     await websocket.send_json({
@@ -159,7 +203,7 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
                     
                 elif message == "status":
                     # 현재 상태 요청
-                    current_status = tts_service.get_job_status(job_id)
+                    current_status = await tts_service.get_job_status(job_id)
                     if current_status:
                         # 연결 건강성 정보 추가
                         health_info = await notification_service.get_connection_health(job_id)
@@ -178,6 +222,12 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
                             "timestamp": current_time
                         })
                 
+                elif message == "snapshot":
+                    # 전체 상태 스냅샷 요청 (파일 목록 포함)
+                    snapshot = notification_service.build_snapshot(job_id)
+                    if snapshot:
+                        notification_service.send_to_websocket(job_id, websocket, snapshot)
+                
                 elif message == "health":
                     # 연결 건강성 정보 요청
                     health_info = await notification_service.get_connection_health(job_id)
@@ -195,6 +245,7 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
                         new_interval = int(message.split(":")[1])
                         if 5 <= new_interval <= 60:  # 5초~60초 범위
                             ping_interval = new_interval
+                            notification_service.set_heartbeat_interval(websocket, ping_interval)
                             await websocket.send_json({
                                 "type": "heartbeat_interval_updated",
                                 "new_interval": ping_interval,
@@ -214,33 +265,6 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
                         "timestamp": current_time
                     })
                 
-            except asyncio.TimeoutError:
-                current_time = time.time()
-                time_since_last_ping = current_time - last_ping_time
-                
-                # 마지막 핑으로부터 너무 오래 지났으면 연결 종료
-                if time_since_last_ping > max_idle_time:
-                    logger.warning(f"⏰ WebSocket connection timeout for job {job_id} (idle: {time_since_last_ping:.1f}s)")
-                    await websocket.send_json({
-                        "type": "connection_timeout",
-                        "idle_time": time_since_last_ping,
-                        "max_idle_time": max_idle_time
-                    })
-                    break
-                
-                # 서버에서 핑 전송 (클라이언트 응답 확인)
-                try:
-                    await websocket.send_json({
-                        "type": "server_ping",
-                        "timestamp": current_time,
-                        "connection_duration": current_time - connection_start_time,
-                        "expected_pong": True
-                    })
-                    logger.debug(f"💓 Server ping sent to job {job_id}")
-                except:
-                    logger.warning(f"❌ Failed to send server ping to job {job_id}")
-                    break
-                    
             except WebSocketDisconnect:
                 logger.info(f"📡 WebSocket disconnected for job {job_id}")
                 break
@@ -255,24 +279,61 @@ async def websocket_job_status(websocket: WebSocket, job_id: str):
         await notification_service.remove_websocket_connection(job_id, websocket)
 
 @router.get("/jobs/{job_id}/stream")
-async def stream_job_status(job_id: str):
-    """Server-Sent Events를 통한 실시간 작업 상태 스트림 - 하트비트 개선"""
+async def stream_job_status(
+    job_id: str,
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    last_event_id_query: str | None = Query(None, alias="last_event_id"),
+):
+    """Server-Sent Events를 통한 실시간 작업 상태 스트림 - 하트비트 개선
+
+    재연결 시 Last-Event-ID 헤더(또는 last_event_id 쿼리)를 주면 놓친 이벤트만 재전송하고,
+    버퍼가 이미 넘어갔으면 compact 스냅샷을 보냅니다.
+    """
+    resume_from = _parse_event_id(last_event_id or last_event_id_query)
     
     async def event_stream():
-        # SSE 연결을 위한 큐 생성
-        event_queue = asyncio.Queue()
+        # SSE 연결을 위한 큐 생성 (크기 제한, 넘치면 알림 서비스가 스냅샷으로 재동기화)
+        event_queue = notification_service.create_sse_queue()
         connection_start_time = time.time()
         last_event_time = time.time()
-        heartbeat_interval = 20  # 20초마다 하트비트
-        max_queue_size = 100
+        heartbeat_interval = settings.notification_sse_heartbeat_interval  # 타이머 휠이 큐에 넣어줌
+        max_queue_size = event_queue.maxsize
         
         try:
             await notification_service.add_sse_connection(job_id, event_queue)
             logger.info(f"📡 SSE connection added for job {job_id}")
             
             # 초기 상태 전송
-            job_status = tts_service.get_job_status(job_id)
-            if job_status:
+            job_status = await tts_service.get_job_status(job_id)
+            last_sent_seq = 0
+            if job_status and resume_from is not None:
+                # 재연결: 놓친 이벤트만 재전송, 버퍼가 넘어갔으면 compact 스냅샷
+                replay = notification_service.get_replay(job_id, resume_from)
+                if replay is not None:
+                    logger.info(f"📡 SSE resumed for job {job_id} from {resume_from} ({len(replay)} events replayed)")
+                    last_sent_seq = resume_from
+                    for event_data in replay:
+                        yield _format_sse(event_data)
+                        last_sent_seq = event_data["seq"]
+                    finished = any(event_data.get("type") == "completion" for event_data in replay)
+                else:
+                    snapshot = notification_service.build_snapshot(job_id, compact=True)
+                    logger.info(f"📡 SSE resumed for job {job_id} from {resume_from} (snapshot)")
+                    yield _format_sse(snapshot)
+                    last_sent_seq = snapshot["seq"]
+                    finished = snapshot["status"] in (TTSJobStatus.COMPLETED.value, TTSJobStatus.FAILED.value)
+                last_event_time = time.time()
+                
+                if finished:
+                    final_data = {
+                        "type": "stream_ended",
+                        "reason": "job_completed",
+                        "total_duration": last_event_time - connection_start_time,
+                        "timestamp": last_event_time
+                    }
+                    yield f"data: {json.dumps(final_data)}\n\n"
+                    return
+            elif job_status:
                 # 연결 건강성 정보 포함
                 health_info = await notification_service.get_connection_health(job_id)
                 
@@ -284,15 +345,18 @@ async def stream_job_status(job_id: str):
                     "total_files": job_status.total_files,
                     "completed_files": job_status.completed_files,
                     "failed_files": job_status.failed_files,
+                    "files": job_status.files,
                     "connection_info": {
                         "connected_at": connection_start_time,
                         "heartbeat_interval": heartbeat_interval,
                         "max_queue_size": max_queue_size
                     },
                     "connection_health": health_info,
+                    "seq": notification_service.current_seq(job_id),
                     "timestamp": connection_start_time
                 }
-                yield f"data: {json.dumps(initial_data)}\n\n"
+                yield _format_sse(initial_data)
+                last_sent_seq = initial_data["seq"]
                 logger.debug(f"📡 SSE initial status sent for job {job_id}")
                 last_event_time = time.time()
             else:
@@ -305,21 +369,36 @@ async def stream_job_status(job_id: str):
                 logger.error(f"❌ SSE job not found: {job_id}")
                 return
             
-            # 이벤트 스트림 처리 (개선된 로직)
+            # 이벤트 스트림 처리 (하트비트도 타이머 휠이 같은 큐로 전달)
             while True:
                 try:
-                    # 동적 타임아웃 (연결 시간에 따라 조정)
-                    connection_duration = time.time() - connection_start_time
-                    if connection_duration > 600:  # 10분 이상 연결된 경우
-                        timeout = 15  # 더 짧은 타임아웃
-                    else:
-                        timeout = heartbeat_interval
-                    
                     # 큐에서 이벤트 대기
-                    event_data = await asyncio.wait_for(event_queue.get(), timeout=timeout)
+                    event_data = await event_queue.get()
                     current_time = time.time()
                     
-                    # 이벤트 데이터에 추가 정보 포함
+                    if event_data.get("type") == "heartbeat":
+                        heartbeat_data = dict(event_data)
+                        heartbeat_data["last_event_ago"] = current_time - last_event_time
+                        heartbeat_data["queue_size"] = event_queue.qsize()
+                        yield f"data: {json.dumps(heartbeat_data)}\n\n"
+                        
+                        # 장시간 비활성 상태 확인
+                        if current_time - last_event_time > 300:  # 5분 이상 이벤트 없음
+                            inactive_data = {
+                                "type": "inactive_warning",
+                                "inactive_duration": current_time - last_event_time,
+                                "timestamp": current_time,
+                                "message": "Long period of inactivity detected"
+                            }
+                            yield f"data: {json.dumps(inactive_data)}\n\n"
+                        continue
+                    
+                    # 재전송/초기 상태에 이미 포함된 이벤트는 건너뜀
+                    if event_data.get("seq") is not None and event_data["seq"] <= last_sent_seq:
+                        continue
+                    
+                    # 이벤트 데이터에 추가 정보 포함 (같은 메시지를 다른 연결과 공유하므로 복사)
+                    event_data = dict(event_data)
                     event_data["sse_info"] = {
                         "queue_size": event_queue.qsize(),
                         "connection_duration": current_time - connection_start_time,
@@ -331,9 +410,11 @@ async def stream_job_status(job_id: str):
 
                     logger.debug(f"📡 SSE event received for job {job_id}: {event_data.get('type', 'unknown')}")
                     
-                    # SSE 형식으로 데이터 전송
-                    yield f"data: {json.dumps(event_data)}\n\n"
+                    # SSE 형식으로 데이터 전송 (seq가 있으면 id 포함)
+                    yield _format_sse(event_data)
                     last_event_time = current_time
+                    if event_data.get("seq") is not None:
+                        last_sent_seq = event_data["seq"]
                     
                     # 작업이 완료되거나 실패하면 스트림 종료
                     if event_data.get("type") == "completion":
@@ -348,44 +429,6 @@ async def stream_job_status(job_id: str):
                         yield f"data: {json.dumps(final_data)}\n\n"
                         break
                         
-                except asyncio.TimeoutError:
-                    current_time = time.time()
-                    
-                    # 큐 크기 확인 및 정리
-                    if event_queue.qsize() > max_queue_size:
-                        logger.debug(f"⚠️ SSE queue cleanup for job {job_id}: {event_queue.qsize()} items")
-                        # 오래된 메시지 제거
-                        while event_queue.qsize() > max_queue_size // 2:
-                            try:
-                                event_queue.get_nowait()
-                            except asyncio.QueueEmpty:
-                                break
-                    
-                    # 연결 유지를 위한 heartbeat (향상된 정보 포함)
-                    health_info = await notification_service.get_connection_health(job_id)
-                    
-                    heartbeat_data = {
-                        "type": "heartbeat",
-                        "timestamp": current_time,
-                        "connection_duration": current_time - connection_start_time,
-                        "last_event_ago": current_time - last_event_time,
-                        "queue_size": event_queue.qsize(),
-                        "connection_health": health_info,
-                        "heartbeat_interval": heartbeat_interval
-                    }
-                    yield f"data: {json.dumps(heartbeat_data)}\n\n"
-                    logger.debug(f"💓 SSE heartbeat sent for job {job_id} (queue: {event_queue.qsize()})")
-                    
-                    # 장시간 비활성 상태 확인
-                    if current_time - last_event_time > 300:  # 5분 이상 이벤트 없음
-                        inactive_data = {
-                            "type": "inactive_warning",
-                            "inactive_duration": current_time - last_event_time,
-                            "timestamp": current_time,
-                            "message": "Long period of inactivity detected"
-                        }
-                        yield f"data: {json.dumps(inactive_data)}\n\n"
-                    
                 except Exception as e:
                     logger.error(f"❌ SSE stream error for job {job_id}: {str(e)}")
                     error_data = {
@@ -436,7 +479,7 @@ async def stream_job_status(job_id: str):
 async def get_job_status(job_id: str):
     """작업 상태 조회 - 연결 정보 포함"""
     
-    result = tts_service.get_job_status(job_id)
+    result = await tts_service.get_job_status(job_id)
     
     if result is None:
         raise HTTPException(
@@ -446,11 +489,34 @@ async def get_job_status(job_id: str):
     
     return result
 
+@router.post("/jobs/{job_id}/chapter")
+async def stitch_job_chapter(job_id: str):
+    """완료된 배치/연극 작업을 챕터 MP3 하나와 text_index별 오프셋 표로 합치기 (이미 있으면 기존 결과 반환)"""
+    try:
+        chapter = await tts_service.stitch_chapter(job_id)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 작업 ID를 찾을 수 없습니다."
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"챕터를 생성할 수 없습니다: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"챕터 생성 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    return {"job_id": job_id, "chapter": chapter}
+
 @router.get("/jobs")
-async def get_all_jobs():
-    """모든 작업 상태 조회 - 연결 정보 포함"""
+async def get_all_jobs(limit: int = 100, offset: int = 0, status: str | None = None):
+    """작업 상태 목록 조회 (최신순, 페이지네이션/상태 필터) - 연결 정보 포함"""
     
-    jobs = tts_service.get_all_jobs()
+    jobs = await tts_service.get_all_jobs(limit=limit, offset=offset, status=status)
     connection_stats = notification_service.get_connection_stats()
     
     return {
@@ -461,7 +527,7 @@ async def get_all_jobs():
 @router.post("/jobs/{job_id}/pause")
 async def pause_job(job_id: str):
     """작업 일시 중단"""
-    success = tts_service.pause_job(job_id)
+    success = await tts_service.pause_job(job_id)
     
     if not success:
         raise HTTPException(
@@ -474,7 +540,7 @@ async def pause_job(job_id: str):
 @router.post("/jobs/{job_id}/resume")
 async def resume_job(job_id: str):
     """작업 재개"""
-    success = tts_service.resume_job(job_id)
+    success = await tts_service.resume_job(job_id)
     
     if not success:
         raise HTTPException(
@@ -517,6 +583,46 @@ async def get_notification_stats():
     
     return stats
 
+@router.get("/rate-limits")
+async def get_rate_limits():
+    """프로바이더별 적응형 레이트 리미터 상태 조회"""
+    return {"rate_limiters": get_rate_limiter_stats()}
+
+@router.get("/scheduler/stats")
+async def get_scheduler_stats():
+    """프로바이더별 TTS 스케줄러 상태 (동시 호출 수, 우선순위별 대기열) 조회"""
+    return {"scheduler": tts_scheduler.get_stats()}
+
+@router.get("/latency/stats")
+async def get_latency_stats():
+    """프로바이더별 응답 시간 히스토그램과 헤지 요청 통계 조회"""
+    return {"latency": tts_latency_tracker.get_stats()}
+
+@router.get("/murf/stats")
+async def get_murf_stats():
+    """Murf 단계별(API 호출, 다운로드, 업로드) 소요 시간과 다운로드 연결 풀 상태 조회"""
+    return {"phases": murf_phase_metrics.get_stats(), "http_client": murf_http_client.get_stats()}
+
+@router.get("/encoder/stats")
+async def get_encoder_stats():
+    """MP3 인코더 프로세스 풀 상태 조회"""
+    return {"encoder": mp3_encoder.get_stats()}
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """TTS 오디오 캐시 적중률 조회"""
+    return {"audio_cache": tts_audio_cache.get_stats()}
+
+@router.get("/chapter/stats")
+async def get_chapter_stats():
+    """챕터 생성 통계 조회"""
+    return {"chapter": chapter_stitcher.get_stats()}
+
+@router.get("/job-store/stats")
+async def get_job_store_stats():
+    """작업 상태 저장소(메모리/SQLite) 상태 조회"""
+    return {"job_store": tts_job_store.get_stats()}
+
 @router.delete("/files/{filename}")
 async def delete_file(filename: str):
     """생성된 파일 삭제"""
@@ -41,8 +41,106 @@ class Settings(BaseSettings):
     # TTS API 재시도 설정
     tts_max_retries: int = 3
     tts_base_delay: float = 2.0
-    tts_rate_limit_delay: float = 5.0
-    # mod by LAB (25.08.19) 
+
+    # TTS 적응형 레이트 리미터 (프로바이더별 초당 요청 수, AIMD)
+    # 429를 받으면 decrease_factor만큼 감소, 응답이 latency_target 이내면 increase_step만큼 증가
+    gemini_tts_rate_initial: float = 2.0
+    gemini_tts_rate_max: float = 10.0
+    openai_tts_rate_initial: float = 5.0
+    openai_tts_rate_max: float = 20.0
+    murf_tts_rate_initial: float = 2.0
+    murf_tts_rate_max: float = 8.0
+    tts_rate_min: float = 0.2
+    tts_rate_increase_step: float = 0.05
+    tts_rate_decrease_factor: float = 0.5
+    tts_rate_latency_target: float = 8.0
+    # Gemini 429 시 OpenAI로 전환하기 전 리미터를 거쳐 재시도할 횟수
+    tts_rate_limit_max_retries: int = 2
+
+    # TTS 스케줄러: 프로바이더별 최대 동시 호출 수 (워커가 여러 개면 워커 수로 나눔)
+    gemini_tts_max_inflight: int = 8
+    openai_tts_max_inflight: int = 16
+    murf_tts_max_inflight: int = 4
+    # 호출 소요 시간 측정값이 없을 때 예상 시작 시각 계산에 쓰는 호출당 시간(초)
+    tts_scheduler_default_service_time: float = 3.0
+
+    # Murf HTTP: API 호출용 SDK 클라이언트와 오디오 파일 다운로드 클라이언트 모두 연결 풀을 재사용 (h2 설치 시 HTTP/2)
+    # 동시 호출 수는 murf_tts_max_inflight(스케줄러)로 제한
+    murf_http2: bool = True
+    murf_http_max_connections: int = 16
+    murf_connect_timeout: float = 5.0
+    murf_api_timeout: float = 30.0
+    murf_download_timeout: float = 60.0
+
+    # TTS 프로바이더 API 주소 재정의 (None이면 SDK 기본 주소, 프록시나 벤치마크용 가짜 서버 지정)
+    gemini_tts_base_url: Optional[str] = None
+    openai_tts_base_url: Optional[str] = None
+    murf_base_url: Optional[str] = None
+
+    # TTS 헤지 요청: Gemini가 최근 응답 시간 분위수(p95) 안에 응답하지 않으면 OpenAI도 호출해 먼저 끝난 쪽 사용
+    tts_hedging_enabled: bool = True
+    tts_hedge_quantile: float = 0.95
+    tts_hedge_window: int = 200
+    tts_hedge_min_samples: int = 20
+    # 표본이 부족할 때 대기 시간과 대기 시간 하한/상한(초)
+    tts_hedge_default_delay: float = 8.0
+    tts_hedge_min_delay: float = 2.0
+    tts_hedge_max_delay: float = 20.0
+
+    # 긴 텍스트 모드: threshold자를 넘으면 문장 경계로 chunk_chars 이하 청크로 나눠 동시에 합성 후 이어 붙임
+    tts_long_text_enabled: bool = True
+    tts_long_text_threshold: int = 600
+    tts_long_text_chunk_chars: int = 300
+
+    # 연극 TTS 장면 배치 모드: 같은 목소리의 연속 대사를 Murf 요청 하나로 합성 후 대사별로 분할
+    # (Murf는 요청당 화자 1명만 지원, 대사 사이에는 separator의 pause 태그로 무음을 넣어 경계 검출을 도움)
+    play_tts_scene_batching: bool = False
+    play_tts_scene_max_lines: int = 8
+    play_tts_scene_max_chars: int = 2500
+    play_tts_scene_separator: str = " [pause 1s] "
+
+    # 챕터 생성: 완료된 배치/연극 작업의 파일별 MP3를 하나로 이어 붙이고 text_index별 오프셋 표 업로드
+    tts_chapter_auto_stitch: bool = False  # 작업 완료 시 자동 생성 (False면 POST /jobs/{job_id}/chapter 호출 시 생성)
+    tts_chapter_download_concurrency: int = 8
+
+    # TTS 오디오 캐시 (provider/model/voice/정규화 텍스트 → NCP URL, duration)
+    tts_cache_enabled: bool = True
+    tts_cache_dir: str = "tts_cache"
+    tts_cache_max_entries: int = 200000
+    # NCP 객체 수명 정책보다 짧게 유지해야 함 (기본 30일)
+    tts_cache_ttl_seconds: int = 30 * 24 * 3600
+
+    # TTS 작업 저장소 (SQLite 영속 + 메모리 LRU), 재시작 시 미완료 작업 재개
+    tts_job_store_persistent: bool = True
+    tts_job_memory_max: int = 200
+    tts_job_ttl_seconds: int = 7 * 24 * 3600
+    tts_job_resume_on_startup: bool = True
+    # 멀티 워커 작업 소유 lease (초) - 소유 워커의 갱신이 이 시간 동안 끊기면 다른 워커가 작업을 이어받음
+    tts_job_lease_seconds: int = 60
+
+    # 멀티 워커 서빙 (uvicorn 워커 프로세스 수, WEB_CONCURRENCY 환경변수도 인식)
+    app_workers: int = 1
+    # 워커 간 알림/제어 브로커: "auto"(워커 2개 이상이면 unix) | "local" | "unix"
+    notification_broker: str = "auto"
+    notification_broker_socket: str = "/tmp/storymate_notification.sock"
+    notification_broker_queue_size: int = 10000
+
+    # 실시간 알림 이벤트 버스 (진행 이벤트를 모아 변경분만 전송, 클라이언트별 송신 큐 크기)
+    notification_coalesce_ms: int = 150
+    notification_client_queue_size: int = 256
+    # 하트비트 타이머 휠 (tick 단위 초), 연결 종류별 하트비트 간격과 WebSocket 유휴 타임아웃
+    notification_heartbeat_tick: float = 1.0
+    notification_ws_ping_interval: int = 15
+    notification_ws_max_idle: int = 60
+    notification_sse_heartbeat_interval: int = 20
+    # SSE 재연결(Last-Event-ID) 재전송용 작업별 링 버퍼 크기, 작업 완료 후 보관 시간(초)
+    notification_replay_buffer_size: int = 256
+    notification_replay_ttl_seconds: int = 60
+
+    # PCM → MP3 인코딩 프로세스 풀 (0이면 CPU 코어 수 / 워커 수의 2배)
+    tts_encoder_workers: int = 0
+    tts_encoder_max_pending: int = 0
+    # mod by LAB (25.08.19)
 
     # mod by LAB (25.08.19) 
     # 사용 가능한 목소리 설정
@@ -154,6 +252,45 @@ class Settings(BaseSettings):
     gemini_temperature: Optional[float] = 0.0
     gemini_max_tokens: Optional[int] = 2048
 
+    # LLM 응답 캐시 (temperature 0 호출만, provider/모델/메시지/생성 파라미터 → 응답)
+    # 메모리 LRU + SQLite 디스크 계층, 호출 시 cache=False 또는 config={"cache": False}로 제외
+    llm_cache_enabled: bool = True
+    llm_cache_dir: str = "llm_cache"
+    llm_cache_memory_entries: int = 1000
+    llm_cache_max_entries: int = 50000
+    llm_cache_max_mb: int = 512
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+
+    # LLM 호출 거버너 (provider별 분당 요청/토큰 예산, 동시 호출 수 - 워커 수로 나눠 적용, 0이면 제한 없음)
+    # 예산이 없으면 엔드포인트별 대기열에서 라운드 로빈으로 순서대로 보냄
+    llm_governor_enabled: bool = True
+    gemini_llm_rpm: int = 1000
+    gemini_llm_tpm: int = 1_000_000
+    gemini_llm_max_inflight: int = 32
+    openai_llm_rpm: int = 500
+    openai_llm_tpm: int = 200_000
+    openai_llm_max_inflight: int = 32
+    llm_governor_output_tokens: int = 1024  # 응답 토큰 예약량 (모델 max_tokens가 더 작으면 그 값)
+    llm_governor_image_tokens: int = 1000  # 이미지 1장당 토큰 추정값
+    llm_governor_429_cooldown: float = 10.0  # 429 수신 후 새 호출을 멈추는 시간(초)
+
+    # LLM provider 서킷 브레이커 / 우회 라우팅 (윈도우 내 최소 호출 수 이상에서 에러율이 기준 이상이면 서킷 열림)
+    llm_breaker_enabled: bool = True
+    llm_health_window_seconds: int = 60
+    llm_breaker_min_requests: int = 10
+    llm_breaker_error_rate: float = 0.5
+    llm_breaker_open_seconds: float = 30.0  # 열린 뒤 탐색 호출까지 대기(초)
+    llm_slow_p95_seconds: float = 30.0  # 성공 응답 p95가 이보다 느리면 다른 provider 우선 (0이면 사용 안 함)
+    # 호출 1회 타임아웃(초, 0이면 없음)과 provider 장애 시 최대 시도 횟수
+    llm_attempt_timeout: float = 120.0
+    llm_max_attempts: int = 2
+    # 재시도 예산: 윈도우 내 요청 수의 비율 (최소 llm_retry_budget_min건)
+    llm_retry_budget_ratio: float = 0.1
+    llm_retry_budget_min: int = 3
+
+    # LLM provider 클라이언트는 첫 사용 시 생성, 서버 시작 후 백그라운드에서 미리 생성할지 여부
+    llm_warmup_on_startup: bool = True
+
     # ============================================
     # 기능별 LLM 모델 설정 (중앙 관리)
     # ============================================
@@ -187,6 +324,16 @@ class Settings(BaseSettings):
     naver_bucket_tts_folder: Optional[str] = "TTS"
     naver_bucket_play_folder: Optional[str] = "PLAY"
 
+    # NCP 업로드 동시성/커넥션 풀 (boto3 호출은 전용 스레드 풀에서 실행)
+    ncp_upload_max_concurrency: int = 16
+    ncp_max_pool_connections: int = 32
+    # 멀티파트 업로드 기준 및 파트 크기 (MB)
+    ncp_multipart_threshold_mb: int = 8
+    ncp_multipart_chunksize_mb: int = 8
+    ncp_multipart_max_concurrency: int = 4
+    # 로컬 S3 호환 서버(MinIO 등)로 테스트할 때는 "path"
+    ncp_addressing_style: str = "auto"
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -195,6 +342,10 @@ class Settings(BaseSettings):
         protected_namespaces=(),  # model_ 네임스페이스 보호 해제
     )
 
+    def get_worker_count(self) -> int:
+        """실제 워커 프로세스 수 (uvicorn CLI의 WEB_CONCURRENCY 포함)"""
+        return max(1, self.app_workers, int(os.getenv("WEB_CONCURRENCY", "1") or 1))
+
 
 # 전역 설정 인스턴스
 settings = Settings()
@@ -2,9 +2,11 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 import os
+import asyncio
 
 from app.config import settings
-from app.api.router import get_integrated_router
+from app.api.router import get_integrated_router, get_import_report, log_import_report
+from app.utils.language.governor import llm_endpoint, load_encodings
 # 로깅 설정
 from app.utils.logger.setup import setup_logger
 logger = setup_logger('main')
@@ -27,6 +29,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class LLMEndpointContextMiddleware:
+    """LLM 거버너 공정 대기열 단위 설정 (/api/v1/orthography/... → /api/v1/orthography)
+
+    ContextVar만 설정하므로 BaseHTTPMiddleware 대신 순수 ASGI로 감싸 SSE/스트리밍 응답을 그대로 통과시킵니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = llm_endpoint.set("/".join(scope["path"].split("/")[:4]) or "/")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            llm_endpoint.reset(token)
+
+
+app.add_middleware(LLMEndpointContextMiddleware)
+
 # 통합 API 라우터 등록
 integrated_router = get_integrated_router()
 app.include_router(integrated_router)
@@ -75,6 +99,7 @@ async def health_check():
             # TTS 엔드포인트
             "/api/v1/tts/voices - 사용 가능한 목소리 목록",
             "/api/v1/tts/generate - 단일 TTS 생성",
+            "/api/v1/tts/generate/stream - 단일 TTS 스트리밍 생성",
             "/api/v1/tts/generate/batch - 배치 TTS 생성",
             "/api/v1/tts/jobs/{job_id} - 작업 상태 조회",
             "/api/v1/tts/jobs/{job_id}/ws - WebSocket 실시간 알림",
@@ -124,10 +149,23 @@ async def health_check():
             "/api/v1/finger-detection/health - 손가락 인식 및 문서 읽기 서비스 상태",
             "/api/v1/main_crawler/health - 메인 크롤러 서비스 상태",
             "/api/v1/song/health - 노래 서비스 상태",
-            "/api/v1/visualization/health - 시각화 서비스 상태"
+            "/api/v1/visualization/health - 시각화 서비스 상태",
+            "/llm/stats - LLM 호출 계층 통계 (응답 캐시, 단일 비행, 거버너, provider 상태)",
+            "/startup/imports - 라우터별 import 시간 (콜드 스타트)"
         ]
     }
 
+@app.get("/llm/stats")
+async def llm_stats():
+    """LLM 호출 계층 통계 (응답 캐시 적중률/절약 시간, 단일 비행으로 합친 호출 수, 거버너 대기열/대기 시간, provider 서킷 상태)"""
+    from app.utils.language.generator import language_generator
+    return language_generator.get_stats()
+
+@app.get("/startup/imports")
+async def startup_imports():
+    """라우터별 import 시간과 새로 불러온 모듈 수 (콜드 스타트 추적)"""
+    return get_import_report()
+
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 실행"""
@@ -154,6 +192,34 @@ async def startup_event():
     else:
         logger.info("✅ Gemini API 키가 구성되었습니다.")
 
+    # 워커 간 알림 브로커 시작 (멀티 워커면 Unix 소켓 허브에 접속)
+    from app.services.voice.tts.notification import notification_service
+    try:
+        await notification_service.start()
+    except Exception as e:
+        logger.error(f"⚠️ 알림 브로커 시작 중 오류: {str(e)}")
+
+    # 재시작 전에 끝나지 않은 TTS 작업 재개 (멀티 워커에서는 lease가 만료된 작업만 가져옴 -
+    # 이후에도 lease를 갱신하면서 죽은 워커의 작업을 이어받도록 모든 워커에서 heartbeat 실행)
+    if settings.tts_job_resume_on_startup:
+        try:
+            from app.api.v1.tts import tts_service
+            await tts_service.resume_unfinished_jobs()
+            if tts_service.jobs.shared:
+                asyncio.create_task(tts_service.run_job_lease_heartbeat())
+        except Exception as e:
+            logger.error(f"⚠️ 미완료 TTS 작업 재개 중 오류: {str(e)}")
+
+    log_import_report()
+
+    # LLM 거버너 토큰 추정용 tiktoken 인코딩 로드 (파일 다운로드가 이벤트 루프를 막지 않도록 스레드에서)
+    asyncio.create_task(asyncio.to_thread(load_encodings))
+
+    # LLM provider 클라이언트는 첫 호출 때 만들어지므로, 시작 후 백그라운드에서 미리 생성
+    if settings.llm_warmup_on_startup:
+        from app.utils.language.generator import language_generator
+        asyncio.create_task(language_generator.awarm())
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
@@ -167,21 +233,28 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"⚠️ Selenium WebDriver 정리 중 오류: {str(e)}")
 
+    # MP3 인코더 프로세스 풀 정리
+    try:
+        from app.repositories.tts import mp3_encoder
+        mp3_encoder.shutdown()
+    except Exception as e:
+        logger.error(f"⚠️ MP3 인코더 정리 중 오류: {str(e)}")
+
+    # Murf 다운로드 연결 풀 정리
+    try:
+        from app.repositories.tts import murf_http_client
+        await murf_http_client.aclose()
+    except Exception as e:
+        logger.error(f"⚠️ Murf HTTP 클라이언트 정리 중 오류: {str(e)}")
+
+    # 알림 브로커 정리
+    try:
+        from app.services.voice.tts.notification import notification_service
+        await notification_service.stop()
+    except Exception as e:
+        logger.error(f"⚠️ 알림 브로커 정리 중 오류: {str(e)}")
+
 if __name__ == "__main__":
-    import uvicorn
-    
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=14056,
-        reload=settings.debug,
-        log_level="info",
-        # 🚀 타임아웃 설정 대폭 증가 (무제한에 가깝게)
-        timeout_keep_alive=7200,  # 2시간
-        timeout_graceful_shutdown=60,  # 60초
-        access_log=True,
-        # 워커 설정
-        workers=1,  # 비동기 작업 때문에 1개로 제한
-        # 추가 설정 - limit 파라미터들 제거 (None이나 생략하면 무제한)
-        loop="asyncio"
-    )
+    # 하위 호환용 - 배포에서는 `python -m app` 사용 (app/__main__.py 참고)
+    from app.__main__ import run
+    run()
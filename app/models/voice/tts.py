@@ -47,6 +47,8 @@ class TTSResponse(BaseModel):
     total_files: Optional[int] = Field(None, description="생성될 총 파일 수")
     completed_files: Optional[int] = Field(None, description="완료된 파일 수")
     files: Optional[List[str]] = Field(None, description="생성된 파일 경로 리스트")
+    estimated_wait_seconds: Optional[float] = Field(None, description="첫 파일 생성 시작까지 예상 대기 시간 (초)")
+    estimated_start_time: Optional[str] = Field(None, description="예상 시작 시각 (ISO 8601)")
 
 class SingleTTSResponse(BaseModel):
     """단일 TTS 생성 응답 모델"""
@@ -57,6 +59,7 @@ class SingleTTSResponse(BaseModel):
     download_url: Optional[str] = Field(None, description="파일 다운로드 URL")
     ncp_url: Optional[str] = Field(None, description="NCP 업로드 URL")
     duration: Optional[float] = Field(None, description="TTS 재생 시간 (초 단위)")
+    chunks: Optional[List[Dict[str, Any]]] = Field(None, description="긴 텍스트 모드의 청크별 시작/끝 시간 (초 단위)")
 
 class JobStatusResponse(BaseModel):
     """작업 상태 조회 응답 모델"""
@@ -67,6 +70,8 @@ class JobStatusResponse(BaseModel):
     completed_files: int = Field(..., description="완료된 파일 수")
     failed_files: int = Field(..., description="실패한 파일 수")
     files: List[Dict[str, Any]] = Field(..., description="파일별 상세 정보")
+    dedup: Optional[Dict[str, Any]] = Field(None, description="작업 내 중복 문장 통계 (고유 생성 수, 결과 공유 수, 비율)")
+    chapter: Optional[Dict[str, Any]] = Field(None, description="챕터 파일 정보 (ncp_url, offsets_url, duration, text_index별 start/end 오프셋, 누락 항목)")
 
 class VoiceListResponse(BaseModel):
     """목소리 목록 응답 모델"""
@@ -0,0 +1,28 @@
+"""
+MP3 인코더 프로세스 풀 워커 함수
+spawn 워커는 제출된 함수의 모듈을 import하므로, app.repositories.tts 패키지 __init__
+(provider SDK, 스토리지 클라이언트, SQLite 저장소 등)을 불러오지 않도록 패키지 밖에 두고 pydub/wave만 사용합니다.
+"""
+
+import wave
+from io import BytesIO
+
+from pydub import AudioSegment
+
+
+def pcm_to_mp3_bytes(pcm_bytes: bytes, sample_rate: int = 24000, channels: int = 1) -> bytes:
+    """
+    Raw 16-bit LE PCM → MP3 바이트 (디스크를 거치지 않음)
+    pydub이 PCM raw를 직접 읽지 못하므로 메모리 상에서 임시 WAV 헤더를 붙여 변환
+    """
+    with BytesIO() as wav_buf:
+        with wave.open(wav_buf, "wb") as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(2)  # 16bit = 2 bytes
+            wf.setframerate(sample_rate)
+            wf.writeframes(pcm_bytes)
+        wav_buf.seek(0)
+        seg = AudioSegment.from_file(wav_buf, format="wav")
+        mp3_buf = BytesIO()
+        seg.export(mp3_buf, format="mp3")
+        return mp3_buf.getvalue()
@@ -1,5 +1,6 @@
-from app.repositories.storage.ncp_storage import NCPStorageRepository
+from app.repositories.storage.ncp_storage import NCPStorageRepository, ncp_storage
 
 __all__ = [
     "NCPStorageRepository",
+    "ncp_storage",
 ]
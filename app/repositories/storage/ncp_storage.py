@@ -1,5 +1,10 @@
+import asyncio
+import mimetypes
 import os
 import boto3
+from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from io import BytesIO
 from datetime import datetime
@@ -8,20 +13,53 @@ from app.utils.logger.setup import setup_logger
 
 logger = setup_logger('ncp_storage', 'logs/storage')
 
+MB = 1024 * 1024
 
-class NCPStorageRepository:
-    """NCP Object Storage 업로드를 담당하는 Repository"""
 
-    def __init__(self):
+class NCPStorageRepository:
+    """NCP Object Storage 업로드를 담당하는 Repository
+
+    boto3 호출은 전용 스레드 풀에서 실행되어 이벤트 루프(WebSocket/SSE 스트림)를 막지 않습니다.
+    - 클라이언트 1개를 공유하고 커넥션 풀 크기를 제한 (botocore max_pool_connections)
+    - 동시 업로드 수는 스레드 풀 크기로 제한
+    - ACL/Content-Type은 PUT 요청에 함께 지정 (별도 put_object_acl 호출 없음)
+    - multipart_threshold 이상 파일은 멀티파트 업로드
+    - endpoint_url을 바꾸면 MinIO 등 로컬 S3 호환 서버로 테스트 가능
+    """
+
+    def __init__(
+        self,
+        endpoint_url: Optional[str] = None,
+        bucket_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ):
         """NCP S3 클라이언트 초기화"""
+        self.endpoint_url = endpoint_url or settings.naver_endpoint_url
+        self.bucket_name = bucket_name or settings.naver_bucket_name
+        self.max_concurrency = max_concurrency or settings.ncp_upload_max_concurrency
+
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.ncp_multipart_threshold_mb * MB,
+            multipart_chunksize=settings.ncp_multipart_chunksize_mb * MB,
+            max_concurrency=settings.ncp_multipart_max_concurrency,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="ncp-upload"
+        )
+
         self.s3_client = None
         if settings.ncp_access_key and settings.ncp_secret_key:
             try:
                 self.s3_client = boto3.client(
                     service_name=settings.naver_service_name,
-                    endpoint_url=settings.naver_endpoint_url,
+                    endpoint_url=self.endpoint_url,
                     aws_access_key_id=settings.ncp_access_key,
-                    aws_secret_access_key=settings.ncp_secret_key
+                    aws_secret_access_key=settings.ncp_secret_key,
+                    config=Config(
+                        max_pool_connections=settings.ncp_max_pool_connections,
+                        retries={"max_attempts": 3, "mode": "standard"},
+                        s3={"addressing_style": settings.ncp_addressing_style},
+                    ),
                 )
                 logger.info("✅ NCP S3 client initialized successfully")
             except Exception as e:
@@ -35,6 +73,59 @@ class NCPStorageRepository:
         date_folder = datetime.now().strftime("%Y%m%d")
         return f"{folder}/{date_folder}/{filename}"
 
+    def _extra_args(self, key: str, content_type: Optional[str]) -> dict:
+        extra_args = {'ACL': 'public-read'}
+        content_type = content_type or mimetypes.guess_type(key)[0]
+        if content_type:
+            extra_args['ContentType'] = content_type
+        return extra_args
+
+    def _ensure_ready(self):
+        if not self.s3_client or not self.bucket_name:
+            raise ValueError("NCP S3 client or bucket name not configured")
+
+    async def _run(self, func, *args, **kwargs):
+        """boto3 호출을 업로드 전용 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    async def put_file(self, file_path: str, key: str, content_type: Optional[str] = None) -> str:
+        """로컬 파일을 key 경로에 공개 업로드하고 URL 반환 (실패 시 예외)
+
+        큰 파일은 TransferConfig에 따라 멀티파트로 업로드됩니다.
+        """
+        self._ensure_ready()
+        await self._run(
+            self.s3_client.upload_file,
+            file_path,
+            self.bucket_name,
+            key,
+            ExtraArgs=self._extra_args(key, content_type),
+            Config=self.transfer_config,
+        )
+        return f"{self.bucket_name}/{key}"
+
+    async def put_bytes(self, data: bytes, key: str, content_type: Optional[str] = None) -> str:
+        """메모리 상의 바이트를 key 경로에 공개 업로드하고 URL 반환 (실패 시 예외)"""
+        self._ensure_ready()
+        await self._run(
+            self.s3_client.upload_fileobj,
+            BytesIO(data),
+            self.bucket_name,
+            key,
+            ExtraArgs=self._extra_args(key, content_type),
+            Config=self.transfer_config,
+        )
+        return f"{self.bucket_name}/{key}"
+
+    async def get_bytes(self, url: str) -> bytes:
+        """put_* 가 반환한 URL("버킷/키")의 객체를 읽어 바이트로 반환 (실패 시 예외)"""
+        if not self.s3_client:
+            raise ValueError("NCP S3 client not configured")
+        bucket, _, key = url.partition("/")
+        response = await self._run(self.s3_client.get_object, Bucket=bucket, Key=key)
+        return await self._run(response["Body"].read)
+
     async def upload_to_ncp(self, file_path: str, folder: str = None) -> Optional[str]:
         """파일을 NCP에 업로드하고 URL 반환
 
@@ -45,7 +136,7 @@ class NCPStorageRepository:
         Returns:
             업로드된 파일의 공개 URL (실패시 None)
         """
-        if not self.s3_client or not settings.naver_bucket_name:
+        if not self.s3_client or not self.bucket_name:
             logger.warning("⚠️ NCP S3 client or bucket name not configured")
             return None
 
@@ -54,34 +145,47 @@ class NCPStorageRepository:
             folder = settings.naver_bucket_tts_folder
 
         try:
-            filename = os.path.basename(file_path)
-            ncp_path = self._generate_ncp_path(filename, folder)
+            ncp_path = self._generate_ncp_path(os.path.basename(file_path), folder)
+            file_url = await self.put_file(file_path, ncp_path)
+            logger.info(f"✅ Successfully uploaded to NCP: {file_url}")
+            return file_url
 
-            # 파일을 바이트로 읽기
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
+        except Exception as e:
+            logger.error(f"⚠️ NCP upload failed for {file_path}: {str(e)}")
+            return None
 
-            file_obj = BytesIO(file_content)
+    async def upload_bytes(
+        self, data: bytes, filename: str, folder: str = None, content_type: str = "audio/mpeg"
+    ) -> Optional[str]:
+        """메모리 상의 바이트를 NCP에 바로 업로드하고 URL 반환 (로컬 파일 없이)
 
-            # NCP에 파일 업로드
-            self.s3_client.upload_fileobj(
-                file_obj,
-                settings.naver_bucket_name,
-                ncp_path
-            )
+        Args:
+            data: 업로드할 바이트
+            filename: NCP에 저장할 파일명
+            folder: NCP 버킷 내 폴더 경로 (기본값: TTS 폴더)
+            content_type: Content-Type 헤더
 
-            # 파일을 공개로 설정
-            self.s3_client.put_object_acl(
-                Bucket=settings.naver_bucket_name,
-                Key=ncp_path,
-                ACL='public-read'
-            )
+        Returns:
+            업로드된 파일의 공개 URL (실패시 None)
+        """
+        if not self.s3_client or not self.bucket_name:
+            logger.warning("⚠️ NCP S3 client or bucket name not configured")
+            return None
 
-            # URL 생성 및 반환
-            file_url = f"{settings.naver_bucket_name}/{ncp_path}"
+        # 폴더 기본값 설정
+        if folder is None:
+            folder = settings.naver_bucket_tts_folder
+
+        try:
+            ncp_path = self._generate_ncp_path(filename, folder)
+            file_url = await self.put_bytes(data, ncp_path, content_type)
             logger.info(f"✅ Successfully uploaded to NCP: {file_url}")
             return file_url
 
         except Exception as e:
-            logger.error(f"⚠️ NCP upload failed for {file_path}: {str(e)}")
+            logger.error(f"⚠️ NCP upload failed for {filename}: {str(e)}")
             return None
+
+
+# 전역 NCP 스토리지 인스턴스 (클라이언트/커넥션 풀/스레드 풀 공유)
+ncp_storage = NCPStorageRepository()
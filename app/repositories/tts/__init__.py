@@ -1,9 +1,49 @@
 from app.repositories.tts.base import BaseTTSRepository
 from app.repositories.tts.gemini_tts import GeminiTTSRepository
 from app.repositories.tts.openai_tts import OpenAITTSRepository
+from app.repositories.tts.utils import get_mp3_duration, get_mp3_sample_rate, concat_mp3, split_mp3, find_silence_cuts
+from app.repositories.tts.encoder import MP3EncoderPool, encode_pcm_stream, mp3_encoder
+from app.repositories.tts.job_store import TTSJobStore, tts_job_store
+from app.repositories.tts.audio_cache import TTSAudioCache, tts_audio_cache
+from app.repositories.tts.hedging import LatencyTracker, hedged_request, tts_latency_tracker
+from app.repositories.tts.http_client import PooledHTTPClient, PhaseMetrics, create_http_client, murf_http_client, murf_phase_metrics
+from app.repositories.tts.scheduler import TTSPriority, TTSScheduler, tts_scheduler
+from app.repositories.tts.rate_limiter import (
+    AdaptiveRateLimiter,
+    get_rate_limiter,
+    get_rate_limiter_stats,
+    is_rate_limit_error,
+)
 
 __all__ = [
     "BaseTTSRepository",
     "GeminiTTSRepository",
     "OpenAITTSRepository",
+    "get_mp3_duration",
+    "get_mp3_sample_rate",
+    "concat_mp3",
+    "split_mp3",
+    "find_silence_cuts",
+    "MP3EncoderPool",
+    "mp3_encoder",
+    "encode_pcm_stream",
+    "TTSJobStore",
+    "tts_job_store",
+    "TTSAudioCache",
+    "tts_audio_cache",
+    "LatencyTracker",
+    "hedged_request",
+    "tts_latency_tracker",
+    "PooledHTTPClient",
+    "PhaseMetrics",
+    "create_http_client",
+    "murf_http_client",
+    "murf_phase_metrics",
+    "TTSPriority",
+    "TTSScheduler",
+    "tts_scheduler",
+    "AdaptiveRateLimiter",
+    "get_rate_limiter",
+    "get_rate_limiter_stats",
+    "is_rate_limit_error",
 ]
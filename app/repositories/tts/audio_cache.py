@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+from app.utils.process_text import strip_rich_text_tags
+
+logger = setup_logger('tts_audio_cache', 'logs/tts')
+
+# TTL/최대 개수 정리 주기 (초) - 저장할 때마다 테이블을 훑지 않도록 주기적으로만 실행
+_PURGE_INTERVAL_SECONDS = 300.0
+
+
+class TTSAudioCache:
+    """생성된 TTS 오디오의 콘텐츠 주소 기반 캐시
+
+    (provider, model, voice, 정규화된 텍스트)의 해시를 키로 이미 업로드된 NCP URL과
+    재생 시간을 로컬 SQLite 인덱스에 저장합니다. 같은 문장을 다시 요청하면
+    프로바이더 호출과 NCP 업로드 없이 기존 URL을 반환합니다.
+    """
+
+    def __init__(self, db_path: str, max_entries: int, ttl_seconds: int, enabled: bool = True):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._entries: Optional[int] = None  # 항목 수 (연결 시 1회 계산 후 증감, 정리 때 재계산)
+
+        # 통계
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._errors = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Rich Text 태그 제거 + 공백 정규화"""
+        return " ".join((strip_rich_text_tags(text or "") or "").split())
+
+    @classmethod
+    def make_key(cls, provider: str, model: str, voice: str, text: str) -> str:
+        """캐시 키 생성 (SHA-256)"""
+        payload = json.dumps(
+            [provider.lower(), model or "", voice or "", cls.normalize_text(text)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tts_audio_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    voice TEXT,
+                    ncp_url TEXT NOT NULL,
+                    duration REAL,
+                    size_bytes INTEGER,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tts_audio_cache_last_access ON tts_audio_cache (last_access)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tts_audio_cache_created_at ON tts_audio_cache (created_at)"
+            )
+            conn.commit()
+            self._entries = conn.execute("SELECT COUNT(*) FROM tts_audio_cache").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _get_sync(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT ncp_url, duration, created_at FROM tts_audio_cache WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            ncp_url, duration, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                # 만료된 항목 (NCP 객체 수명 정책보다 짧게 유지)
+                conn.execute("DELETE FROM tts_audio_cache WHERE cache_key = ?", (cache_key,))
+                conn.commit()
+                self._evictions += 1
+                self._entries -= 1
+                return None
+
+            conn.execute(
+                "UPDATE tts_audio_cache SET last_access = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                (now, cache_key),
+            )
+            conn.commit()
+            return {"ncp_url": ncp_url, "duration": duration}
+
+    def _put_sync(
+        self, cache_key: str, provider: str, voice: str, ncp_url: str,
+        duration: Optional[float], size_bytes: Optional[int],
+    ):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            exists = conn.execute("SELECT 1 FROM tts_audio_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO tts_audio_cache
+                    (cache_key, provider, voice, ncp_url, duration, size_bytes, created_at, last_access, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (cache_key, provider, voice, ncp_url, duration, size_bytes, now, now),
+            )
+            if not exists:
+                self._entries += 1
+            self._purge(conn, now)
+            conn.commit()
+
+    def _purge(self, conn: sqlite3.Connection, now: float):
+        """TTL 만료 항목 정리 + 최대 개수 초과 시 오래 사용되지 않은 항목부터 제거 (LRU)
+
+        _PURGE_INTERVAL_SECONDS마다 한 번만 실행하며, 항목 수도 이때 다시 계산합니다
+        (멀티 워커가 같은 파일을 쓰면 워커별 증감 값이 어긋날 수 있으므로).
+        """
+        if now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        evicted = 0
+        if self.ttl_seconds:
+            evicted += conn.execute(
+                "DELETE FROM tts_audio_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM tts_audio_cache").fetchone()[0]
+        if self.max_entries and count > self.max_entries:
+            removed = conn.execute(
+                """
+                DELETE FROM tts_audio_cache WHERE cache_key IN (
+                    SELECT cache_key FROM tts_audio_cache ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (count - self.max_entries,),
+            ).rowcount
+            evicted += removed
+            count -= removed
+        self._entries = count
+        self._evictions += evicted
+
+    async def get(self, provider: str, model: str, voice: str, text: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 - 적중 시 {"ncp_url", "duration"} 반환"""
+        if not self.enabled:
+            return None
+
+        cache_key = self.make_key(provider, model, voice, text)
+        try:
+            entry = await asyncio.to_thread(self._get_sync, cache_key)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ TTS 캐시 조회 실패 (미스로 처리): {str(e)}")
+            entry = None
+
+        if entry:
+            self._hits += 1
+            logger.info(f"🎯 TTS 캐시 적중: provider={provider}, voice={voice}, url={entry['ncp_url']}")
+        else:
+            self._misses += 1
+        return entry
+
+    async def put(
+        self, provider: str, model: str, voice: str, text: str, ncp_url: Optional[str],
+        duration: Optional[float], size_bytes: Optional[int] = None,
+    ):
+        """생성 결과 저장 (업로드 URL이 있을 때만)"""
+        if not self.enabled or not ncp_url:
+            return
+
+        cache_key = self.make_key(provider, model, voice, text)
+        try:
+            await asyncio.to_thread(self._put_sync, cache_key, provider, voice, ncp_url, duration, size_bytes)
+            self._stores += 1
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ TTS 캐시 저장 실패: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중/미스 통계 반환"""
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            # 저장소를 조회하지 않고 유지 중인 항목 수 사용 (아직 연결 전이면 None)
+            "entries": self._entries if self.enabled else None,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "stores": self._stores,
+            "evictions": self._evictions,
+            "errors": self._errors,
+        }
+
+
+# 전역 TTS 오디오 캐시 인스턴스
+tts_audio_cache = TTSAudioCache(
+    db_path=os.path.join(settings.tts_cache_dir, "tts_audio_cache.sqlite3"),
+    max_entries=settings.tts_cache_max_entries,
+    ttl_seconds=settings.tts_cache_ttl_seconds,
+    enabled=settings.tts_cache_enabled,
+)
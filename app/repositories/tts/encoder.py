@@ -0,0 +1,159 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any, AsyncIterator
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+# 워커가 app.repositories.tts 패키지 전체를 import하지 않도록 패키지 밖 모듈의 함수를 제출
+from app.repositories._encode_worker import pcm_to_mp3_bytes
+
+logger = setup_logger('tts_encoder', 'logs/tts')
+
+
+class MP3EncoderPool:
+    """PCM → MP3 인코딩 전용 프로세스 풀
+
+    pydub/ffmpeg 인코딩을 별도 프로세스에서 실행해 이벤트 루프를 비워두고
+    여러 코어로 분산합니다. 대기 중인 인코딩 수가 max_pending을 넘으면
+    호출자가 대기합니다(백프레셔).
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers or (os.cpu_count() or 2)
+        self.max_pending = max_pending or self.max_workers * 2
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+        # 통계
+        self._encoded = 0
+        self._failed = 0
+        self._in_flight = 0
+        self._total_wait = 0.0
+        self._total_encode = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 스레드 풀(업로드 등)이 있는 프로세스에서 fork하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"🧵 MP3 인코더 프로세스 풀 시작: workers={self.max_workers}, max_pending={self.max_pending}")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """현재 이벤트 루프에 바인딩된 Semaphore 반환 (루프가 바뀌면 재생성)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def encode(self, pcm_bytes: bytes, sample_rate: int = 24000, channels: int = 1) -> bytes:
+        """Raw 16-bit LE PCM → MP3 바이트 (프로세스 풀에서 실행)"""
+        loop = asyncio.get_running_loop()
+        wait_start = time.monotonic()
+
+        async with self._get_semaphore():
+            encode_start = time.monotonic()
+            self._total_wait += encode_start - wait_start
+            self._in_flight += 1
+            try:
+                try:
+                    mp3_bytes = await loop.run_in_executor(
+                        self._get_executor(), pcm_to_mp3_bytes, pcm_bytes, sample_rate, channels
+                    )
+                except BrokenProcessPool:
+                    # 워커가 비정상 종료되면 풀을 재생성하고 이번 요청은 스레드에서 처리
+                    logger.error("❌ MP3 인코더 프로세스 풀 손상 - 재생성 후 스레드에서 인코딩")
+                    self._reset_executor()
+                    mp3_bytes = await asyncio.to_thread(pcm_to_mp3_bytes, pcm_bytes, sample_rate, channels)
+            except Exception:
+                self._failed += 1
+                raise
+            finally:
+                self._in_flight -= 1
+
+        self._encoded += 1
+        self._total_encode += time.monotonic() - encode_start
+        return mp3_bytes
+
+    def _reset_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """프로세스 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("🧹 MP3 인코더 프로세스 풀 종료")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """인코더 통계 반환"""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "encoded": self._encoded,
+            "failed": self._failed,
+            "avg_wait": round(self._total_wait / (self._encoded + self._failed), 3) if (self._encoded + self._failed) else 0.0,
+            "avg_encode": round(self._total_encode / self._encoded, 3) if self._encoded else 0.0,
+        }
+
+
+async def encode_pcm_stream(
+    pcm_chunks: AsyncIterator[bytes], sample_rate: int = 24000, channels: int = 1,
+    bitrate: str = "64k", read_size: int = 4096,
+) -> AsyncIterator[bytes]:
+    """PCM 청크가 도착하는 대로 ffmpeg 파이프로 MP3 인코딩하여 바로 내보냄 (스트리밍 응답용)
+
+    입력(stdin) 쓰기와 출력(stdout) 읽기를 동시에 진행해 파이프 교착을 피합니다.
+    입력 이터레이터에서 발생한 예외는 출력이 끝난 뒤 그대로 전파됩니다.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+        "-f", "mp3", "-b:a", bitrate, "-flush_packets", "1", "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+
+    async def _feed():
+        try:
+            async for chunk in pcm_chunks:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        finally:
+            proc.stdin.close()
+
+    feeder = asyncio.create_task(_feed())
+    try:
+        while True:
+            data = await proc.stdout.read(read_size)
+            if not data:
+                break
+            yield data
+        await feeder
+        await proc.wait()
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+# 전역 MP3 인코더 인스턴스 (프로세스 풀은 첫 인코딩 시 생성)
+mp3_encoder = MP3EncoderPool(
+    max_workers=settings.tts_encoder_workers,
+    max_pending=settings.tts_encoder_max_pending,
+)
@@ -1,7 +1,7 @@
 import asyncio
 import os
 import random
-from typing import Optional, Tuple
+from typing import Optional, Tuple, AsyncIterator, Callable
 from datetime import datetime
 
 from google import genai
@@ -11,8 +11,10 @@ from app.config import settings
 from app.models.voice.tts import GenderType
 from app.utils.logger.setup import setup_logger
 from app.repositories.tts.base import BaseTTSRepository
-from app.repositories.tts.utils import ensure_bytes, pcm_to_mp3_file, add_mp3_ext
-from app.repositories.storage.ncp_storage import NCPStorageRepository
+from app.repositories.tts.utils import ensure_bytes, add_mp3_ext, get_mp3_duration
+from app.repositories.tts.encoder import mp3_encoder, encode_pcm_stream
+from app.repositories.tts.rate_limiter import get_rate_limiter, is_rate_limit_error
+from app.repositories.storage.ncp_storage import ncp_storage
 
 logger = setup_logger('gemini_tts_repository', 'logs/tts')
 
@@ -23,20 +25,18 @@ class GeminiTTSRepository(BaseTTSRepository):
     def __init__(self):
         """Gemini 클라이언트 초기화"""
         api_key = os.getenv("GEMINI_API_KEY", settings.gemini_api_key)
-        self.client = genai.Client(api_key=api_key)
+        http_options = types.HttpOptions(base_url=settings.gemini_tts_base_url) if settings.gemini_tts_base_url else None
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
 
-        # NCP Storage Repository 초기화
-        self.storage = NCPStorageRepository()
+        # 프로세스 전역 NCP Storage Repository (커넥션 풀 공유)
+        self.storage = ncp_storage
+
+        # 프로세스 전역 Gemini 레이트 리미터
+        self.rate_limiter = get_rate_limiter("gemini")
 
     async def _is_rate_limit_error(self, error: Exception) -> bool:
         """429 에러인지 확인"""
-        error_str = str(error).lower()
-        return (
-            "429" in error_str or
-            "rate limit" in error_str or
-            "too many requests" in error_str or
-            "quota exceeded" in error_str
-        )
+        return is_rate_limit_error(error)
 
     async def _retry_with_backoff(self, func, max_retries: int = 3, base_delay: float = 1.0):
         """Exponential backoff을 사용한 재시도 로직"""
@@ -60,14 +60,98 @@ class GeminiTTSRepository(BaseTTSRepository):
                     else:
                         raise e
 
+    def _speech_config(self, clean_voice: str) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            response_modalities=["AUDIO"],
+            speech_config=types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                        voice_name=clean_voice
+                    )
+                )
+            ),
+        )
+
+    async def stream_pcm(self, text: str, voice) -> AsyncIterator[bytes]:
+        """Gemini 스트리밍 응답에서 PCM 청크를 도착하는 대로 반환"""
+        clean_voice = self._get_clean_voice_value(voice)
+
+        await self.rate_limiter.acquire()
+        api_start = datetime.now()
+        first_chunk = True
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=settings.tts_model,
+                contents=text,
+                config=self._speech_config(clean_voice),
+            )
+            async for resp in stream:
+                for candidate in resp.candidates or []:
+                    if not candidate.content or not candidate.content.parts:
+                        continue
+                    for part in candidate.content.parts:
+                        if getattr(part, "inline_data", None) and part.inline_data.data:
+                            if first_chunk:
+                                ttfb = (datetime.now() - api_start).total_seconds()
+                                logger.info(f"⚡ Gemini 스트리밍 첫 오디오: {ttfb:.3f}초")
+                                self.rate_limiter.record_success(ttfb)
+                                first_chunk = False
+                            yield ensure_bytes(part.inline_data.data)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.rate_limiter.record_rate_limited()
+            raise
+
+        if first_chunk:
+            raise ValueError(f"Gemini API returned no audio data for voice: {clean_voice}")
+
+    async def synthesize_pcm(self, text: str, voice) -> bytes:
+        """업로드/인코딩 없이 PCM(24kHz 16bit mono) 바이트만 반환 (긴 텍스트 청크 합성용, 실패 시 예외)"""
+        clean_voice = self._get_clean_voice_value(voice)
+
+        await self.rate_limiter.acquire()
+        api_start = datetime.now()
+        try:
+            resp = await self.client.aio.models.generate_content(
+                model=settings.tts_model,
+                contents=text,
+                config=self._speech_config(clean_voice),
+            )
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.rate_limiter.record_rate_limited()
+            raise
+        self.rate_limiter.record_success((datetime.now() - api_start).total_seconds())
+
+        for candidate in (resp.candidates or []) if resp else []:
+            if candidate.content and candidate.content.parts:
+                part = candidate.content.parts[0]
+                if getattr(part, "inline_data", None) and part.inline_data.data:
+                    return ensure_bytes(part.inline_data.data)
+        raise ValueError(f"Gemini API returned no audio data for voice: {clean_voice}")
+
+    async def stream_tts(self, text: str, voice) -> AsyncIterator[bytes]:
+        """Gemini PCM 스트림을 도착하는 대로 MP3로 인코딩하여 반환"""
+        async for chunk in encode_pcm_stream(self.stream_pcm(text, voice), sample_rate=24000):
+            yield chunk
+
     async def generate_tts(
-        self, text: str, voice, filename: str, gender_hint: GenderType
-    ) -> Tuple[bool, Optional[str], bool]:
-        """TTS 생성 → PCM 수신 → MP3 저장 → NCP 업로드 URL 반환 (429 에러 재시도 포함)
-        반환값: (success, ncp_url, is_rate_limit)
+        self, text: str, voice, filename: str, gender_hint: GenderType, with_duration: bool = False,
+        on_started: Optional[Callable[[], None]] = None
+    ) -> Tuple:
+        """TTS 생성 → PCM 수신 → 메모리에서 MP3 변환 → NCP 업로드 URL 반환 (429 에러 재시도 포함)
+        반환값: (success, ncp_url, is_rate_limit), with_duration=True면 (..., duration)
+        on_started: 리미터 토큰을 받아 실제 API 호출을 시작할 때마다 호출 (헤지 대기 시간 측정용)
         """
+        duration = None
+
+        def _result(success: bool, ncp_url: Optional[str], is_rate_limit: bool) -> Tuple:
+            if with_duration:
+                return success, ncp_url, is_rate_limit, duration
+            return success, ncp_url, is_rate_limit
 
         async def _generate_tts_internal():
+            nonlocal duration
             # Voice 값을 실제 문자열로 변환
             clean_voice = self._get_clean_voice_value(voice)
 
@@ -76,26 +160,23 @@ class GeminiTTSRepository(BaseTTSRepository):
 
             logger.info(f"🎵 Generating TTS (Gemini): voice={clean_voice}, file={filename}")
 
+            # 공유 레이트 리미터에서 토큰 획득 후 호출
+            await self.rate_limiter.acquire()
+            if on_started:
+                on_started()
+
             # Gemini API 호출 시간 측정
             api_start = datetime.now()
             resp = await self.client.aio.models.generate_content(
                 model=settings.tts_model,  # 예: "gemini-2.5-pro-preview-tts"
                 contents=text,
-                config=types.GenerateContentConfig(
-                    response_modalities=["AUDIO"],
-                    speech_config=types.SpeechConfig(
-                        voice_config=types.VoiceConfig(
-                            prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                voice_name=clean_voice
-                            )
-                        )
-                    ),
-                ),
+                config=self._speech_config(clean_voice),
             )
             api_end = datetime.now()
             api_duration = (api_end - api_start).total_seconds()
 
             logger.info(f"⚡ Gemini API 응답: {api_duration:.3f}초")
+            self.rate_limiter.record_success(api_duration)
 
             if not resp or not resp.candidates:
                 logger.error(f"❌ Gemini API returned empty response for voice: {clean_voice}")
@@ -119,19 +200,20 @@ class GeminiTTSRepository(BaseTTSRepository):
             raw = part.inline_data.data
             pcm_bytes = ensure_bytes(raw)
 
-            # MP3 저장
+            # MP3 변환 (디스크를 거치지 않고 인코더 프로세스 풀에서 실행)
             base = filename.rsplit(".", 1)[0] if "." in filename else filename
-            mp3_path = add_mp3_ext(base)
-            pcm_to_mp3_file(pcm_bytes, mp3_path, sample_rate=24000)
+            mp3_name = os.path.basename(add_mp3_ext(base))
+            mp3_bytes = await mp3_encoder.encode(pcm_bytes, sample_rate=24000)
+            duration = get_mp3_duration(mp3_bytes)
             process_end = datetime.now()
             process_duration = (process_end - process_start).total_seconds()
 
             logger.info(f"🔄 오디오 처리: {process_duration:.3f}초")
-            logger.info(f"✅ Saved MP3: {mp3_path}")
+            logger.info(f"✅ Encoded MP3: {mp3_name} ({len(mp3_bytes)} bytes, {duration}초)")
 
             # NCP 업로드 시간 측정
             upload_start = datetime.now()
-            ncp_url = await self.storage.upload_to_ncp(mp3_path)
+            ncp_url = await self.storage.upload_bytes(mp3_bytes, mp3_name)
             upload_end = datetime.now()
             upload_duration = (upload_end - upload_start).total_seconds()
 
@@ -150,23 +232,23 @@ class GeminiTTSRepository(BaseTTSRepository):
                 if upload_duration > 1.0:
                     logger.warning(f"   • NCP 업로드 지연: {upload_duration:.3f}초")
 
-            return True, ncp_url, False
+            return _result(True, ncp_url, False)
 
-        # "no content" 에러에만 재시도, Rate limit은 OpenAI로 전환
+        # "no content" 에러는 백오프 재시도, Rate limit은 리미터에 반영 후 재시도하고
+        # 재시도 한도를 넘으면 OpenAI로 전환
         max_retries = settings.tts_max_retries
         base_delay = settings.tts_base_delay
+        rate_limit_retries = 0
+        attempt = 0
 
-        for attempt in range(max_retries + 1):
+        while True:
             try:
                 return await _generate_tts_internal()
             except Exception as e:
                 error_str = str(e).lower()
 
                 # Rate limit 에러 체크
-                is_rate = (
-                    "429" in error_str or "rate limit" in error_str or
-                    "too many requests" in error_str or "quota exceeded" in error_str
-                )
+                is_rate = is_rate_limit_error(e)
 
                 # "no content" 에러 체크
                 is_no_content = (
@@ -174,22 +256,28 @@ class GeminiTTSRepository(BaseTTSRepository):
                     "returned no content" in error_str
                 )
 
-                # Rate limit 에러는 즉시 OpenAI로 전환
+                # Rate limit 에러는 공유 리미터 속도를 낮추고 제한된 횟수만큼 재시도
                 if is_rate:
-                    logger.warning(f"⚠️ Rate limit detected, switching to OpenAI TTS: {e}")
-                    return False, None, True  # is_rate_limit=True로 반환
+                    self.rate_limiter.record_rate_limited()
+                    if rate_limit_retries < settings.tts_rate_limit_max_retries:
+                        rate_limit_retries += 1
+                        logger.warning(f"⚠️ Rate limit detected, retrying through limiter ({rate_limit_retries}/{settings.tts_rate_limit_max_retries}): {e}")
+                        continue
+                    logger.warning(f"⚠️ Rate limit persists, switching to OpenAI TTS: {e}")
+                    return _result(False, None, True)  # is_rate_limit=True로 반환
 
                 # 마지막 시도인 경우 에러 발생
-                if attempt == max_retries:
+                if attempt >= max_retries:
                     logger.error(f"❌ Error generating TTS for {filename} (final attempt): {e}")
-                    return False, None, False
+                    return _result(False, None, False)
 
                 # "no content" 에러에만 재시도
                 if is_no_content:
                     delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
                     logger.warning(f"⚠️ 'No content' error detected (attempt {attempt + 1}/{max_retries + 1}). Retrying in {delay:.2f}s...")
+                    attempt += 1
                     await asyncio.sleep(delay)
                 else:
                     # 재시도 불가능한 에러는 즉시 반환
                     logger.error(f"❌ Non-retryable error generating TTS for {filename}: {e}")
-                    return False, None, False
+                    return _result(False, None, False)
@@ -0,0 +1,180 @@
+import asyncio
+import bisect
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple, List, Deque
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('tts_hedging', 'logs/tts')
+
+# 꼬리 지연 히스토그램 구간 (초)
+_BUCKETS = (0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0)
+
+
+class LatencyTracker:
+    """프로바이더별 응답 시간 추적
+
+    - (provider, 성별)마다 최근 N개 응답 시간으로 분위수(p95 등)를 계산해 헤지 대기 시간으로 사용
+    - 프로바이더마다 누적 히스토그램을 두어 꼬리 지연 분포 확인 및 설정 튜닝에 사용
+    """
+
+    def __init__(self, window: int, quantile: float, min_samples: int):
+        self.window = window
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._histograms: Dict[str, List[int]] = {}
+        self._hedges: Dict[str, Dict[str, int]] = {}
+
+    def record(self, provider: str, key: str, latency: float):
+        samples = self._samples.get((provider, key))
+        if samples is None:
+            samples = self._samples[(provider, key)] = deque(maxlen=self.window)
+        samples.append(latency)
+
+        histogram = self._histograms.setdefault(provider, [0] * (len(_BUCKETS) + 1))
+        histogram[bisect.bisect_left(_BUCKETS, latency)] += 1
+
+    def percentile(self, provider: str, key: str, quantile: Optional[float] = None) -> Optional[float]:
+        samples = self._samples.get((provider, key))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * (quantile or self.quantile)))
+        return ordered[index]
+
+    def hedge_delay(self, provider: str, key: str) -> float:
+        """보조 프로바이더 요청을 시작하기 전 기다릴 시간 (표본이 부족하면 기본값)"""
+        delay = self.percentile(provider, key)
+        if delay is None:
+            delay = settings.tts_hedge_default_delay
+        return min(settings.tts_hedge_max_delay, max(settings.tts_hedge_min_delay, delay))
+
+    def record_hedge(self, provider: str, outcome: str):
+        counters = self._hedges.setdefault(provider, {"fired": 0, "primary_won": 0, "secondary_won": 0})
+        counters[outcome] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        labels = [f"<={bound:g}s" for bound in _BUCKETS] + [f">{_BUCKETS[-1]:g}s"]
+        stats: Dict[str, Any] = {}
+        for provider, histogram in self._histograms.items():
+            stats[provider] = {
+                "histogram": dict(zip(labels, histogram)),
+                "count": sum(histogram),
+                "hedges": dict(self._hedges.get(provider, {})),
+                "by_gender": {},
+            }
+        for (provider, key), samples in self._samples.items():
+            stats[provider]["by_gender"][key] = {
+                "samples": len(samples),
+                "p50": self.percentile(provider, key, 0.5),
+                "p95": self.percentile(provider, key, 0.95),
+                "p99": self.percentile(provider, key, 0.99),
+                "hedge_delay": round(self.hedge_delay(provider, key), 3),
+            }
+        return stats
+
+
+def _discard(task: asyncio.Task):
+    """진 쪽 요청 취소 (취소 전에 끝난 예외는 조용히 회수)"""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def hedged_request(
+    primary: str,
+    secondary: str,
+    key: str,
+    primary_call: Callable[[Callable[[], None]], Awaitable[Any]],
+    secondary_call: Callable[[Callable[[], None]], Awaitable[Any]],
+    is_success: Callable[[Any], bool],
+) -> Tuple[str, Any, bool]:
+    """헤지 요청 - 주 프로바이더가 동적 임계값 안에 응답하지 않으면 보조 프로바이더도 호출
+
+    각 호출은 시작 알림 콜백(mark_started)을 인자로 받아, 스케줄러 슬롯과 리미터 토큰을 받은 뒤
+    실제 API 호출 직전에 호출해야 합니다. 헤지 대기 시간과 응답 시간 표본은 이 시점부터 측정하므로
+    대기열에서 기다린 시간은 프로바이더 지연으로 취급되지 않습니다.
+
+    먼저 성공한 쪽 결과를 쓰고 나머지는 취소합니다.
+    반환값: ("primary" | "secondary", 결과, 헤지 요청 여부). 주 요청이 헤지 전에 실패하면 그 결과를 그대로
+    반환하므로 호출 측의 기존 실패 처리(429 전환 등)가 그대로 동작합니다.
+    """
+    started_at: Dict[str, float] = {}
+    primary_granted = asyncio.Event()
+
+    def marker(provider: str) -> Callable[[], None]:
+        def mark_started():
+            # 재시도로 여러 번 호출돼도 첫 호출 시점만 사용
+            if provider not in started_at:
+                started_at[provider] = time.monotonic()
+                if provider == primary:
+                    primary_granted.set()
+        return mark_started
+
+    async def timed(provider: str, call: Callable[[Callable[[], None]], Awaitable[Any]]):
+        result = await call(marker(provider))
+        began = started_at.get(provider)
+        if began is not None and is_success(result):
+            tts_latency_tracker.record(provider, key, time.monotonic() - began)
+        return result
+
+    primary_task = asyncio.create_task(timed(primary, primary_call))
+    if not settings.tts_hedging_enabled:
+        return "primary", await primary_task, False
+
+    delay = tts_latency_tracker.hedge_delay(primary, key)
+    granted_task = asyncio.create_task(primary_granted.wait())
+    try:
+        # 슬롯/리미터 대기 중에는 헤지하지 않음 (포화 상태에서 보조 프로바이더 비용이 두 배가 되는 것 방지)
+        await asyncio.wait({primary_task, granted_task}, return_when=asyncio.FIRST_COMPLETED)
+        if not primary_task.done():
+            await asyncio.wait({primary_task}, timeout=delay)
+    except asyncio.CancelledError:
+        _discard(primary_task)
+        raise
+    finally:
+        granted_task.cancel()
+    if primary_task.done():
+        return "primary", primary_task.result(), False
+
+    logger.info(f"🪁 {primary} 응답이 {delay:.2f}초 내에 없어 {secondary} 헤지 요청 시작 ({key})")
+    tts_latency_tracker.record_hedge(primary, "fired")
+    secondary_task = asyncio.create_task(timed(secondary, secondary_call))
+    names = {primary_task: "primary", secondary_task: "secondary"}
+    pending = {primary_task, secondary_task}
+    results: Dict[str, Any] = {}
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = names[task]
+                results[name] = task.exception() or task.result()
+                if not task.exception() and is_success(task.result()):
+                    for other in pending:
+                        _discard(other)
+                    tts_latency_tracker.record_hedge(primary, f"{name}_won")
+                    if name == "secondary" and primary_task in pending:
+                        # 취소된 주 요청은 최소 이만큼 걸린 것으로 기록 (빠른 응답만 남아 임계값이 낮아지는 것 방지)
+                        tts_latency_tracker.record(primary, key, time.monotonic() - started_at[primary])
+                    return name, task.result(), True
+    except asyncio.CancelledError:
+        for task in pending:
+            _discard(task)
+        raise
+
+    # 둘 다 실패: 주 요청 결과를 우선 반환 (둘 다 예외면 주 요청 예외 전파)
+    for name in ("primary", "secondary"):
+        if not isinstance(results[name], BaseException):
+            return name, results[name], True
+    raise results["primary"]
+
+
+# 프로세스 전역 응답 시간 추적기
+tts_latency_tracker = LatencyTracker(
+    window=settings.tts_hedge_window,
+    quantile=settings.tts_hedge_quantile,
+    min_samples=settings.tts_hedge_min_samples,
+)
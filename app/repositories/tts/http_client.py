@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Deque
+
+import httpx
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('tts_http_client', 'logs/tts')
+
+try:
+    import h2  # noqa: F401  httpx의 HTTP/2 지원에 필요
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def create_http_client(http2: bool, max_connections: int, connect_timeout: float, read_timeout: float) -> httpx.AsyncClient:
+    """연결 풀을 유지하는 httpx 클라이언트 생성 (h2 패키지가 없으면 HTTP/1.1 keep-alive로 동작)"""
+    return httpx.AsyncClient(
+        http2=http2 and _HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        follow_redirects=True,
+    )
+
+
+class PooledHTTPClient:
+    """프로세스 전역 다운로드 클라이언트
+
+    요청마다 새 AsyncClient(매번 TLS 핸드셰이크)를 만들지 않고 연결을 재사용합니다.
+    이벤트 루프가 바뀌면 이전 루프의 연결은 쓸 수 없으므로 새로 만듭니다.
+    """
+
+    def __init__(self, name: str, http2: bool, max_connections: int, connect_timeout: float, read_timeout: float):
+        self.name = name
+        self.http2 = http2
+        self.max_connections = max(1, max_connections)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+        self._created = 0
+        self._bytes = 0
+        if http2 and not _HTTP2_AVAILABLE:
+            logger.warning(f"⚠️ h2 패키지가 없어 {name} 다운로드는 HTTP/1.1 keep-alive로 동작합니다")
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = create_http_client(self.http2, self.max_connections, self.connect_timeout, self.read_timeout)
+            self._loop = loop
+            self._created += 1
+        return self._client
+
+    async def download(self, url: str) -> bytes:
+        """URL 전체를 바이트로 다운로드 (HTTP 오류 시 예외)"""
+        response = await self.get().get(url)
+        response.raise_for_status()
+        self._bytes += len(response.content)
+        return response.content
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2 and _HTTP2_AVAILABLE,
+            "max_connections": self.max_connections,
+            "clients_created": self._created,
+            "downloaded_bytes": self._bytes,
+        }
+
+
+class PhaseMetrics:
+    """요청 단계별(API 호출, 다운로드, 업로드 등) 소요 시간 통계 - 최근 window개로 분위수 계산"""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._total: Dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float, ok: bool = True):
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = self._samples[phase] = deque(maxlen=self.window)
+        samples.append(seconds)
+        counts = self._counts.setdefault(phase, {"ok": 0, "failed": 0})
+        counts["ok" if ok else "failed"] += 1
+        self._total[phase] = self._total.get(phase, 0.0) + seconds
+
+    def timed(self, phase: str) -> "_PhaseTimer":
+        """async with metrics.timed("download"): ... - 예외가 나면 실패로 기록"""
+        return _PhaseTimer(self, phase)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {}
+        for phase, samples in self._samples.items():
+            ordered = sorted(samples)
+            count = sum(self._counts[phase].values())
+
+            def quantile(q: float) -> float:
+                return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 3)
+
+            stats[phase] = {
+                **self._counts[phase],
+                "avg": round(self._total[phase] / count, 3),
+                "p50": quantile(0.5),
+                "p95": quantile(0.95),
+                "max": round(ordered[-1], 3),
+            }
+        return stats
+
+
+class _PhaseTimer:
+    def __init__(self, metrics: PhaseMetrics, phase: str):
+        self.metrics = metrics
+        self.phase = phase
+        self.started = 0.0
+
+    async def __aenter__(self):
+        self.started = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.metrics.record(self.phase, time.monotonic() - self.started, ok=exc_type is None)
+        return False
+
+
+# Murf 오디오 파일 다운로드용 전역 클라이언트와 단계별 통계
+murf_http_client = PooledHTTPClient(
+    "murf",
+    http2=settings.murf_http2,
+    max_connections=settings.murf_http_max_connections,
+    connect_timeout=settings.murf_connect_timeout,
+    read_timeout=settings.murf_download_timeout,
+)
+murf_phase_metrics = PhaseMetrics()
@@ -0,0 +1,502 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from app.config import settings
+from app.models.voice.tts import TTSJobStatus
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('tts_job_store', 'logs/tts')
+
+# 진행 중인 작업 상태 (메모리에서 제거하지 않고, 재시작 시 재개 대상)
+ACTIVE_STATUSES = (TTSJobStatus.PENDING.value, TTSJobStatus.PROCESSING.value)
+# 만료 삭제 대상 상태 ((status, updated_at) 인덱스로 범위 조회)
+_FINISHED_STATUSES = tuple(s.value for s in TTSJobStatus if s.value not in ACTIVE_STATUSES)
+# 만료 작업 삭제 주기 (초) - 작업 등록마다 테이블을 훑지 않도록 주기적으로만 실행
+_PURGE_INTERVAL_SECONDS = 300.0
+# 파일 목록을 제외하고 jobs 테이블 payload에 저장하지 않는 키
+_SUMMARY_KEYS = ("status", "total_files", "completed_files", "failed_files", "files")
+_DATETIME_KEYS = ("start_time", "end_time", "last_connection_check")
+# 이 워커 프로세스의 부팅 단위 ID (PID는 재사용되므로 작업 소유자 식별에 쓰지 않음)
+WORKER_ID = uuid.uuid4().hex
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+class TTSJobStore:
+    """TTS 작업 저장소 (메모리 LRU/TTL 계층 + SQLite 영속 계층)
+
+    - 작업 dict는 메모리에 그대로 두고 서비스가 직접 수정합니다 (기존 self.jobs와 동일한 사용법).
+    - 파일 단위 결과는 checkpoint_file()로 즉시 저장되어, 재시작 후 미완료 파일만 재개할 수 있습니다.
+    - 완료된 작업은 max_memory_jobs를 넘으면 메모리에서 빠지고 조회 시 SQLite에서 다시 읽습니다.
+    - ttl_seconds가 지난 완료 작업은 저장소에서 삭제됩니다.
+    - shared=True(멀티 워커)이면 메모리에는 이 워커가 실행하는 작업만 두고,
+      다른 워커의 작업은 조회할 때마다 SQLite에서 읽습니다.
+    - 진행 중 작업은 (WORKER_ID, lease_until) lease로 소유하며, 소유 워커가 renew_leases()로
+      lease_seconds마다 갱신합니다. 갱신이 끊긴 작업은 다른 워커가 load_unfinished()로 가져갑니다.
+    """
+
+    def __init__(
+        self, db_path: Optional[str], max_memory_jobs: int, ttl_seconds: int,
+        shared: bool = False, lease_seconds: float = 60.0,
+    ):
+        self.db_path = db_path
+        self.max_memory_jobs = max_memory_jobs
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared and db_path is not None
+        self.lease_seconds = lease_seconds
+
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._last_purge = 0.0
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS tts_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    total_files INTEGER NOT NULL,
+                    completed_files INTEGER NOT NULL DEFAULT 0,
+                    failed_files INTEGER NOT NULL DEFAULT 0,
+                    paused INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    lease_owner TEXT,
+                    lease_until REAL NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_tts_jobs_status ON tts_jobs (status);
+                CREATE INDEX IF NOT EXISTS idx_tts_jobs_created_at ON tts_jobs (created_at);
+                CREATE INDEX IF NOT EXISTS idx_tts_jobs_status_updated_at ON tts_jobs (status, updated_at);
+                CREATE TABLE IF NOT EXISTS tts_job_files (
+                    job_id TEXT NOT NULL,
+                    text_index INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (job_id, text_index)
+                );
+                """
+            )
+            # lease 컬럼이 없던 기존 저장소 마이그레이션
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tts_jobs)")}
+            if "lease_owner" not in columns:
+                conn.execute("ALTER TABLE tts_jobs ADD COLUMN lease_owner TEXT")
+                conn.execute("ALTER TABLE tts_jobs ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _claim(self, conn: sqlite3.Connection, job_id: str):
+        """작업 lease를 이 워커 소유로 설정/연장"""
+        conn.execute(
+            "UPDATE tts_jobs SET lease_owner = ?, lease_until = ? WHERE job_id = ?",
+            (WORKER_ID, time.time() + self.lease_seconds, job_id),
+        )
+
+    def _write_job(self, conn: sqlite3.Connection, job_id: str, job: Dict[str, Any]):
+        payload = {k: v for k, v in job.items() if k not in _SUMMARY_KEYS}
+        created_at = job["start_time"].timestamp() if isinstance(job.get("start_time"), datetime) else time.time()
+        conn.execute(
+            """
+            INSERT INTO tts_jobs
+                (job_id, kind, status, total_files, completed_files, failed_files, paused, created_at, updated_at, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET
+                status = excluded.status,
+                completed_files = excluded.completed_files,
+                failed_files = excluded.failed_files,
+                paused = excluded.paused,
+                updated_at = excluded.updated_at,
+                payload = excluded.payload
+            """,
+            (
+                job_id, job.get("kind", "batch"), _json_default(job["status"]), job["total_files"],
+                job["completed_files"], job["failed_files"], int(bool(job.get("paused"))),
+                created_at, time.time(), _dumps(payload),
+            ),
+        )
+
+    def _write_files(self, conn: sqlite3.Connection, job_id: str, files: List[Dict[str, Any]]):
+        conn.executemany(
+            "INSERT OR REPLACE INTO tts_job_files (job_id, text_index, status, payload) VALUES (?, ?, ?, ?)",
+            [(job_id, f["text_index"], f.get("status", "pending"), _dumps(f)) for f in files],
+        )
+
+    def _load_job(self, conn: sqlite3.Connection, job_id: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            "SELECT status, total_files, completed_files, failed_files, paused, payload FROM tts_jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        status, total_files, completed_files, failed_files, paused, payload = row
+        job = json.loads(payload)
+        for key in _DATETIME_KEYS:
+            if isinstance(job.get(key), str):
+                try:
+                    job[key] = datetime.fromisoformat(job[key])
+                except ValueError:
+                    pass
+        job.update({
+            "status": TTSJobStatus(status),
+            "total_files": total_files,
+            "completed_files": completed_files,
+            "failed_files": failed_files,
+            "paused": bool(paused),
+            "files": [
+                json.loads(file_payload)
+                for (file_payload,) in conn.execute(
+                    "SELECT payload FROM tts_job_files WHERE job_id = ? ORDER BY text_index", (job_id,)
+                )
+            ],
+        })
+        return job
+
+    def _purge_expired(self, conn: sqlite3.Connection):
+        """TTL이 지난 완료 작업 삭제 (_PURGE_INTERVAL_SECONDS마다 한 번만 실행)"""
+        now = time.time()
+        if not self.ttl_seconds or now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        cutoff = now - self.ttl_seconds
+        placeholders = ",".join("?" * len(_FINISHED_STATUSES))
+        expired = [
+            job_id for (job_id,) in conn.execute(
+                f"SELECT job_id FROM tts_jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*_FINISHED_STATUSES, cutoff),
+            )
+        ]
+        if expired:
+            conn.executemany("DELETE FROM tts_job_files WHERE job_id = ?", [(j,) for j in expired])
+            conn.executemany("DELETE FROM tts_jobs WHERE job_id = ?", [(j,) for j in expired])
+            for job_id in expired:
+                self._jobs.pop(job_id, None)
+            logger.info(f"🧹 만료된 TTS 작업 {len(expired)}개 삭제")
+
+    # ------------------------------------------------------------------
+    # 메모리 계층
+    # ------------------------------------------------------------------
+    def _trim_memory(self):
+        """완료된 작업부터 오래 조회되지 않은 순으로 메모리에서 제거 (진행 중 작업은 유지)"""
+        if len(self._jobs) <= self.max_memory_jobs:
+            return
+        for job_id in list(self._jobs.keys()):
+            if len(self._jobs) <= self.max_memory_jobs:
+                break
+            if _json_default(self._jobs[job_id]["status"]) not in ACTIVE_STATUSES:
+                if self.db_path:
+                    del self._jobs[job_id]
+                elif self.ttl_seconds:
+                    # 영속 계층이 없으면 TTL 이전에는 제거하지 않음
+                    end_time = self._jobs[job_id].get("end_time")
+                    if isinstance(end_time, datetime) and time.time() - end_time.timestamp() > self.ttl_seconds:
+                        del self._jobs[job_id]
+
+    # ------------------------------------------------------------------
+    # dict 호환 인터페이스 (self.jobs[job_id], job_id in self.jobs)
+    # 동기 조회는 메모리에 없으면 SQLite를 읽으므로, 이벤트 루프에서는 aget()/acontains() 사용
+    # ------------------------------------------------------------------
+    async def add(self, job_id: str, job: Dict[str, Any]):
+        """새 작업 등록 - 메모리에 바로 넣고 SQLite 기록은 스레드에서 실행"""
+        with self._lock:
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+        try:
+            await asyncio.to_thread(self._add_sync, job_id)
+        except Exception as e:
+            logger.warning(f"⚠️ TTS 작업 등록 저장 실패 ({job_id}): {str(e)}")
+
+    def _add_sync(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            conn = self._connect()
+            if job is not None and conn is not None:
+                self._write_job(conn, job_id, job)
+                self._write_files(conn, job_id, job.get("files", []))
+                self._claim(conn, job_id)
+                conn.commit()
+                self._purge_expired(conn)
+                conn.commit()
+            self._trim_memory()
+
+    async def aget(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회 (메모리에 없을 때만 스레드에서 SQLite 조회)"""
+        job = self.get_local(job_id)
+        if job is not None:
+            return job
+        if not self.db_path:
+            return None
+        return await asyncio.to_thread(self.get, job_id)
+
+    async def acontains(self, job_id: str) -> bool:
+        """작업 존재 여부 (메모리에 없을 때만 스레드에서 SQLite 조회)"""
+        if self.get_local(job_id) is not None:
+            return True
+        if not self.db_path:
+            return False
+        return await asyncio.to_thread(self.__contains__, job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회 (메모리 → SQLite 순)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._jobs.move_to_end(job_id)
+                return job
+            conn = self._connect()
+            if conn is None:
+                return None
+            job = self._load_job(conn, job_id)
+            if job is not None and not self.shared:
+                self._jobs[job_id] = job
+                self._trim_memory()
+            return job
+
+    def get_local(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """이 워커 메모리에 있는 작업만 조회 (멀티 워커에서 작업 소유 여부 확인용)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def __getitem__(self, job_id: str) -> Dict[str, Any]:
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        return job
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id in self._jobs:
+                return True
+            conn = self._connect()
+            if conn is None:
+                return False
+            return conn.execute("SELECT 1 FROM tts_jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    # ------------------------------------------------------------------
+    # 영속화
+    # ------------------------------------------------------------------
+    def _save_sync(self, job_id: str, include_files: bool):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            conn = self._connect()
+            if job is None or conn is None:
+                return
+            self._write_job(conn, job_id, job)
+            if include_files:
+                self._write_files(conn, job_id, job.get("files", []))
+            conn.commit()
+            self._trim_memory()
+
+    def _checkpoint_sync(self, job_id: str, task_info: Dict[str, Any]):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            conn = self._connect()
+            if job is None or conn is None:
+                return
+            self._write_files(conn, job_id, [task_info])
+            conn.execute(
+                "UPDATE tts_jobs SET completed_files = ?, failed_files = ?, updated_at = ? WHERE job_id = ?",
+                (job["completed_files"], job["failed_files"], time.time(), job_id),
+            )
+            conn.commit()
+
+    async def save(self, job_id: str, include_files: bool = False):
+        """작업 상태(상태/카운터/일시정지 등) 저장"""
+        try:
+            await asyncio.to_thread(self._save_sync, job_id, include_files)
+        except Exception as e:
+            logger.warning(f"⚠️ TTS 작업 저장 실패 ({job_id}): {str(e)}")
+
+    def _save_detached_sync(self, job_id: str, job: Dict[str, Any]):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            self._write_job(conn, job_id, job)
+            conn.commit()
+
+    async def save_detached(self, job_id: str, job: Dict[str, Any]):
+        """메모리에 없는 작업 dict(SQLite에서 읽은 완료 작업 등)의 상태 저장 (파일 목록 제외)"""
+        if self.get_local(job_id) is job:
+            await self.save(job_id)
+            return
+        try:
+            await asyncio.to_thread(self._save_detached_sync, job_id, job)
+        except Exception as e:
+            logger.warning(f"⚠️ TTS 작업 저장 실패 ({job_id}): {str(e)}")
+
+    async def checkpoint_file(self, job_id: str, task_info: Dict[str, Any]):
+        """파일 1개의 결과와 작업 카운터 저장"""
+        try:
+            await asyncio.to_thread(self._checkpoint_sync, job_id, task_info)
+        except Exception as e:
+            logger.warning(f"⚠️ TTS 파일 체크포인트 실패 ({job_id}#{task_info.get('text_index')}): {str(e)}")
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def list_jobs(self, limit: int = 100, offset: int = 0, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """작업 요약 목록 (최신순, 인덱스 조회)"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                jobs = [
+                    (job_id, job) for job_id, job in reversed(self._jobs.items())
+                    if status is None or _json_default(job["status"]) == status
+                ]
+                return [self._summary(job_id, job) for job_id, job in jobs[offset:offset + limit]]
+
+            query = (
+                "SELECT job_id, status, total_files, completed_files, failed_files, paused, created_at, payload "
+                "FROM tts_jobs"
+            )
+            params: list = []
+            if status:
+                query += " WHERE status = ?"
+                params.append(status)
+            query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+            result = []
+            for job_id, row_status, total, completed, failed, paused, created_at, payload in conn.execute(query, params):
+                live = self._jobs.get(job_id)
+                if live is not None:
+                    result.append(self._summary(job_id, live))
+                    continue
+                extra = json.loads(payload)
+                result.append({
+                    "job_id": job_id,
+                    "status": row_status,
+                    "progress": (completed + failed) / total if total else 0.0,
+                    "total_files": total,
+                    "completed_files": completed,
+                    "failed_files": failed,
+                    "start_time": datetime.fromtimestamp(created_at).isoformat(),
+                    "paused": bool(paused),
+                    "connection_checks": extra.get("connection_checks", 0),
+                })
+            return result
+
+    def _summary(self, job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        total = job["total_files"]
+        start_time = job.get("start_time")
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "progress": (job["completed_files"] + job["failed_files"]) / total if total else 0.0,
+            "total_files": total,
+            "completed_files": job["completed_files"],
+            "failed_files": job["failed_files"],
+            "start_time": start_time.isoformat() if isinstance(start_time, datetime) else start_time,
+            "paused": job.get("paused", False),
+            "connection_checks": job.get("connection_checks", 0),
+        }
+
+    def load_unfinished(self) -> List[str]:
+        """재개할 작업 ID 목록 (메모리에 적재하고 이 워커 소유로 변경)
+
+        멀티 워커에서는 lease가 아직 유효한 다른 워커의 작업은 제외합니다 (재시작 직후뿐 아니라,
+        실행 중에 주기적으로 호출해 죽은 워커의 작업을 이어받는 데도 사용).
+        여러 워커가 동시에 호출해도 같은 작업을 중복으로 가져가지 않도록 쓰기 잠금(BEGIN IMMEDIATE) 안에서
+        lease를 확인하고 바꿉니다.
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+                query = f"SELECT job_id FROM tts_jobs WHERE status IN ({placeholders})"
+                params: list = list(ACTIVE_STATUSES)
+                if self.shared:
+                    query += " AND (lease_owner IS NULL OR lease_until < ?)"
+                    params.append(time.time())
+                query += " ORDER BY created_at"
+                job_ids = []
+                for (job_id,) in conn.execute(query, params).fetchall():
+                    if job_id in self._jobs:
+                        # 이미 이 워커에서 실행 중 (lease 갱신이 늦어진 경우) - 소유권만 되찾음
+                        self._claim(conn, job_id)
+                        continue
+                    job = self._load_job(conn, job_id)
+                    if job is None:
+                        continue
+                    self._jobs[job_id] = job
+                    self._claim(conn, job_id)
+                    job_ids.append(job_id)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            return job_ids
+
+    def renew_leases(self) -> int:
+        """이 워커가 소유한 진행 중 작업의 lease 연장 (heartbeat)"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+            renewed = conn.execute(
+                f"UPDATE tts_jobs SET lease_until = ? WHERE lease_owner = ? AND status IN ({placeholders})",
+                (time.time() + self.lease_seconds, WORKER_ID, *ACTIVE_STATUSES),
+            ).rowcount
+            conn.commit()
+            return renewed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장소 통계"""
+        with self._lock:
+            stats = {
+                "persistent": self.db_path is not None,
+                "shared": self.shared,
+                "memory_jobs": len(self._jobs),
+                "max_memory_jobs": self.max_memory_jobs,
+                "ttl_seconds": self.ttl_seconds,
+            }
+            conn = self._connect()
+            if conn is not None:
+                stats["by_status"] = dict(conn.execute("SELECT status, COUNT(*) FROM tts_jobs GROUP BY status").fetchall())
+            return stats
+
+
+# 전역 TTS 작업 저장소 (TTSService 인스턴스가 여러 개여도 하나를 공유)
+tts_job_store = TTSJobStore(
+    db_path=os.path.join(settings.tts_cache_dir, "tts_jobs.sqlite3") if settings.tts_job_store_persistent else None,
+    max_memory_jobs=settings.tts_job_memory_max,
+    ttl_seconds=settings.tts_job_ttl_seconds,
+    shared=settings.get_worker_count() > 1,
+    lease_seconds=settings.tts_job_lease_seconds,
+)
@@ -1,11 +1,13 @@
-from typing import Optional, Tuple
+import os
+from typing import Optional, Tuple, AsyncIterator, Callable
 from datetime import datetime
 
 from app.config import settings
 from app.utils.logger.setup import setup_logger
 from app.repositories.tts.base import BaseTTSRepository
-from app.repositories.tts.utils import add_mp3_ext
-from app.repositories.storage.ncp_storage import NCPStorageRepository
+from app.repositories.tts.utils import add_mp3_ext, get_mp3_duration
+from app.repositories.tts.rate_limiter import get_rate_limiter, is_rate_limit_error
+from app.repositories.storage.ncp_storage import ncp_storage
 
 from openai import AsyncOpenAI
 
@@ -18,22 +20,76 @@ class OpenAITTSRepository(BaseTTSRepository):
     def __init__(self):
         """OpenAI 클라이언트 초기화"""
         self.api_key = settings.openai_api_key
-        self.client = AsyncOpenAI(api_key=self.api_key) if AsyncOpenAI else None
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=settings.openai_tts_base_url) if AsyncOpenAI else None
 
-        # NCP Storage Repository 초기화
-        self.storage = NCPStorageRepository()
+        # 프로세스 전역 NCP Storage Repository (커넥션 풀 공유)
+        self.storage = ncp_storage
+
+        # 프로세스 전역 OpenAI 레이트 리미터
+        self.rate_limiter = get_rate_limiter("openai")
+
+    async def stream_tts(self, text: str, voice: Optional[str], chunk_size: int = 4096) -> AsyncIterator[bytes]:
+        """OpenAI 스트리밍 응답의 MP3 바이트를 도착하는 대로 반환"""
+        if not self.client:
+            raise RuntimeError("OpenAI client not available")
+
+        use_voice = (voice or "echo").lower()
+        await self.rate_limiter.acquire()
+        api_start = datetime.now()
+        try:
+            async with self.client.audio.speech.with_streaming_response.create(
+                model=settings.openai_tts_model,
+                voice=use_voice,
+                input=text,
+                response_format="mp3",
+            ) as response:
+                ttfb = (datetime.now() - api_start).total_seconds()
+                logger.info(f"⚡ OpenAI 스트리밍 응답 시작: {ttfb:.3f}초")
+                self.rate_limiter.record_success(ttfb)
+                async for chunk in response.iter_bytes(chunk_size):
+                    yield chunk
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.rate_limiter.record_rate_limited()
+            raise
+
+    async def synthesize(self, text: str, voice: Optional[str]) -> bytes:
+        """업로드 없이 MP3 바이트만 반환 (긴 텍스트 청크 합성용, 실패 시 예외)"""
+        if not self.client:
+            raise RuntimeError("OpenAI client not available")
+
+        await self.rate_limiter.acquire()
+        api_start = datetime.now()
+        try:
+            async with self.client.audio.speech.with_streaming_response.create(
+                model=settings.openai_tts_model,
+                voice=(voice or "echo").lower(),
+                input=text,
+                response_format="mp3",
+            ) as response:
+                mp3_bytes = await response.read()
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.rate_limiter.record_rate_limited()
+            raise
+        self.rate_limiter.record_success((datetime.now() - api_start).total_seconds())
+        return mp3_bytes
 
     async def generate_tts(
-        self, text: str, voice: Optional[str], filename: str, **kwargs
-    ) -> Tuple[bool, Optional[str]]:
-        """OpenAI TTS 생성 → MP3 저장 → NCP 업로드 URL 반환"""
+        self, text: str, voice: Optional[str], filename: str, with_duration: bool = False,
+        on_started: Optional[Callable[[], None]] = None, **kwargs
+    ) -> Tuple:
+        """OpenAI TTS 생성 → MP3 수신(메모리) → NCP 업로드 URL 반환
+        반환값: (success, ncp_url), with_duration=True면 (success, ncp_url, duration)
+        on_started: 리미터 토큰을 받아 실제 API 호출을 시작할 때 호출 (헤지 대기 시간 측정용)
+        """
         if not self.client:
             logger.error("❌ OpenAI client not available")
-            return False, None
+            return (False, None, None) if with_duration else (False, None)
 
         try:
             base = filename.rsplit(".", 1)[0] if "." in filename else filename
-            mp3_path = add_mp3_ext(base)
+            mp3_name = os.path.basename(add_mp3_ext(base))
 
             use_voice = (voice or "echo").lower()
             model = settings.openai_tts_model
@@ -43,6 +99,11 @@ class OpenAITTSRepository(BaseTTSRepository):
 
             logger.info(f"🔧 OpenAI TTS 시작: model={model}, voice={use_voice}")
 
+            # 공유 레이트 리미터에서 토큰 획득 후 호출
+            await self.rate_limiter.acquire()
+            if on_started:
+                on_started()
+
             # OpenAI API 호출 시간 측정
             api_start = datetime.now()
             async with self.client.audio.speech.with_streaming_response.create(
@@ -51,14 +112,17 @@ class OpenAITTSRepository(BaseTTSRepository):
                 input=text,
                 response_format="mp3",
             ) as response:
-                await response.stream_to_file(mp3_path)
+                mp3_bytes = await response.read()
             api_end = datetime.now()
             api_duration = (api_end - api_start).total_seconds()
 
             logger.info(f"⚡ OpenAI API 응답: {api_duration:.3f}초")
-            logger.info(f"✅ Saved MP3 (OpenAI): {mp3_path}")
+            self.rate_limiter.record_success(api_duration)
+
+            duration = get_mp3_duration(mp3_bytes)
+            logger.info(f"✅ Received MP3 (OpenAI): {mp3_name} ({len(mp3_bytes)} bytes, {duration}초)")
 
-            ncp_url = await self.storage.upload_to_ncp(mp3_path)
+            ncp_url = await self.storage.upload_bytes(mp3_bytes, mp3_name)
             upload_end = datetime.now()
 
             total_duration = (upload_end - start_time).total_seconds()
@@ -69,7 +133,9 @@ class OpenAITTSRepository(BaseTTSRepository):
                 if api_duration > 2.0:
                     logger.warning(f"   • OpenAI API 지연: {api_duration:.3f}초")
 
-            return True, ncp_url
+            return (True, ncp_url, duration) if with_duration else (True, ncp_url)
         except Exception as e:
+            if is_rate_limit_error(e):
+                self.rate_limiter.record_rate_limited()
             logger.error(f"❌ Error generating TTS (OpenAI) for {filename}: {str(e)}")
-            return False, None
+            return (False, None, None) if with_duration else (False, None)
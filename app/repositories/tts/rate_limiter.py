@@ -0,0 +1,186 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('tts_rate_limiter', 'logs/tts')
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """429 / 쿼터 초과 에러인지 확인 (TaskGroup의 ExceptionGroup이면 하위 에러 중 하나라도 해당하는지)"""
+    if isinstance(error, BaseExceptionGroup):
+        return any(is_rate_limit_error(e) for e in error.exceptions)
+    error_str = str(error).lower()
+    return (
+        "429" in error_str or
+        "rate limit" in error_str or
+        "too many requests" in error_str or
+        "quota exceeded" in error_str or
+        "resource_exhausted" in error_str
+    )
+
+
+class AdaptiveRateLimiter:
+    """프로바이더별 적응형 레이트 리미터 (토큰 버킷 + AIMD)
+
+    - acquire(): 토큰이 생길 때까지 대기 (FIFO)
+    - record_success(): 지연이 목표치 이하면 초당 요청 수를 가산 증가(Additive Increase)
+    - record_rate_limited(): 429 수신 시 초당 요청 수를 곱셈 감소(Multiplicative Decrease)하고
+      잠시 모든 요청을 멈춤 (동시에 도착한 여러 429는 한 번만 반영)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase_step: float,
+        decrease_factor: float,
+        latency_target: float,
+    ):
+        self.name = name
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+
+        # 버스트는 1초 분량으로 제한
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._cooldown_until = 0.0
+        self._last_decrease = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+        # 통계
+        self._latency_ewma: Optional[float] = None
+        self._acquired = 0
+        self._successes = 0
+        self._rate_limited = 0
+        self._total_wait = 0.0
+
+    def _get_lock(self) -> asyncio.Lock:
+        """현재 이벤트 루프에 바인딩된 Lock 반환 (루프가 바뀌면 재생성)"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(max(1.0, self.rate), self._tokens + elapsed * self.rate)
+
+    async def acquire(self):
+        """요청 1건에 대한 토큰 획득 (필요 시 대기)"""
+        wait_start = time.monotonic()
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                if now < self._cooldown_until:
+                    await asyncio.sleep(self._cooldown_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    break
+
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+        waited = time.monotonic() - wait_start
+        self._acquired += 1
+        self._total_wait += waited
+        if waited > 1.0:
+            logger.info(f"⏳ [{self.name}] 레이트 리미터 대기: {waited:.2f}초 (현재 {self.rate:.2f} req/s)")
+
+    def record_success(self, latency: float):
+        """성공 응답 반영 - 지연이 목표 이하면 가산 증가, 초과하면 완만하게 감소"""
+        self._successes += 1
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+        else:
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency
+
+        if self._latency_ewma > self.latency_target:
+            # 혼잡 신호: 429 전에 미리 속도를 낮춤
+            self.rate = max(self.min_rate, self.rate * 0.95)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def record_timeout(self):
+        """타임아웃 반영 - 429보다 약한 혼잡 신호로 보고 완만하게 감소"""
+        self.rate = max(self.min_rate, self.rate * 0.9)
+
+    def record_rate_limited(self, retry_after: Optional[float] = None):
+        """429 응답 반영 - 곱셈 감소 및 일시 정지"""
+        self._rate_limited += 1
+        now = time.monotonic()
+
+        # 같은 순간에 in-flight 요청들이 동시에 429를 받으면 한 번만 감소
+        if now - self._last_decrease >= max(1.0, 1.0 / self.rate):
+            previous = self.rate
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._last_decrease = now
+            logger.warning(f"📉 [{self.name}] 429 감지 - 요청 속도 감소: {previous:.2f} → {self.rate:.2f} req/s")
+
+        pause = retry_after if retry_after is not None else 1.0 / self.rate
+        self._cooldown_until = max(self._cooldown_until, now + pause)
+        self._tokens = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """리미터 상태 통계 반환"""
+        return {
+            "provider": self.name,
+            "rate_per_sec": round(self.rate, 3),
+            "min_rate": self.min_rate,
+            "max_rate": self.max_rate,
+            "latency_ewma": round(self._latency_ewma, 3) if self._latency_ewma is not None else None,
+            "acquired": self._acquired,
+            "successes": self._successes,
+            "rate_limited": self._rate_limited,
+            "avg_wait": round(self._total_wait / self._acquired, 3) if self._acquired else 0.0,
+            "cooling_down": time.monotonic() < self._cooldown_until,
+        }
+
+
+# 프로세스 전역 리미터 (TTSService 인스턴스가 여러 개여도 프로바이더별로 하나만 사용)
+_rate_limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_rate_limiter(provider: str) -> AdaptiveRateLimiter:
+    """프로바이더별 공유 레이트 리미터 반환"""
+    provider = (provider or "gemini").lower()
+    limiter = _rate_limiters.get(provider)
+    if limiter is None:
+        initial_rates = {
+            "gemini": (settings.gemini_tts_rate_initial, settings.gemini_tts_rate_max),
+            "openai": (settings.openai_tts_rate_initial, settings.openai_tts_rate_max),
+            "murf": (settings.murf_tts_rate_initial, settings.murf_tts_rate_max),
+        }
+        initial_rate, max_rate = initial_rates.get(provider, (1.0, 5.0))
+        # 멀티 워커에서는 프로바이더 한도를 워커 수로 나눠 가짐
+        workers = settings.get_worker_count()
+        initial_rate, max_rate = initial_rate / workers, max_rate / workers
+        limiter = AdaptiveRateLimiter(
+            name=provider,
+            initial_rate=initial_rate,
+            min_rate=settings.tts_rate_min,
+            max_rate=max_rate,
+            increase_step=settings.tts_rate_increase_step,
+            decrease_factor=settings.tts_rate_decrease_factor,
+            latency_target=settings.tts_rate_latency_target,
+        )
+        _rate_limiters[provider] = limiter
+    return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 프로바이더 리미터 통계 반환"""
+    return {name: limiter.get_stats() for name, limiter in _rate_limiters.items()}
@@ -0,0 +1,216 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Dict, Any, Optional, Deque
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('tts_scheduler', 'logs/tts')
+
+
+class TTSPriority(IntEnum):
+    """TTS 호출 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # 단일 TTS, 손가락 인식 발음 등 사용자가 바로 기다리는 요청
+    BACKGROUND = 1   # 배치/연극 작업
+
+
+class _ProviderQueue:
+    """프로바이더 하나의 in-flight 제한과 대기열
+
+    우선순위별로 작업(job)마다 대기열을 두고, 슬롯이 나면 높은 우선순위부터
+    작업 사이를 라운드 로빈으로 돌며 하나씩 넘겨줍니다 (작업별 공정 분배).
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self._waiting: Dict[TTSPriority, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in TTSPriority
+        }
+        self._waiting_count = 0
+
+        # 통계
+        self._service_ewma: Optional[float] = None
+        self._granted = {priority.name.lower(): 0 for priority in TTSPriority}
+        self._total_wait = {priority.name.lower(): 0.0 for priority in TTSPriority}
+        self._max_wait = {priority.name.lower(): 0.0 for priority in TTSPriority}
+
+    def reset(self):
+        """이벤트 루프가 바뀌면 이전 루프의 대기자는 깨울 수 없으므로 비움"""
+        self.in_flight = 0
+        for jobs in self._waiting.values():
+            jobs.clear()
+        self._waiting_count = 0
+
+    async def acquire(self, key: str, priority: TTSPriority):
+        if self.in_flight < self.limit and self._waiting_count == 0:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(key, deque()).append(future)
+        self._waiting_count += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 넘겨받은 직후 취소됨 → 다음 대기자에게 양보
+                self.release()
+            else:
+                self._discard(priority, key, future)
+            raise
+
+    def _discard(self, priority: TTSPriority, key: str, future: asyncio.Future):
+        queue = self._waiting[priority].get(key)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        self._waiting_count -= 1
+        if not queue:
+            del self._waiting[priority][key]
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        for priority in TTSPriority:
+            jobs = self._waiting[priority]
+            while jobs:
+                key, queue = next(iter(jobs.items()))
+                future = queue.popleft()
+                self._waiting_count -= 1
+                if queue:
+                    jobs.move_to_end(key)  # 다음 차례는 다른 작업
+                else:
+                    del jobs[key]
+                if not future.done():
+                    return future
+        return None
+
+    def release(self):
+        self.in_flight -= 1
+        while self.in_flight < self.limit:
+            future = self._next_waiter()
+            if future is None:
+                break
+            self.in_flight += 1
+            future.set_result(None)
+
+    def record(self, priority: TTSPriority, waited: float, service_time: float):
+        name = priority.name.lower()
+        self._granted[name] += 1
+        self._total_wait[name] += waited
+        self._max_wait[name] = max(self._max_wait[name], waited)
+        if self._service_ewma is None:
+            self._service_ewma = service_time
+        else:
+            self._service_ewma = 0.8 * self._service_ewma + 0.2 * service_time
+
+    def estimate_wait(self, priority: TTSPriority) -> float:
+        """새 작업의 첫 호출이 슬롯을 받기까지 예상 대기 시간(초)
+
+        앞에 있는 대기자 = 더 높은 우선순위 대기자 전체 + 같은 우선순위의 작업당 1건(라운드 로빈)
+        """
+        if self.in_flight < self.limit and self._waiting_count == 0:
+            return 0.0
+        ahead = 0
+        for level in TTSPriority:
+            jobs = self._waiting[level]
+            if level < priority:
+                ahead += sum(len(queue) for queue in jobs.values())
+            elif level == priority:
+                ahead += len(jobs)
+        service_time = self._service_ewma or settings.tts_scheduler_default_service_time
+        return (ahead + 1) * service_time / self.limit
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": {
+                priority.name.lower(): sum(len(queue) for queue in self._waiting[priority].values())
+                for priority in TTSPriority
+            },
+            "waiting_jobs": len(self._waiting[TTSPriority.BACKGROUND]),
+            "service_time_ewma": round(self._service_ewma, 3) if self._service_ewma is not None else None,
+            "granted": dict(self._granted),
+            "avg_wait": {
+                name: round(self._total_wait[name] / count, 3) if count else 0.0
+                for name, count in self._granted.items()
+            },
+            "max_wait": {name: round(value, 3) for name, value in self._max_wait.items()},
+        }
+
+
+class TTSScheduler:
+    """프로세스 전역 TTS 작업 스케줄러
+
+    - 프로바이더별 동시 호출 수(in-flight)를 제한 (워커가 여러 개면 워커 수로 나눔)
+    - 단일 TTS(INTERACTIVE)를 배치/연극(BACKGROUND)보다 먼저 처리
+    - 같은 우선순위 안에서는 작업 사이를 라운드 로빈으로 돌아 큰 작업이 슬롯을 독차지하지 않음
+    - 작업 접수 시 예상 시작 시각 제공
+
+    레이트 리미터(초당 요청 수)와 별개로, 동시에 떠 있는 요청 수를 제한합니다.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, _ProviderQueue] = {}
+        self._loop = None
+        self._sequence = 0
+
+    def _get_queue(self, provider: str) -> _ProviderQueue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            for queue in self._queues.values():
+                queue.reset()
+
+        provider = (provider or "gemini").lower()
+        queue = self._queues.get(provider)
+        if queue is None:
+            limits = {
+                "gemini": settings.gemini_tts_max_inflight,
+                "openai": settings.openai_tts_max_inflight,
+                "murf": settings.murf_tts_max_inflight,
+            }
+            limit = limits.get(provider, settings.openai_tts_max_inflight)
+            queue = _ProviderQueue(provider, limit // settings.get_worker_count())
+            self._queues[provider] = queue
+        return queue
+
+    @asynccontextmanager
+    async def slot(self, provider: str, job_id: Optional[str] = None, priority: TTSPriority = TTSPriority.BACKGROUND):
+        """프로바이더 호출 1건 동안 슬롯 점유 (job_id가 없으면 요청마다 별도 대기열)"""
+        queue = self._get_queue(provider)
+        if job_id is None:
+            self._sequence += 1
+            job_id = f"_single-{self._sequence}"
+
+        wait_start = time.monotonic()
+        await queue.acquire(job_id, priority)
+        granted = time.monotonic()
+        waited = granted - wait_start
+        if waited > 5.0:
+            logger.info(f"⏳ [{provider}] 스케줄러 대기 {waited:.2f}초 (job={job_id}, priority={priority.name})")
+        try:
+            yield
+        finally:
+            queue.record(priority, waited, time.monotonic() - granted)
+            queue.release()
+
+    def estimate_start(self, provider: str, priority: TTSPriority = TTSPriority.BACKGROUND) -> Dict[str, Any]:
+        """작업 접수 시 예상 대기 시간(초)과 예상 시작 시각"""
+        wait = self._get_queue(provider).estimate_wait(priority)
+        return {
+            "estimated_wait_seconds": round(wait, 1),
+            "estimated_start_time": (datetime.now() + timedelta(seconds=wait)).isoformat(timespec="seconds"),
+        }
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: queue.get_stats() for name, queue in self._queues.items()}
+
+
+# 프로세스 전역 스케줄러 (TTSService 인스턴스가 여러 개여도 하나만 사용)
+tts_scheduler = TTSScheduler()
@@ -1,8 +1,12 @@
 import base64
-import wave
+import struct
 from io import BytesIO
+from typing import Optional, List, Tuple
 from pydub import AudioSegment
 
+# 인코더 프로세스 풀 워커와 같은 구현 (기존 import 경로 유지)
+from app.repositories._encode_worker import pcm_to_mp3_bytes
+
 
 def ensure_bytes(data) -> bytes:
     """Gemini inline_data가 bytes 또는 base64 string일 수 있으므로 항상 bytes로 변환"""
@@ -19,19 +23,255 @@ def ensure_bytes(data) -> bytes:
 def pcm_to_mp3_file(
     pcm_bytes: bytes, mp3_path: str, sample_rate: int = 24000, channels: int = 1
 ):
+    """Raw 16-bit LE PCM → MP3 파일"""
+    with open(mp3_path, "wb") as f:
+        f.write(pcm_to_mp3_bytes(pcm_bytes, sample_rate=sample_rate, channels=channels))
+
+
+# MPEG 오디오 프레임 헤더 테이블 (kbps), 인덱스: [버전 그룹][레이어]
+_MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# 버전 비트 → 샘플레이트 (3: MPEG1, 2: MPEG2, 0: MPEG2.5)
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+
+def _parse_mp3_frame_header(data: bytes, offset: int) -> Optional[tuple]:
+    """offset 위치의 프레임 헤더 파싱 → (프레임 길이, 프레임당 샘플 수, 샘플레이트, 버전 비트, 채널 모드)"""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    layer = 4 - layer_bits
+    version_group = 1 if version_bits == 3 else 2
+    bitrate = _MP3_BITRATES[(version_group, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+    channel_mode = (b3 >> 6) & 0x03
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version_group == 1) else 576
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+
+    if frame_length < 4:
+        return None
+    return frame_length, samples, sample_rate, version_bits, channel_mode
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """ID3v2 태그가 있으면 오디오 시작 위치 반환"""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _find_first_frame(data: bytes) -> Optional[tuple]:
+    """첫 번째 유효 프레임 탐색 (다음 프레임 헤더까지 확인해 오탐 방지) → (offset, 헤더)"""
+    offset = _skip_id3v2(data)
+    length = len(data)
+    while offset + 4 <= length:
+        header = _parse_mp3_frame_header(data, offset)
+        if header:
+            next_offset = offset + header[0]
+            if next_offset + 4 > length or _parse_mp3_frame_header(data, next_offset):
+                return offset, header
+        offset += 1
+    return None
+
+
+def _info_frame_count(data: bytes, offset: int, header: tuple) -> Optional[int]:
+    """첫 프레임이 Xing/Info(LAME) 또는 VBRI 헤더 프레임이면 총 프레임 수 반환 (없으면 0, 헤더가 아니면 None)"""
+    _, _, _, version_bits, channel_mode = header
+    length = len(data)
+
+    # Xing/Info 헤더 (사이드 정보 뒤)
+    if version_bits == 3:
+        side_info = 17 if channel_mode == 3 else 32
+    else:
+        side_info = 9 if channel_mode == 3 else 17
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and xing + 12 <= length:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            return struct.unpack(">I", data[xing + 8:xing + 12])[0]
+        return 0
+
+    # VBRI 헤더 (프레임 헤더 뒤 32바이트)
+    vbri = offset + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI" and vbri + 18 <= length:
+        return struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+    return None
+
+
+def get_mp3_duration(data: bytes) -> Optional[float]:
+    """MP3 바이트의 재생 시간(초) 계산 - ffprobe 없이 프레임 헤더를 직접 해석
+
+    Xing/Info(LAME) 또는 VBRI 헤더가 있으면 총 프레임 수로 계산하고,
+    없으면 프레임을 순회하며 샘플 수를 합산합니다.
     """
-    Raw 16-bit LE PCM → MP3
-    pydub이 PCM raw를 직접 읽지 못하므로 메모리 상에서 임시 WAV 헤더를 붙여 변환
+    if not data:
+        return None
+
+    first = _find_first_frame(data)
+    if first is None:
+        return None
+    offset, header = first
+    samples, sample_rate = header[1], header[2]
+
+    frames = _info_frame_count(data, offset, header)
+    if frames:
+        return round(frames * samples / sample_rate, 2)
+
+    # 헤더가 없으면 프레임 순회
+    total_samples = 0
+    length = len(data)
+    while offset + 4 <= length:
+        header = _parse_mp3_frame_header(data, offset)
+        if header is None:
+            break
+        total_samples += header[1]
+        offset += header[0]
+
+    if total_samples == 0:
+        return None
+    return round(total_samples / sample_rate, 2)
+
+
+def _mp3_audio_frames(data: bytes) -> Optional[Tuple[bytes, int, int]]:
+    """ID3 태그와 Xing/Info/VBRI 헤더 프레임을 제외한 오디오 프레임 구간 → (프레임 바이트, 샘플 수, 샘플레이트)"""
+    first = _find_first_frame(data)
+    if first is None:
+        return None
+    offset, header = first
+    sample_rate = header[2]
+    if _info_frame_count(data, offset, header) is not None:
+        offset += header[0]
+
+    start = offset
+    total_samples = 0
+    length = len(data)
+    while offset + 4 <= length:
+        header = _parse_mp3_frame_header(data, offset)
+        if header is None or offset + header[0] > length:
+            break
+        total_samples += header[1]
+        offset += header[0]
+    if total_samples == 0:
+        return None
+    return data[start:offset], total_samples, sample_rate
+
+
+def get_mp3_sample_rate(data: bytes) -> Optional[int]:
+    """첫 유효 프레임의 샘플레이트"""
+    first = _find_first_frame(data) if data else None
+    return first[1][2] if first else None
+
+
+def concat_mp3(parts: List[bytes]) -> Tuple[bytes, List[Tuple[float, float]]]:
+    """MP3 여러 개를 프레임 단위로 이어 붙임 (재인코딩 없음)
+
+    각 조각의 ID3 태그와 Xing/Info 헤더 프레임은 버립니다 (이어 붙인 뒤에는 프레임 수가 맞지 않으므로).
+    반환값: (MP3 바이트, 조각별 (시작, 끝) 초). 샘플레이트가 다른 조각이 섞이면 ValueError.
+    """
+    output = bytearray()
+    offsets: List[Tuple[float, float]] = []
+    position = 0.0
+    stream_rate = None
+    for part in parts:
+        frames = _mp3_audio_frames(part) if part else None
+        if frames is None:
+            offsets.append((round(position, 3), round(position, 3)))
+            continue
+        audio, samples, sample_rate = frames
+        if stream_rate is None:
+            stream_rate = sample_rate
+        elif sample_rate != stream_rate:
+            raise ValueError(f"MP3 샘플레이트가 다른 조각은 이어 붙일 수 없음: {stream_rate} != {sample_rate}")
+        output.extend(audio)
+        end = position + samples / sample_rate
+        offsets.append((round(position, 3), round(end, 3)))
+        position = end
+    return bytes(output), offsets
+
+
+def split_mp3(data: bytes, cut_points: List[float]) -> List[bytes]:
+    """MP3를 지정한 시각(초)에서 프레임 단위로 나눔 (재인코딩 없음) → len(cut_points) + 1개 조각"""
+    first = _find_first_frame(data)
+    if first is None:
+        return []
+    offset, header = first
+    if _info_frame_count(data, offset, header) is not None:
+        offset += header[0]
+
+    cuts = sorted(cut_points)
+    parts: List[bytes] = []
+    start = offset
+    position = 0.0
+    length = len(data)
+    while offset + 4 <= length:
+        header = _parse_mp3_frame_header(data, offset)
+        if header is None or offset + header[0] > length:
+            break
+        while len(parts) < len(cuts) and position >= cuts[len(parts)]:
+            parts.append(data[start:offset])
+            start = offset
+        position += header[1] / header[2]
+        offset += header[0]
+    parts.append(data[start:offset])
+    while len(parts) < len(cuts) + 1:
+        parts.append(b"")
+    return parts
+
+
+def find_silence_cuts(data: bytes, expected: List[float], min_silence_ms: int = 250) -> Optional[List[float]]:
+    """무음 구간 검출로 분할 시각 추정 - 예상 시각(expected)마다 가장 가까운 무음 구간 중앙을 순서대로 선택
+
+    무음 구간이 부족하면 None (호출 측에서 다른 방식으로 처리)
     """
-    with BytesIO() as wav_buf:
-        with wave.open(wav_buf, "wb") as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(2)  # 16bit = 2 bytes
-            wf.setframerate(sample_rate)
-            wf.writeframes(pcm_bytes)
-        wav_buf.seek(0)
-        seg = AudioSegment.from_file(wav_buf, format="wav")
-        seg.export(mp3_path, format="mp3")
+    from pydub.silence import detect_silence
+
+    segment = AudioSegment.from_file(BytesIO(data), format="mp3")
+    silences = detect_silence(segment, min_silence_len=min_silence_ms, silence_thresh=segment.dBFS - 16)
+    midpoints = [(start + end) / 2000 for start, end in silences]
+    if len(midpoints) < len(expected):
+        return None
+
+    cuts: List[float] = []
+    last = 0.0
+    for index, target in enumerate(expected):
+        # 남은 분할 지점 수만큼 무음 구간을 남겨 둠
+        remaining = len(expected) - index - 1
+        candidates = [m for m in midpoints if m > last]
+        candidates = candidates[:len(candidates) - remaining] if remaining else candidates
+        if not candidates:
+            return None
+        best = min(candidates, key=lambda m: abs(m - target))
+        cuts.append(best)
+        last = best
+    return cuts
 
 
 def add_mp3_ext(path: str) -> str:
@@ -364,6 +364,7 @@ class FingerDetectionService:
         try:
             from app.services.voice.tts.generator import TTSService
             from app.models.voice.tts import SingleTTSRequest, GenderType
+            from app.repositories.tts import TTSPriority
 
             logger.info(f"TTS 생성 시작 - 단어: {detected_word}")
 
@@ -377,8 +378,8 @@ class FingerDetectionService:
                 gender_hint=GenderType.MALE
             )
 
-            # TTS 생성
-            tts_response = await tts_service.generate_single_tts(tts_request)
+            # TTS 생성 (발음 TTS는 배치 작업보다 먼저 처리)
+            tts_response = await tts_service.generate_single_tts(tts_request, priority=TTSPriority.INTERACTIVE)
 
             if tts_response.success and tts_response.ncp_url:
                 logger.info(f"TTS 생성 성공 - URL: {tts_response.ncp_url}")
@@ -20,8 +20,8 @@ from app.prompts.language.visualization import (
 from app.services.language.language_detection.detector import detect_language_with_ai
 from app.prompts.language.visualization.visualization_analysis import get_analysis_prompt
 import base64
-import boto3
 from datetime import datetime
+from app.repositories.storage import ncp_storage
 
 logger = setup_logger("visualization_generator")
 
@@ -32,13 +32,8 @@ class VisualizationGenerator:
         self.output_dir = os.path.join(settings.output_dir, "visualization")
         os.makedirs(self.output_dir, exist_ok=True)
 
-        # NCP S3 클라이언트 초기화
-        self.s3_client = boto3.client(
-            service_name=settings.naver_service_name,
-            endpoint_url=settings.naver_endpoint_url,
-            aws_access_key_id=settings.ncp_access_key,
-            aws_secret_access_key=settings.ncp_secret_key
-        )
+        # NCP 업로드는 프로세스 전역 스토리지 사용 (비차단, 커넥션 풀 공유)
+        self.storage = ncp_storage
     
     async def generate_visualization_from_text(self, request: VisualizationRequest) -> Dict[str, Any]:
         """
@@ -1382,23 +1377,9 @@ class VisualizationGenerator:
             date_folder = datetime.now().strftime("%Y%m%d")
             ncp_path = f"{visual_bucket_name}/{date_folder}/{filename}" 
 
-            # 로컬 파일을 NCP에 업로드
-            with open(file_path, 'rb') as file_data:
-                self.s3_client.upload_fileobj(
-                    file_data,
-                    bucket_name,
-                    ncp_path,
-                )
-
-                # 파일을 공개로 설정
-                self.s3_client.put_object_acl(
-                    Bucket=settings.naver_bucket_name, 
-                    Key=ncp_path, 
-                    ACL='public-read'
-                )
-
-            # NCP URL 생성 (엔드포인트 제외하고 경로만 반환)
-            ncp_url = f"{bucket_name}/{visual_bucket_name}/{date_folder}/{filename}"
+            # 로컬 파일을 NCP에 공개 업로드 (ACL 포함)
+            # NCP URL은 엔드포인트 제외하고 경로만 반환
+            ncp_url = await self.storage.put_file(file_path, ncp_path)
 
             logger.info(f"파일 NCP 업로드 완료: {ncp_url}")
             return ncp_url
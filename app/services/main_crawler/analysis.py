@@ -2,10 +2,10 @@ import os
 import time
 from collections import Counter
 from typing import Dict, Any, List, Tuple
-import boto3
 from datetime import datetime
 
 from app.config import settings
+from app.repositories.storage import ncp_storage
 from app.utils.logger.setup import setup_logger
 from app.utils.language.generator import call_llm
 from app.services.language.language_detection.detector import detect_language_with_ai
@@ -29,13 +29,8 @@ class CrawlerAnalysisService:
         self.output_dir = os.path.join(settings.output_dir, "crawler_analysis")
         os.makedirs(self.output_dir, exist_ok=True)
 
-        # NCP S3 클라이언트 초기화
-        self.s3_client = boto3.client(
-            service_name=settings.naver_service_name,
-            endpoint_url=settings.naver_endpoint_url,
-            aws_access_key_id=settings.ncp_access_key,
-            aws_secret_access_key=settings.ncp_secret_key
-        )
+        # NCP 업로드는 프로세스 전역 스토리지 사용 (비차단, 커넥션 풀 공유)
+        self.storage = ncp_storage
 
     async def analyze_crawled_content(self, content: str, title: str) -> Dict[str, Any]:
         """
@@ -551,23 +546,8 @@ class CrawlerAnalysisService:
             date_folder = datetime.now().strftime("%Y%m%d")
             ncp_path = f"TMP/{date_folder}/{filename}"
 
-            # NCP에 업로드
-            with open(file_path, 'rb') as file_data:
-                self.s3_client.upload_fileobj(
-                    file_data,
-                    bucket_name,
-                    ncp_path
-                )
-
-                # 파일을 공개로 설정
-                self.s3_client.put_object_acl(
-                    Bucket=bucket_name,
-                    Key=ncp_path,
-                    ACL='public-read'
-                )
-
-            # NCP URL 생성
-            ncp_url = f"{bucket_name}/TMP/{date_folder}/{filename}"
+            # NCP에 공개 업로드 (ACL 포함)
+            ncp_url = await self.storage.put_file(file_path, ncp_path)
 
             logger.info(f"NCP TMP 업로드 완료: {ncp_url}")
 
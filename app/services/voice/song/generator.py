@@ -1,5 +1,4 @@
 import os
-import boto3
 import asyncio
 import aiohttp
 import tempfile
@@ -12,6 +11,7 @@ from app.utils.logger.setup import setup_logger
 from app.utils.process_text import strip_rich_text_tags
 
 from app.models.voice.song import SongRequest, SongResponse
+from app.repositories.storage import ncp_storage
 
 # Load environment variables
 if not os.getenv("ENVIRONMENT"):
@@ -21,14 +21,6 @@ if not os.getenv("ENVIRONMENT"):
 # 로거 설정
 logger = setup_logger('voice_song')
 
-s3_client = boto3.client(
-    service_name=os.getenv("NAVER_SERVICE_NAME"),
-    endpoint_url=os.getenv("NAVER_ENDPOINT_URL"),
-    aws_access_key_id=os.getenv("ACCESS"),
-    aws_secret_access_key=os.getenv("SECRET")
-)
-
-BUCKET_NAME = os.getenv("NAVER_BUCKET_NAME")
 FOLDER_NAME = os.getenv("NAVER_BUCKET_SONG")
 
 
@@ -194,16 +186,12 @@ async def download_and_upload_to_s3(file_url: str, file_name: str) -> str:
                         temp_file.write(chunk)
 
                 s3_key = f"{FOLDER_NAME}/{file_name}"
-                s3_client.upload_file(
-                    temp_file_path,
-                    BUCKET_NAME,
-                    s3_key,
-                    ExtraArgs={'ACL': 'public-read'}
-                )
-
-                os.remove(temp_file_path)
+                try:
+                    # 공유 스토리지로 비차단 업로드 (큰 파일은 멀티파트)
+                    public_url = await ncp_storage.put_file(temp_file_path, s3_key)
+                finally:
+                    os.remove(temp_file_path)
 
-                public_url = f"{BUCKET_NAME}/{s3_key}"
                 execution_time = time.time() - start_time
                 logger.info(f"✅ S3 업로드 완료: {public_url} (처리 시간: {execution_time:.2f}초)")
                 return public_url
@@ -0,0 +1,390 @@
+import asyncio
+import fcntl
+import json
+import os
+from typing import Dict, Set, Any, Optional, Callable, Awaitable
+
+from app.config import settings
+
+# 로깅 설정
+from app.utils.logger.setup import setup_logger
+logger = setup_logger('notification_broker')
+
+# 한 줄(JSON 메시지) 최대 크기 - job_update에는 파일 목록 전체가 포함됨
+_MAX_LINE = 16 * 1024 * 1024
+_RECONNECT_DELAY = 0.5
+# 느린 워커 연결에 쌓일 수 있는 허브 쓰기 버퍼 한도 (초과 시 해당 워커로의 메시지 폐기)
+_HUB_WRITE_BUFFER_LIMIT = 8 * 1024 * 1024
+
+MessageHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+ControlHandler = Callable[[str, str], bool]
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class LocalBroker:
+    """단일 프로세스용 브로커 (워커 1개 또는 테스트용)
+
+    모든 연결과 작업이 같은 프로세스에 있으므로 전달할 대상이 없습니다.
+    제어 메시지(일시정지/재개)는 바로 로컬 핸들러로 적용합니다.
+    """
+
+    is_hub = True
+
+    def __init__(self):
+        self._on_control: Optional[ControlHandler] = None
+
+    def set_handlers(self, on_message: MessageHandler, on_control: ControlHandler):
+        self._on_control = on_control
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def subscribe(self, job_id: str):
+        pass
+
+    def unsubscribe(self, job_id: str):
+        pass
+
+    def publish(self, job_id: str, message: Dict[str, Any]):
+        pass
+
+    def send_control(self, job_id: str, action: str):
+        if self._on_control:
+            self._on_control(job_id, action)
+
+    def has_remote_subscribers(self, job_id: str) -> bool:
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"type": "local"}
+
+
+class _BrokerHub:
+    """Unix 소켓 허브 - 워커 간 메시지 라우팅
+
+    워커별 구독(presence)을 기억해 작업 메시지는 해당 작업을 구독한 워커에게만
+    보내고(스티키 라우팅), 제어 메시지는 작업을 가진 워커를 모르므로 전체에 보냅니다.
+    """
+
+    def __init__(self):
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: Dict[int, asyncio.StreamWriter] = {}
+        self._presence: Dict[str, Set[int]] = {}
+        self._next_id = 0
+        self.routed = 0
+        self.dropped = 0
+
+    async def start(self, socket_path: str):
+        self._server = await asyncio.start_unix_server(self._handle, path=socket_path, limit=_MAX_LINE)
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._peers.values()):
+            writer.close()
+        self._peers.clear()
+        self._presence.clear()
+
+    def _send(self, peer_id: int, data: bytes):
+        writer = self._peers.get(peer_id)
+        if writer is None:
+            return
+        if writer.transport.get_write_buffer_size() > _HUB_WRITE_BUFFER_LIMIT:
+            self.dropped += 1
+            return
+        writer.write(data)
+        self.routed += 1
+
+    def _broadcast_presence(self, job_id: str):
+        data = _encode({"op": "presence", "job_id": job_id, "workers": sorted(self._presence.get(job_id, ()))})
+        for peer_id in list(self._peers):
+            self._send(peer_id, data)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._next_id += 1
+        peer_id = self._next_id
+        self._peers[peer_id] = writer
+        self._send(peer_id, _encode({
+            "op": "hello",
+            "client_id": peer_id,
+            "presence": {job_id: sorted(peers) for job_id, peers in self._presence.items()},
+        }))
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                op = message.get("op")
+                job_id = message.get("job_id")
+
+                if op == "sub":
+                    peers = self._presence.setdefault(job_id, set())
+                    if peer_id not in peers:
+                        peers.add(peer_id)
+                        self._broadcast_presence(job_id)
+                elif op == "unsub":
+                    peers = self._presence.get(job_id)
+                    if peers and peer_id in peers:
+                        peers.discard(peer_id)
+                        if not peers:
+                            del self._presence[job_id]
+                        self._broadcast_presence(job_id)
+                elif op == "pub":
+                    # 받은 줄을 그대로 구독 워커에게 전달 (재인코딩 없음)
+                    for target in self._presence.get(job_id, ()):
+                        if target != peer_id:
+                            self._send(target, line)
+                elif op == "control":
+                    for target in list(self._peers):
+                        if target != peer_id:
+                            self._send(target, line)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            logger.warning(f"⚠️ Broker peer {peer_id} error: {str(e)}")
+        finally:
+            self._peers.pop(peer_id, None)
+            for job_id in [j for j, peers in self._presence.items() if peer_id in peers]:
+                self._presence[job_id].discard(peer_id)
+                if not self._presence[job_id]:
+                    del self._presence[job_id]
+                self._broadcast_presence(job_id)
+            writer.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "peers": len(self._peers),
+            "subscribed_jobs": len(self._presence),
+            "routed": self.routed,
+            "dropped": self.dropped,
+        }
+
+
+class UnixSocketBroker:
+    """Unix 소켓 기반 워커 간 알림 브로커
+
+    - 잠금 파일(flock)을 먼저 잡은 워커가 허브를 열고, 모든 워커(허브 워커 포함)는 클라이언트로 접속합니다.
+    - 허브 워커가 종료되면 잠금이 풀리고, 남은 워커가 재접속 과정에서 허브를 이어받습니다.
+    - publish/subscribe는 송신 큐에 넣기만 하므로 호출자를 막지 않습니다.
+    """
+
+    def __init__(self, socket_path: str, queue_size: int = 10000):
+        self.socket_path = socket_path
+        self.lock_path = socket_path + ".lock"
+        self.queue_size = queue_size
+
+        self.client_id: Optional[int] = None
+        self._hub: Optional[_BrokerHub] = None
+        self._lock_fd: Optional[int] = None
+
+        self._subscriptions: Set[str] = set()
+        self._presence: Dict[str, Set[int]] = {}
+        self._outbox: Optional[asyncio.Queue] = None
+        self._runner: Optional[asyncio.Task] = None
+
+        self._on_message: Optional[MessageHandler] = None
+        self._on_control: Optional[ControlHandler] = None
+
+        # 통계
+        self._published = 0
+        self._received = 0
+        self._dropped = 0
+        self._reconnects = 0
+
+    @property
+    def is_hub(self) -> bool:
+        return self._hub is not None
+
+    def set_handlers(self, on_message: MessageHandler, on_control: ControlHandler):
+        self._on_message = on_message
+        self._on_control = on_control
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._outbox = asyncio.Queue(maxsize=self.queue_size)
+        await self._ensure_hub()
+        self._runner = asyncio.create_task(self._run())
+        logger.info(f"🔌 Notification broker started (socket={self.socket_path}, hub={self.is_hub})")
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        if self._hub is not None:
+            await self._hub.stop()
+            self._hub = None
+        if self._lock_fd is not None:
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def _ensure_hub(self):
+        """허브 잠금을 잡을 수 있으면 이 워커에서 허브 실행"""
+        if self._hub is not None:
+            return
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return
+
+        try:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)  # 이전 허브가 남긴 소켓 파일
+            hub = _BrokerHub()
+            await hub.start(self.socket_path)
+        except Exception:
+            os.close(fd)
+            raise
+        self._lock_fd = fd
+        self._hub = hub
+        logger.info(f"🛰️ Notification broker hub running in worker pid={os.getpid()}")
+
+    def _enqueue(self, message: Dict[str, Any]):
+        if self._outbox is None:
+            return
+        try:
+            self._outbox.put_nowait(_encode(message))
+        except asyncio.QueueFull:
+            self._dropped += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await self._ensure_hub()
+                reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=_MAX_LINE)
+            except OSError:
+                await asyncio.sleep(_RECONNECT_DELAY)
+                continue
+
+            writer_task = asyncio.create_task(self._write_loop(writer))
+            try:
+                # 재접속 시 현재 구독을 다시 등록
+                for job_id in self._subscriptions:
+                    writer.write(_encode({"op": "sub", "job_id": job_id}))
+                await self._read_loop(reader)
+            except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+                logger.warning(f"⚠️ Notification broker connection lost: {str(e)}")
+            finally:
+                writer_task.cancel()
+                try:
+                    await writer_task
+                except (asyncio.CancelledError, ConnectionError):
+                    pass
+                writer.close()
+                self.client_id = None
+                self._presence.clear()
+
+            self._reconnects += 1
+            await asyncio.sleep(_RECONNECT_DELAY)
+
+    async def _write_loop(self, writer: asyncio.StreamWriter):
+        while True:
+            writer.write(await self._outbox.get())
+            # 쌓여 있는 메시지는 한 번에 쓰고 drain
+            while not self._outbox.empty():
+                writer.write(self._outbox.get_nowait())
+            await writer.drain()
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            op = message.get("op")
+
+            if op == "hello":
+                self.client_id = message["client_id"]
+                self._presence = {job_id: set(peers) for job_id, peers in message.get("presence", {}).items()}
+            elif op == "presence":
+                if message["workers"]:
+                    self._presence[message["job_id"]] = set(message["workers"])
+                else:
+                    self._presence.pop(message["job_id"], None)
+            elif op == "pub":
+                self._received += 1
+                if self._on_message:
+                    try:
+                        await self._on_message(message["job_id"], message["message"])
+                    except Exception as e:
+                        logger.error(f"❌ Broker message delivery failed for job {message['job_id']}: {str(e)}")
+            elif op == "control":
+                if self._on_control:
+                    self._on_control(message["job_id"], message["action"])
+
+    def subscribe(self, job_id: str):
+        """이 워커에 job_id의 로컬 연결이 생김"""
+        if job_id not in self._subscriptions:
+            self._subscriptions.add(job_id)
+            self._enqueue({"op": "sub", "job_id": job_id})
+
+    def unsubscribe(self, job_id: str):
+        """이 워커에 job_id의 로컬 연결이 모두 끊김"""
+        if job_id in self._subscriptions:
+            self._subscriptions.discard(job_id)
+            self._enqueue({"op": "unsub", "job_id": job_id})
+
+    def publish(self, job_id: str, message: Dict[str, Any]):
+        """다른 워커에 연결된 클라이언트에게 작업 메시지 전달 (구독 워커가 있을 때만)"""
+        if not self.has_remote_subscribers(job_id):
+            return
+        self._published += 1
+        self._enqueue({"op": "pub", "job_id": job_id, "message": message})
+
+    def send_control(self, job_id: str, action: str):
+        """작업을 실행 중인 워커에 제어 메시지(pause/resume) 전달"""
+        self._enqueue({"op": "control", "job_id": job_id, "action": action})
+
+    def has_remote_subscribers(self, job_id: str) -> bool:
+        peers = self._presence.get(job_id)
+        return bool(peers) and any(peer != self.client_id for peer in peers)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            "type": "unix",
+            "socket_path": self.socket_path,
+            "client_id": self.client_id,
+            "is_hub": self.is_hub,
+            "local_subscriptions": len(self._subscriptions),
+            "remote_jobs": sum(1 for job_id in self._presence if self.has_remote_subscribers(job_id)),
+            "published": self._published,
+            "received": self._received,
+            "dropped": self._dropped,
+            "reconnects": self._reconnects,
+            "outbox": self._outbox.qsize() if self._outbox is not None else 0,
+        }
+        if self._hub is not None:
+            stats["hub"] = self._hub.get_stats()
+        return stats
+
+
+def create_broker():
+    """설정에 따라 알림 브로커 생성 (auto: 워커가 2개 이상이면 Unix 소켓)"""
+    mode = (settings.notification_broker or "auto").lower()
+    if mode == "auto":
+        mode = "unix" if settings.get_worker_count() > 1 else "local"
+    if mode == "unix":
+        return UnixSocketBroker(settings.notification_broker_socket, settings.notification_broker_queue_size)
+    return LocalBroker()
+
+
+# 전역 알림 브로커 (NotificationService가 사용)
+notification_broker = create_broker()
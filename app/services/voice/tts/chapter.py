@@ -0,0 +1,103 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Dict, Any, List
+
+from app.config import settings
+from app.repositories.storage import ncp_storage
+from app.repositories.tts import concat_mp3, get_mp3_sample_rate, mp3_encoder
+
+# 로깅 설정
+from app.utils.logger.setup import setup_logger
+logger = setup_logger('tts_chapter', 'logs/tts')
+
+
+class ChapterStitcher:
+    """완료된 배치/연극 작업의 파일별 MP3를 챕터 파일 하나로 이어 붙임
+
+    - 파일별 MP3 프레임을 재인코딩 없이 이어 붙임 (프레임 경계 유지)
+    - 무음 항목(silent_url)은 무음 클립을 넣고, 샘플레이트가 다르면 챕터 형식으로 1초 무음을 인코딩
+    - 챕터 MP3와 text_index별 시작/끝 오프셋 JSON을 한 번씩 업로드
+    """
+
+    def __init__(self, download_concurrency: int):
+        self.download_concurrency = max(1, download_concurrency)
+        self._stitched = 0
+        self._failed = 0
+        self._total_time = 0.0
+
+    async def _download_all(self, urls: List[str]) -> Dict[str, bytes]:
+        """중복 URL(작업 내 중복 문장, 무음)은 한 번만 다운로드"""
+        semaphore = asyncio.Semaphore(self.download_concurrency)
+
+        async def fetch(url: str) -> bytes:
+            async with semaphore:
+                return await ncp_storage.get_bytes(url)
+
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(fetch(url) for url in unique))
+        return dict(zip(unique, results))
+
+    async def stitch(self, job_id: str, files: List[Dict[str, Any]], silent_url: str, folder: str) -> Dict[str, Any]:
+        """챕터 생성 → {"ncp_url", "offsets_url", "duration", "offsets", "missing"} (실패 시 예외)"""
+        started = datetime.now()
+        ordered = sorted(files, key=lambda info: info["text_index"])
+        included = [info for info in ordered if info.get("status") == "completed" and info.get("ncp_url")]
+        missing = [info["text_index"] for info in ordered if info not in included]
+
+        try:
+            audio = await self._download_all([info["ncp_url"] for info in included])
+
+            # 무음 클립은 챕터와 샘플레이트가 같을 때만 그대로 사용
+            speech_rates = {get_mp3_sample_rate(audio[info["ncp_url"]]) for info in included if info["ncp_url"] != silent_url}
+            speech_rates.discard(None)
+            if silent_url in audio and speech_rates:
+                sample_rate = next(iter(speech_rates))
+                if get_mp3_sample_rate(audio[silent_url]) != sample_rate:
+                    audio[silent_url] = await mp3_encoder.encode(b"\x00\x00" * sample_rate, sample_rate=sample_rate)
+
+            data, spans = concat_mp3([audio[info["ncp_url"]] for info in included])
+            offsets = [
+                {"text_index": info["text_index"], "start": start, "end": end}
+                for info, (start, end) in zip(included, spans)
+            ]
+            duration = spans[-1][1] if spans else 0.0
+
+            date_folder = datetime.now().strftime("%Y%m%d")
+            base_key = f"{folder}/{date_folder}/chapter_{job_id}"
+            table = json.dumps(
+                {"job_id": job_id, "duration": duration, "offsets": offsets, "missing": missing},
+                ensure_ascii=False,
+            ).encode("utf-8")
+            ncp_url, offsets_url = await asyncio.gather(
+                ncp_storage.put_bytes(data, f"{base_key}.mp3", content_type="audio/mpeg"),
+                ncp_storage.put_bytes(table, f"{base_key}.json", content_type="application/json"),
+            )
+        except Exception:
+            self._failed += 1
+            raise
+
+        elapsed = (datetime.now() - started).total_seconds()
+        self._stitched += 1
+        self._total_time += elapsed
+        logger.info(f"📖 챕터 생성 완료 (job {job_id}): {len(included)}개 파일, {duration:.2f}초, {len(data)} bytes, {elapsed:.3f}초 소요")
+        return {
+            "ncp_url": ncp_url,
+            "offsets_url": offsets_url,
+            "duration": duration,
+            "size_bytes": len(data),
+            "offsets": offsets,
+            "missing": missing,
+            "created_at": datetime.now().isoformat(),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "stitched": self._stitched,
+            "failed": self._failed,
+            "avg_time": round(self._total_time / self._stitched, 3) if self._stitched else 0.0,
+        }
+
+
+# 전역 챕터 생성기
+chapter_stitcher = ChapterStitcher(download_concurrency=settings.tts_chapter_download_concurrency)
@@ -1,12 +1,9 @@
 import asyncio
-from io import BytesIO
 import os
 import uuid
-import subprocess
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-import boto3
 from app.config import settings
 from app.models.voice.tts import (
     TTSRequest, SingleTTSRequest, TTSResponse, SingleTTSResponse,
@@ -17,10 +14,15 @@ import random
 import re
 from murf import AsyncMurf
 import base64
-import httpx
-from app.repositories.tts import GeminiTTSRepository, OpenAITTSRepository
+from app.repositories.tts import (
+    GeminiTTSRepository, OpenAITTSRepository, get_mp3_duration, concat_mp3, split_mp3, find_silence_cuts,
+    get_rate_limiter, is_rate_limit_error, mp3_encoder, tts_audio_cache, tts_job_store, tts_scheduler, TTSPriority, hedged_request,
+    create_http_client, murf_http_client, murf_phase_metrics
+)
+from app.repositories.storage import ncp_storage
 from app.services.voice.tts.notification import notification_service
-from app.utils.process_text import strip_rich_text_tags
+from app.services.voice.tts.chapter import chapter_stitcher
+from app.utils.process_text import strip_rich_text_tags, process_text
 
 # TTS 로깅 설정
 from app.utils.logger.setup import setup_logger
@@ -36,6 +38,52 @@ MURF_API_KEY = os.getenv("MURF_API_KEY")
 # 무음 오디오 파일 NCP URL
 SILENT_AUDIO_URL = "storymate-dev/TTS/silent_1sec.mp3"
 
+# 진행 중인 챕터 생성 (같은 작업에 대한 동시 요청은 하나의 생성 결과를 공유)
+_chapter_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _apply_job_control(job_id: str, action: str) -> bool:
+    """이 워커가 실행 중인 작업에 pause/resume 적용 (다른 워커의 작업이면 False)"""
+    job = tts_job_store.get_local(job_id)
+    if job is None or action not in ("pause", "resume"):
+        return False
+    job["paused"] = action == "pause"
+    logger.info(f"{'⏸️' if job['paused'] else '▶️'} Job {job_id} {'paused' if job['paused'] else 'resumed'}")
+    return True
+
+
+def _job_counters(job: Dict[str, Any]) -> Dict[str, Any]:
+    """알림용 작업 카운터 (파일 목록 제외)"""
+    total = job["total_files"]
+    status = job["status"]
+    return {
+        "status": status.value if hasattr(status, "value") else status,
+        "progress": (job["completed_files"] + job["failed_files"]) / total if total else 0.0,
+        "total_files": total,
+        "completed_files": job["completed_files"],
+        "failed_files": job["failed_files"],
+    }
+
+
+def _job_snapshot(job_id: str) -> Optional[Dict[str, Any]]:
+    """재연결/재동기화용 전체 상태 스냅샷 (파일 목록 포함)"""
+    job = tts_job_store.get(job_id)
+    if job is None:
+        return None
+    return {
+        "type": "snapshot",
+        "job_id": job_id,
+        **_job_counters(job),
+        "files": list(job["files"]),
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+# 다른 워커에서 받은 요청도 작업을 실행 중인 워커에서 적용되도록 등록
+notification_service.register_control_handler(_apply_job_control)
+notification_service.register_snapshot_provider(_job_snapshot)
+
+
 class TTSService:
     """TTS 생성 비즈니스 로직을 담당하는 Service - 하트비트 개선"""
     
@@ -44,33 +92,25 @@ class TTSService:
         self.gemini_repo = GeminiTTSRepository()
         self.openai_repo = OpenAITTSRepository()
         # mod by LAB (25.08.19) 
-        self.jobs: Dict[str, Dict[str, Any]] = {}  # 작업 상태 저장소 (실제로는 Redis 등 사용 권장)
-        self.play_jobs: Dict[str, Dict[str, Any]] = {}  # 연극 TTS 작업 상태 저장소
+        self.jobs = tts_job_store  # 작업 상태 저장소 (메모리 LRU + SQLite, 배치/연극 TTS 공용)
+        self._background_tasks: set = set()  # 스트리밍 TTS 업로드 등 백그라운드 작업 참조 유지
+        # 파일 경로 기준 (오디오는 메모리에서 바로 업로드되고, 디렉토리는 앱 시작 시 생성되므로 파일시스템을 확인하지 않음)
+        self.output_dir = os.path.join(os.getcwd(), settings.output_dir)
         
         if MURF_API_KEY:
-            self.murf_client = AsyncMurf(api_key=MURF_API_KEY)
+            # SDK 기본 클라이언트 대신 연결 풀/타임아웃을 설정한 공유 클라이언트 사용
+            self.murf_client = AsyncMurf(
+                api_key=MURF_API_KEY,
+                base_url=settings.murf_base_url,
+                timeout=settings.murf_api_timeout,
+                httpx_client=create_http_client(
+                    settings.murf_http2, settings.murf_http_max_connections,
+                    settings.murf_connect_timeout, settings.murf_api_timeout,
+                ),
+            )
         else:
             self.murf_client = None
             logger.warning("MURF_API_KEY가 설정되지 않았습니다. MurfAI 기능을 사용할 수 없습니다.")
-        self.s3_client = boto3.client(
-            service_name=os.getenv("NAVER_SERVICE_NAME"),
-            endpoint_url=os.getenv("NAVER_ENDPOINT_URL"),
-            aws_access_key_id=os.getenv("ACCESS"),
-            aws_secret_access_key=os.getenv("SECRET")
-        )
-    
-    def _ensure_output_directory(self) -> str:
-        """출력 디렉토리 생성 및 경로 반환"""
-        output_path = os.path.join(os.getcwd(), settings.output_dir)
-        os.makedirs(output_path, exist_ok=True)
-        
-        # 권한 확인 및 설정
-        try:
-            os.chmod(output_path, 0o777)
-        except PermissionError:
-            logger.warning(f"⚠️ Warning: Could not set permissions for {output_path}")
-            
-        return output_path
     
     # TODO: 기존 TTS와 병합 혹은 리팩터링 필요
     def _ensure_play_ncp_bucket(self, filename: str) -> str:
@@ -99,6 +139,15 @@ class TTSService:
             return settings.openai_all_voices[0]
         return "echo"
     
+    def _get_tts_model_name(self, provider: str, language: Optional[str] = None) -> str:
+        """오디오 캐시 키에 사용할 provider별 모델 식별자"""
+        if provider == "openai":
+            return settings.openai_tts_model
+        if provider == "murf":
+            # Murf는 locale/style에 따라 결과가 달라지므로 함께 포함
+            return f"murf:{language or ''}:Conversational"
+        return settings.tts_model
+    
     def _get_clean_voice_value(self, voice) -> str:
         """Voice 값에서 실제 문자열 값 추출"""
         if hasattr(voice, 'value'):
@@ -350,8 +399,28 @@ class TTSService:
 
         return output
 
-    async def generate_single_tts(self, request: SingleTTSRequest) -> SingleTTSResponse:
-        """단일 TTS 파일 생성"""
+    def _select_single_voice(self, request: SingleTTSRequest, provider: str) -> str:
+        """단일 TTS 요청의 provider별 음성 선택"""
+        if provider == "openai":
+            # OpenAI: 성별에 맞는 음성 자동 선택
+            return self._select_openai_voice_by_gender(request.gender_hint)
+
+        # Gemini: 요청된 voice 사용 또는 성별에 맞는 기본 음성 선택
+        if request.voice:
+            return self._get_clean_voice_value(request.voice)
+
+        clean_gender = self._get_clean_gender_value(request.gender_hint)
+        if clean_gender == GenderType.FEMALE.value and settings.gemini_female_voices:
+            return settings.gemini_female_voices[0]
+        if clean_gender == GenderType.MALE.value and settings.gemini_male_voices:
+            return settings.gemini_male_voices[0]
+        # config에서 기본 Gemini 음성 사용 (첫 번째 음성)
+        return settings.gemini_all_voices[0] if settings.gemini_all_voices else "Charon"
+
+    async def generate_single_tts(
+        self, request: SingleTTSRequest, priority: TTSPriority = TTSPriority.INTERACTIVE
+    ) -> SingleTTSResponse:
+        """단일 TTS 파일 생성 (기본적으로 배치/연극 작업보다 먼저 스케줄링)"""
 
         try:
             # 빈 텍스트 확인
@@ -366,7 +435,7 @@ class TTSService:
                     duration=1.0
                 )
 
-            output_dir = self._ensure_output_directory()
+            output_dir = self.output_dir
 
             # 고유성을 위한 UUID 생성 (8자리)
             unique_id = str(uuid.uuid4())[:8]
@@ -382,53 +451,61 @@ class TTSService:
             provider = settings.default_tts_provider.lower()
             logger.info(f"🎵 TTS 생성 시작 - Provider: {provider}, Gender: {clean_gender}")
 
-            # Provider에 따라 음성 선택 및 TTS 생성
-            if provider == "openai":
-                # OpenAI: 성별에 맞는 음성 자동 선택
-                voice = self._select_openai_voice_by_gender(request.gender_hint)
-                filename = f"single_{voice}_{clean_gender}_{timestamp}_{unique_id}.{settings.audio_format}"
-                file_path = os.path.join(output_dir, filename)
+            # Provider에 따라 음성 선택
+            voice = self._select_single_voice(request, provider)
 
-                success, ncp_url = await self.openai_repo.generate_tts(
-                    text=clean_text,
-                    voice=voice,
-                    filename=file_path
+            # 동일 provider/model/voice/텍스트로 이미 생성된 오디오가 있으면 재사용
+            cache_provider = "openai" if provider == "openai" else "gemini"
+            cache_model = self._get_tts_model_name(cache_provider)
+            cached = await tts_audio_cache.get(cache_provider, cache_model, voice, clean_text)
+            if cached:
+                return SingleTTSResponse(
+                    success=True,
+                    message="캐시된 TTS 파일을 반환합니다.",
+                    filename=os.path.basename(cached["ncp_url"]),
+                    file_path=None,
+                    ncp_url=cached["ncp_url"],
+                    duration=cached["duration"]
                 )
-            else:  # gemini (기본값)
-                # Gemini: 요청된 voice 사용 또는 성별에 맞는 기본 음성 선택
-                if request.voice:
-                    voice = self._get_clean_voice_value(request.voice)
-                else:
-                    # 성별에 맞는 Gemini 음성 선택
-                    if clean_gender == GenderType.FEMALE.value and settings.gemini_female_voices:
-                        voice = settings.gemini_female_voices[0]
-                    elif clean_gender == GenderType.MALE.value and settings.gemini_male_voices:
-                        voice = settings.gemini_male_voices[0]
-                    else:
-                        # config에서 기본 Gemini 음성 사용 (첫 번째 음성)
-                        voice = settings.gemini_all_voices[0] if settings.gemini_all_voices else "Charon"
 
-                filename = f"single_{voice}_{clean_gender}_{timestamp}_{unique_id}.{settings.audio_format}"
-                file_path = os.path.join(output_dir, filename)
-
-                success, ncp_url, is_rate_limit = await self.gemini_repo.generate_tts(
-                    text=clean_text,
-                    voice=voice,
-                    filename=file_path,
-                    gender_hint=request.gender_hint
+            filename = f"single_{voice}_{clean_gender}_{timestamp}_{unique_id}.{settings.audio_format}"
+            file_path = os.path.join(output_dir, filename)
+
+            # Provider에 따라 TTS 생성
+            # (오디오는 메모리에서 바로 업로드되고 duration도 함께 반환됨)
+            chunks = None
+            if self._is_long_text(clean_text):
+                # 긴 텍스트는 문장 단위 청크로 나눠 동시에 합성 (Gemini 429면 성별에 맞는 OpenAI 보이스로 전환)
+                openai_voice = self._select_openai_voice_by_gender(request.gender_hint)
+                openai_filename = f"single_{openai_voice}_{clean_gender}_{timestamp}_{unique_id}.{settings.audio_format}"
+                success, ncp_url, duration, chunks, fell_back = await self._generate_long_tts(
+                    cache_provider, clean_text, voice, file_path, priority=priority,
+                    fallback=(openai_voice, os.path.join(output_dir, openai_filename))
                 )
+                if fell_back:
+                    cache_provider, cache_model, voice = "openai", self._get_tts_model_name("openai"), openai_voice
+                    filename = openai_filename
+                    file_path = os.path.join(output_dir, openai_filename)
+            else:
+                async with tts_scheduler.slot(cache_provider, priority=priority):
+                    if provider == "openai":
+                        success, ncp_url, duration = await self.openai_repo.generate_tts(
+                            text=clean_text,
+                            voice=voice,
+                            filename=file_path,
+                            with_duration=True
+                        )
+                    else:  # gemini (기본값)
+                        success, ncp_url, is_rate_limit, duration = await self.gemini_repo.generate_tts(
+                            text=clean_text,
+                            voice=voice,
+                            filename=file_path,
+                            gender_hint=request.gender_hint,
+                            with_duration=True
+                        )
             
             if success:
-                # MP3 파일의 duration 계산
-                duration = self._get_mp3_duration(file_path) if file_path else None
-
-                # NCP 업로드 성공 후 로컬 파일 삭제
-                if file_path and os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                        logger.info(f"🗑️ 로컬 파일 삭제 완료: {file_path}")
-                    except Exception as e:
-                        logger.warning(f"⚠️ 로컬 파일 삭제 실패: {file_path} - {str(e)}")
+                await tts_audio_cache.put(cache_provider, cache_model, voice, clean_text, ncp_url, duration)
 
                 return SingleTTSResponse(
                     success=True,
@@ -437,7 +514,8 @@ class TTSService:
                     file_path=file_path,
                     # download_url=f"/api/v1/tts/download/{filename}",
                     ncp_url=ncp_url,
-                    duration=duration
+                    duration=duration,
+                    chunks=chunks
                 )
             else:
                 return SingleTTSResponse(
@@ -452,6 +530,213 @@ class TTSService:
                 message=f"TTS 생성 중 오류가 발생했습니다: {str(e)}"
             )
     
+    async def stream_single_tts(self, request: SingleTTSRequest) -> Dict[str, Any]:
+        """단일 TTS 스트리밍 준비
+
+        캐시 적중(또는 빈 텍스트)이면 {"ncp_url"}만 반환하고, 아니면 provider 스트림의
+        첫 청크까지 받은 뒤 {"stream", "ncp_url", "provider", "voice"}를 반환합니다.
+        스트림이 끝나면 같은 버퍼로 NCP 업로드와 캐시 저장을 백그라운드에서 진행합니다.
+        """
+        if self._is_empty_text(request.text):
+            return {"ncp_url": self._get_silent_audio_response()["file_url"], "cached": True}
+
+        clean_text = strip_rich_text_tags(request.text)
+        provider = "openai" if settings.default_tts_provider.lower() == "openai" else "gemini"
+        voice = self._select_single_voice(request, provider)
+
+        cached = await tts_audio_cache.get(provider, self._get_tts_model_name(provider), voice, clean_text)
+        if cached:
+            return {"ncp_url": cached["ncp_url"], "cached": True, "duration": cached["duration"]}
+
+        logger.info(f"🎵 TTS 스트리밍 시작 - Provider: {provider}, Voice: {voice}")
+        # 스트림은 클라이언트 속도로 소비되므로 스케줄러 슬롯은 첫 청크를 받을 때까지만 점유
+        chunks = self._open_provider_stream(provider, voice, clean_text)
+        try:
+            async with tts_scheduler.slot(provider, priority=TTSPriority.INTERACTIVE):
+                first_chunk = await chunks.__anext__()
+        except BaseException as e:
+            await chunks.aclose()
+            if provider != "gemini" or not is_rate_limit_error(e):
+                raise
+            # Gemini 429면 OpenAI 스트림으로 전환
+            logger.warning("↩️ Falling back to OpenAI TTS stream due to Gemini 429")
+            provider = "openai"
+            voice = self._select_openai_voice_by_gender(request.gender_hint)
+            chunks = self._open_provider_stream(provider, voice, clean_text)
+            try:
+                async with tts_scheduler.slot(provider, priority=TTSPriority.INTERACTIVE):
+                    first_chunk = await chunks.__anext__()
+            except BaseException:
+                await chunks.aclose()
+                raise
+
+        clean_gender = self._get_clean_gender_value(request.gender_hint)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"single_{voice}_{clean_gender}_{timestamp}_{str(uuid.uuid4())[:8]}.{settings.audio_format}"
+        ncp_path = f"{settings.naver_bucket_tts_folder}/{datetime.now().strftime('%Y%m%d')}/{filename}"
+
+        return {
+            "stream": self._stream_and_store(first_chunk, chunks, provider, voice, clean_text, ncp_path),
+            "ncp_url": f"{settings.naver_bucket_name}/{ncp_path}",
+            "cached": False,
+            "provider": provider,
+            "voice": voice,
+        }
+
+    def _open_provider_stream(self, provider: str, voice: str, text: str):
+        if provider == "openai":
+            return self.openai_repo.stream_tts(text, voice)
+        return self.gemini_repo.stream_tts(text, voice)
+
+    async def _stream_and_store(self, first_chunk: bytes, chunks, provider: str, voice: str, text: str, ncp_path: str):
+        """청크를 클라이언트로 흘려보내면서 버퍼에 모으고, 완료 후 업로드/캐시 저장"""
+        buffer = bytearray(first_chunk)
+        try:
+            yield first_chunk
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+        # 스트림이 끝까지 전달된 경우에만 저장 (응답은 기다리지 않음)
+        task = asyncio.create_task(self._store_streamed_audio(bytes(buffer), provider, voice, text, ncp_path))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _store_streamed_audio(self, data: bytes, provider: str, voice: str, text: str, ncp_path: str):
+        try:
+            duration = get_mp3_duration(data)
+            ncp_url = await ncp_storage.put_bytes(data, ncp_path, content_type="audio/mpeg")
+            await tts_audio_cache.put(
+                provider, self._get_tts_model_name(provider), voice, text, ncp_url, duration, size_bytes=len(data)
+            )
+            logger.info(f"☁️ 스트리밍 TTS 업로드 완료: {ncp_url} ({duration}초)")
+        except Exception as e:
+            logger.error(f"❌ 스트리밍 TTS 업로드 실패: {ncp_path} - {str(e)}")
+
+    def _is_long_text(self, text: str) -> bool:
+        return settings.tts_long_text_enabled and len(text) > settings.tts_long_text_threshold
+
+    def _split_long_text(self, text: str) -> List[str]:
+        """문장 경계(process_text)로 나눈 뒤 청크 최대 길이 안에서 이웃 문장을 묶음"""
+        max_chars = settings.tts_long_text_chunk_chars
+        chunks: List[str] = []
+        current = ""
+        for sentence in process_text(text):
+            # 한 문장이 청크보다 길면 공백 기준으로 자름
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _synthesize_long_text(
+        self,
+        provider: str,
+        text: str,
+        voice: str,
+        job_id: Optional[str] = None,
+        priority: TTSPriority = TTSPriority.BACKGROUND,
+        locale: Optional[str] = None,
+    ) -> Tuple[bytes, Optional[float], List[Dict[str, Any]]]:
+        """긴 텍스트를 문장 단위 청크로 나눠 동시에 합성하고 메모리에서 이어 붙임
+
+        완료 시간은 전체 길이가 아니라 가장 느린 청크에 좌우됩니다 (동시 호출 수는 스케줄러/리미터가 제한).
+        반환값: (MP3 바이트, 총 재생 시간, 청크별 {"index", "start", "end", "chars"})
+        """
+        chunks = self._split_long_text(text)
+        logger.info(f"📚 긴 텍스트 모드 ({provider}): {len(text)}자 → {len(chunks)}개 청크 동시 합성")
+
+        async def synthesize(chunk: str) -> bytes:
+            if provider == "murf":
+                data = await self._murf_synthesize(chunk, voice, locale, job_id)
+                if data is None:
+                    raise ValueError("Murf 청크 합성 실패")
+                return data
+            for attempt in range(settings.tts_max_retries + 1):
+                try:
+                    async with tts_scheduler.slot(provider, job_id, priority):
+                        if provider == "openai":
+                            return await self.openai_repo.synthesize(chunk, voice)
+                        return await self.gemini_repo.synthesize_pcm(chunk, voice)
+                except Exception as e:
+                    if attempt >= settings.tts_max_retries:
+                        raise
+                    # 429는 리미터가 속도를 낮추고 대기시키므로 바로 재시도
+                    if not is_rate_limit_error(e):
+                        await asyncio.sleep(settings.tts_base_delay * (2 ** attempt))
+
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(synthesize(chunk)) for chunk in chunks]
+        parts = [task.result() for task in tasks]
+
+        if provider == "gemini":
+            # PCM(24kHz 16bit mono)을 이어 붙인 뒤 한 번만 인코딩
+            offsets = []
+            position = 0.0
+            for part in parts:
+                end = position + len(part) / (24000 * 2)
+                offsets.append((round(position, 3), round(end, 3)))
+                position = end
+            data = await mp3_encoder.encode(b"".join(parts), sample_rate=24000)
+        else:
+            data, offsets = concat_mp3(parts)
+
+        chunk_map = [
+            {"index": index, "start": start, "end": end, "chars": len(chunk)}
+            for index, (chunk, (start, end)) in enumerate(zip(chunks, offsets))
+        ]
+        return data, get_mp3_duration(data), chunk_map
+
+    async def _generate_long_tts(
+        self,
+        provider: str,
+        text: str,
+        voice: str,
+        file_path: str,
+        job_id: Optional[str] = None,
+        priority: TTSPriority = TTSPriority.BACKGROUND,
+        fallback: Optional[Tuple[str, str]] = None,
+    ) -> Tuple[bool, Optional[str], Optional[float], Optional[List[Dict[str, Any]]], bool]:
+        """긴 텍스트 TTS 생성 후 NCP 업로드 → (success, ncp_url, duration, 청크 오프셋, OpenAI 전환 여부)
+
+        fallback=(OpenAI 보이스, 파일 경로)를 주면 Gemini 청크가 429로 실패했을 때
+        짧은 텍스트와 마찬가지로 전체 텍스트를 OpenAI로 다시 합성합니다.
+        """
+        fell_back = False
+        try:
+            data, duration, chunk_map = await self._synthesize_long_text(provider, text, voice, job_id, priority)
+        except Exception as e:
+            if provider != "gemini" or not fallback or not is_rate_limit_error(e):
+                logger.error(f"❌ 긴 텍스트 TTS 생성 실패 ({provider}): {str(e)}")
+                return False, None, None, None, False
+            logger.warning("↩️ Falling back to OpenAI TTS for long text due to Gemini 429")
+            voice, file_path = fallback
+            try:
+                data, duration, chunk_map = await self._synthesize_long_text("openai", text, voice, job_id, priority)
+            except Exception as e:
+                logger.error(f"❌ 긴 텍스트 TTS 생성 실패 (openai 전환): {str(e)}")
+                return False, None, None, None, False
+            fell_back = True
+
+        ncp_url = await ncp_storage.upload_bytes(data, os.path.basename(file_path))
+        if not ncp_url:
+            return False, None, None, None, False
+        logger.info(f"✅ 긴 텍스트 TTS 완료: {len(chunk_map)}개 청크, {duration}초")
+        return True, ncp_url, duration, chunk_map, fell_back
+
     async def generate_batch_tts(self, request: TTSRequest) -> TTSResponse:
         """배치 TTS 파일 생성 - 하트비트 개선"""
 
@@ -499,7 +784,8 @@ class TTSService:
         language = getattr(request, 'language', 'ko') if hasattr(request, 'language') else 'ko'
 
         # 작업 상태 초기화
-        self.jobs[job_id] = {
+        await self.jobs.add(job_id, {
+            "kind": "batch",
             "status": TTSJobStatus.PENDING,
             "total_files": total_files,
             "completed_files": 0,
@@ -515,9 +801,10 @@ class TTSService:
             "paused": False,  # 일시 중단 상태
             "connection_checks": 0,  # 연결 확인 횟수
             "last_connection_check": datetime.now()
-        }
+        })
         
-        # 백그라운드에서 TTS 생성 실행
+        # 백그라운드에서 TTS 생성 실행 (실제 호출은 스케줄러가 다른 작업과 공정하게 배분)
+        estimate = tts_scheduler.estimate_start(tts_provider)
         asyncio.create_task(self._process_batch_tts(job_id))
         
         return TTSResponse(
@@ -525,7 +812,8 @@ class TTSService:
             status=TTSJobStatus.PENDING,
             message="TTS 배치 작업이 시작되었습니다.",
             total_files=total_files,
-            completed_files=0
+            completed_files=0,
+            **estimate
         )
     
     # TODO: 기존 TTS와 병합 혹은 리팩터링 필요
@@ -551,7 +839,8 @@ class TTSService:
         total_files = len(texts)
         batch_size = 3
 
-        self.jobs[job_id] = {
+        await self.jobs.add(job_id, {
+            "kind": "play",
             "status": TTSJobStatus.PENDING,
             "total_files": total_files,
             "completed_files": 0,
@@ -566,8 +855,9 @@ class TTSService:
             "paused": False,
             "connection_checks": 0,
             "last_connection_check": datetime.now(),
-        }
+        })
         
+        estimate = tts_scheduler.estimate_start("murf")
         asyncio.create_task(self._process_play_tts(job_id))
         
         return TTSResponse(
@@ -575,15 +865,17 @@ class TTSService:
             status=TTSJobStatus.PENDING,
             message="연극 TTS 배치 작업이 시작되었습니다.",
             total_files=total_files,
-            completed_files=0
+            completed_files=0,
+            **estimate
         )
     
     # TODO: 기존 TTS와 병합 혹은 리팩터링 필요
     async def _process_batch_tts(self, job_id: str):
-        """배치 TTS 생성 처리 (연결 상태 확인 및 하트비트 개선)"""
+        """배치 TTS 생성 처리 (작업별 슬라이딩 윈도우 스케줄러)"""
         
         job = self.jobs[job_id]
         job["status"] = TTSJobStatus.PROCESSING
+        await self.jobs.save(job_id)
         
         # 전체 처리 시작 시간 기록
         total_start_time = datetime.now()
@@ -592,7 +884,7 @@ class TTSService:
         # 처리 시작 알림
         await self._notify_job_status_change(job_id)
         
-        output_dir = self._ensure_output_directory()
+        output_dir = self.output_dir
         
         try:
             texts = job["texts"]
@@ -600,24 +892,40 @@ class TTSService:
             gender_hints = job["gender_hints"]
             batch_size = job["batch_size"]
             
-            # 모든 작업을 미리 생성
+            # 모든 작업을 미리 생성 (job["files"]는 입력 순서 그대로 유지)
             tasks = []
+            duplicates: Dict[tuple, tuple] = {}
+
+            # 재시작 후 재개하는 작업이면 완료된 파일은 건너뛰고 나머지만 다시 생성
+            resumed_files = self._prepare_resumed_files(job)
             
             # 각 텍스트마다 voices 중 하나를 순환하여 선택
             for text_idx, (text, gender_hint) in enumerate(zip(texts, gender_hints), 1):
-                # 연결 상태 논블로킹 확인 - 연결이 없어도 TTS 작업은 계속 진행
-                await notification_service.has_active_connections(job_id)
+                voice_index = (text_idx - 1) % len(voices)
+                voice = voices[voice_index]
 
-                # 작업이 일시 중단되었는지 확인
-                if job.get("paused", False):
-                    logger.info(f"⏸️ Job {job_id} is manually paused, waiting for resume...")
-                    await self._wait_for_resume(job_id)
+                if resumed_files is not None:
+                    task_info = resumed_files[text_idx - 1]
+                    if task_info["status"] == "completed":
+                        continue
+                    if task_info["file_path"] is None:
+                        tasks.append((task_info, self._process_silent_file(job_id, task_info)))
+                    else:
+                        task_info["file_path"] = os.path.join(output_dir, task_info["filename"])
+                        key = self._dedup_key(text, task_info["voice"], task_info["gender_hint"])
+                        if key in duplicates:
+                            duplicates[key][0].append(task_info)
+                            duplicates[key][1].append(task_info)
+                            continue
+                        infos, dups = [task_info], []
+                        duplicates[key] = (infos, dups)
+                        tasks.append((infos, self._with_duplicates(job_id, self._generate_single_file(
+                            text, task_info["voice"], task_info["file_path"], gender_hint, task_info, job_id
+                        ), [(task_info, dups)])))
+                    continue
 
                 # 빈 텍스트 확인 - 무음 파일 정보 설정 (순서 유지를 위해 task로 처리)
                 if self._is_empty_text(text):
-                    voice_index = (text_idx - 1) % len(voices)
-                    voice = voices[voice_index]
-
                     logger.info(f"🔇 빈 텍스트 감지 (배치 TTS) - 무음 파일 사용 예정: 인덱스 {text_idx}, Voice: {voice}")
 
                     task_info = {
@@ -631,38 +939,9 @@ class TTSService:
                     }
 
                     job["files"].append(task_info)
-
-                    # 무음 파일도 순서를 유지하기 위해 비동기 태스크로 처리
-                    async def process_silent_file():
-                        task_info["status"] = "processing"
-                        logger.info(f"🔇 무음 파일 처리 시작: 인덱스 {text_idx}")
-
-                        # 순서대로 처리하기 위한 약간의 지연 (실제 TTS처럼 동작)
-                        await asyncio.sleep(0.1)
-
-                        task_info["status"] = "completed"
-                        task_info["end_time"] = datetime.now().isoformat()
-                        task_info["ncp_url"] = SILENT_AUDIO_URL
-                        task_info["duration"] = 1.0
-                        job["completed_files"] += 1
-
-                        # 파일 완료 알림 (연결이 있을 때만)
-                        if await notification_service.has_active_connections(job_id):
-                            await notification_service.notify_job_progress(job_id, {
-                                "filename": task_info["filename"],
-                                "status": "completed",
-                                "ncp_url": SILENT_AUDIO_URL,
-                                "message": "Empty text - silent audio returned"
-                            })
-
-                        logger.info(f"✅ 무음 파일 처리 완료: 인덱스 {text_idx}")
-
-                    tasks.append(process_silent_file())
+                    tasks.append((task_info, self._process_silent_file(job_id, task_info)))
                     continue
 
-                voice_index = (text_idx - 1) % len(voices)
-                voice = voices[voice_index]
-
                 filename = self._generate_filename(text_idx, voice, gender_hint)
                 file_path = os.path.join(output_dir, filename)
 
@@ -678,56 +957,36 @@ class TTSService:
 
                 job["files"].append(task_info)
 
+                # 같은 작업 안에서 (정규화 텍스트, 목소리)가 같은 문장은 한 번만 생성하고 결과를 공유
+                key = self._dedup_key(text, voice, task_info["gender_hint"])
+                if key in duplicates:
+                    duplicates[key][0].append(task_info)
+                    duplicates[key][1].append(task_info)
+                    continue
+
                 task = self._generate_single_file(
                     text, voice, file_path, gender_hint, task_info, job_id
                 )
-                tasks.append(task)
-            
-            # 배치 크기로 나누어 처리 (최적화된 버전)
-            logger.info(f"🚀 배치 처리 시작 - 총 {len(tasks)}개 작업을 {batch_size}개씩 처리")
+                infos, dups = [task_info], []
+                duplicates[key] = (infos, dups)
+                tasks.append((infos, self._with_duplicates(job_id, task, [(task_info, dups)])))
+
+            self._record_dedup_stats(job, duplicates)
+
+            # 파일 목록 저장 (이후 파일별 결과는 체크포인트로 갱신)
+            await self.jobs.save(job_id, include_files=True)
             
-            for batch_idx, i in enumerate(range(0, len(tasks), batch_size)):
-                batch = tasks[i:i+batch_size]
-                batch_start_time = datetime.now()
-                logger.info(f"📦 배치 {batch_idx + 1}/{(len(tasks) + batch_size - 1) // batch_size} 시작 ({len(batch)}개 파일)")
-                
-                # 백그라운드 연결 모니터링 (성능 최적화)
-                if batch_idx == 0:
-                    # 첫 번째 배치에서는 동기적으로 확인
-                    await self._perform_connection_health_check(job_id)
-                    logger.info(f"⏱️ 첫 배치 연결 확인 완료")
-                else:
-                    # 후속 배치들은 백그라운드에서 비동기 모니터링
-                    asyncio.create_task(self._background_connection_monitor(job_id, batch_idx))
-                
-                # 배치 실행
-                batch_execution_start = datetime.now()
-                results = await asyncio.gather(*batch, return_exceptions=True)
-                batch_execution_duration = (datetime.now() - batch_execution_start).total_seconds()
-                
-                batch_end_time = datetime.now()
-                total_batch_duration = (batch_end_time - batch_start_time).total_seconds()
-                
-                # 배치 성능 분석
-                if total_batch_duration > 3.0:
-                    logger.warning(f"⚠️ 배치 {batch_idx + 1} 지연 감지: {total_batch_duration:.3f}초 (임계값: 3초)")
-                    # 개별 태스크 결과 분석
-                    for i, result in enumerate(results):
-                        if isinstance(result, Exception):
-                            logger.error(f"   • 태스크 {i+1}: 에러 - {str(result)}")
-                        else:
-                            logger.info(f"   • 태스크 {i+1}: 정상 완료")
-                
-                logger.info(f"✅ 배치 {batch_idx + 1} 완료 - 실행: {batch_execution_duration:.3f}초, 전체: {total_batch_duration:.3f}초")
-                
-                # 배치 완료 후 진행상황 알림 (동기 대기로 안정성 확보)
-                await self._notify_job_status_change(job_id)
-                
-                # 모든 배치 후 대기 (안정성 우선) - 원래 메서드 사용
-                await self._smart_delay_with_connection_check(job_id, 2.0)
+            # 첫 작업 시작 전 연결 상태 확인 (10초 주기 캐시)
+            await self._perform_connection_health_check(job_id)
+
+            # 슬롯 N개를 유지하며 하나가 끝나는 즉시 다음 파일 시작
+            logger.info(f"🚀 슬라이딩 윈도우 처리 시작 - 총 {len(tasks)}개 작업, 동시 처리 {batch_size}개")
+            await self._run_sliding_window(job_id, tasks, batch_size)
             
             job["status"] = TTSJobStatus.COMPLETED
             job["end_time"] = datetime.now()
+            await self.jobs.save(job_id)
+            await self._auto_stitch_chapter(job_id)
             
             # 전체 처리 시간 계산 및 로그 출력
             total_duration = (job["end_time"] - total_start_time).total_seconds()
@@ -739,7 +998,7 @@ class TTSService:
             logger.info(f"   • 완료 파일: {job['completed_files']}개")
             logger.info(f"   • 실패 파일: {job['failed_files']}개")
             logger.info(f"   • 성공률: {success_rate:.1f}%")
-            logger.info(f"   • 파일당 평균 시간: {total_duration/job['total_files']:.3f}초")
+            logger.info(f"   • 파일당 평균 시간: {total_duration/max(1, job['total_files']):.3f}초")
             
             # 최종 완료 알림
             await self._notify_job_completion(job_id)
@@ -748,6 +1007,7 @@ class TTSService:
             job["status"] = TTSJobStatus.FAILED
             job["end_time"] = datetime.now()
             job["error"] = str(e)
+            await self.jobs.save(job_id)
             
             # 실패 시에도 처리 시간 통계 출력
             total_duration = (job["end_time"] - total_start_time).total_seconds()
@@ -761,6 +1021,73 @@ class TTSService:
             
             # 실패 알림
             await self._notify_job_completion(job_id)
+
+    async def _run_sliding_window(self, job_id: str, tasks: List, concurrency: int):
+        """작업별 슬라이딩 윈도우 스케줄러
+
+        고정 배치(gather 후 대기) 대신 concurrency개의 워커가 공유 이터레이터에서
+        다음 작업을 꺼내 실행합니다. 느린 파일 하나가 나머지 슬롯을 막지 않으며,
+        배치 간 고정 대기 시간도 없습니다. tasks는 (task_info 또는 task_info 리스트, 코루틴) 쌍의 리스트입니다.
+        """
+        job = self.jobs[job_id]
+        concurrency = max(1, concurrency or 1)
+        pending = iter(tasks)
+        finished = 0
+
+        async def worker(worker_id: int):
+            nonlocal finished
+            for task_info, task in pending:
+                # 작업이 일시 중단되었는지 확인 (다음 파일을 꺼내기 전에)
+                if job.get("paused", False):
+                    logger.info(f"⏸️ Job {job_id} is manually paused, waiting for resume...")
+                    await self._wait_for_resume(job_id)
+
+                file_start = datetime.now()
+                try:
+                    await task
+                except Exception as e:
+                    # 개별 파일 실패가 다른 슬롯에 영향을 주지 않도록 격리
+                    logger.error(f"❌ 워커 {worker_id} 작업 예외: {str(e)}")
+
+                file_duration = (datetime.now() - file_start).total_seconds()
+                if file_duration > 3.0:
+                    logger.warning(f"⚠️ 워커 {worker_id} 파일 처리 지연: {file_duration:.3f}초 (임계값: 3초)")
+
+                # 파일 단위 체크포인트 (재시작 시 완료된 파일은 재생성하지 않음, 장면 묶음은 대사별로 저장)
+                for info in task_info if isinstance(task_info, list) else [task_info]:
+                    await self.jobs.checkpoint_file(job_id, info)
+
+                finished += 1
+                # 기존 배치 단위와 같은 주기로 전체 상태 알림 (파일 단위 진행 알림은 개별 작업에서 전송)
+                if finished % concurrency == 0 or finished == len(tasks):
+                    await self._notify_job_status_change(job_id)
+
+        workers = [worker(i + 1) for i in range(min(concurrency, len(tasks)))]
+        await asyncio.gather(*workers)
+
+    async def _process_silent_file(self, job_id: str, task_info: Dict[str, Any], notify: bool = True):
+        """빈 텍스트 항목을 무음 파일로 완료 처리"""
+        job = self.jobs[job_id]
+        task_info["status"] = "processing"
+        logger.info(f"🔇 무음 파일 처리 시작: 인덱스 {task_info['text_index']}")
+
+        task_info["status"] = "completed"
+        task_info["end_time"] = datetime.now().isoformat()
+        task_info["ncp_url"] = SILENT_AUDIO_URL
+        task_info["duration"] = 1.0
+        job["completed_files"] += 1
+
+        # 파일 완료 알림 (연결이 있을 때만)
+        if notify:
+            notification_service.emit_progress(job_id, {
+                "filename": task_info["filename"],
+                "text_index": task_info["text_index"],
+                "status": "completed",
+                "ncp_url": SILENT_AUDIO_URL,
+                "message": "Empty text - silent audio returned"
+            }, _job_counters(job))
+
+        logger.info(f"✅ 무음 파일 처리 완료: 인덱스 {task_info['text_index']}")
             
     # murf 전용 연극 대본 TTS 생성 워커
     # TODO: 기존 TTS와 병합 혹은 리팩터링 필요
@@ -768,6 +1095,7 @@ class TTSService:
         try:
             job = self.jobs[job_id]
             job["status"] = TTSJobStatus.PROCESSING
+            await self.jobs.save(job_id)
             await self._notify_job_status_change(job_id)
 
             logger.info(f"play job: {job}")
@@ -778,7 +1106,6 @@ class TTSService:
             logger.error(f"Error in _process_play_tts: {e}", exc_info=True)
             return
         
-        # output_dir = self._ensure_output_directory()
         texts = job["texts"]
         voices = job["voices"]
         roles = job["roles"]
@@ -787,7 +1114,18 @@ class TTSService:
 
         try:
             tasks = []
+            resumed_files = self._prepare_resumed_files(job)
             for idx, (text, voice_id, role) in enumerate(zip(texts, voices, roles), 1):
+                if resumed_files is not None:
+                    task_info = resumed_files[idx - 1]
+                    if task_info["status"] == "completed":
+                        continue
+                    if task_info["file_path"] is None:
+                        tasks.append((task_info, self._process_silent_file(job_id, task_info, notify=False)))
+                    else:
+                        tasks.append((task_info, None))
+                    continue
+
                 # 빈 텍스트 확인 - 무음 파일 정보 설정 (순서 유지를 위해 task로 처리)
                 if self._is_empty_text(text):
                     logger.info(f"🔇 빈 텍스트 감지 (연극 TTS) - 무음 파일 사용 예정: 인덱스 {idx}, Voice: {voice_id}")
@@ -813,24 +1151,7 @@ class TTSService:
                     }
 
                     job["files"].append(task_info)
-
-                    # 무음 파일도 순서를 유지하기 위해 비동기 태스크로 처리
-                    async def process_silent_play_file():
-                        task_info["status"] = "processing"
-                        logger.info(f"🔇 무음 파일 처리 시작 (연극): 인덱스 {idx}")
-
-                        # 순서대로 처리하기 위한 약간의 지연
-                        await asyncio.sleep(0.1)
-
-                        task_info["status"] = "completed"
-                        task_info["end_time"] = datetime.now().isoformat()
-                        task_info["ncp_url"] = SILENT_AUDIO_URL
-                        task_info["duration"] = 1.0
-                        job["completed_files"] += 1
-
-                        logger.info(f"✅ 무음 파일 처리 완료 (연극): 인덱스 {idx}")
-
-                    tasks.append(process_silent_play_file())
+                    tasks.append((task_info, self._process_silent_file(job_id, task_info, notify=False)))
                     continue
 
                 if (voice_id in settings.murfai_english_female_voices or
@@ -857,16 +1178,17 @@ class TTSService:
                 }
                 job["files"].append(task_info)
 
-                # 연극 TTS는 항상 Murf 사용
-                tasks.append(self._process_single_murf(job_id, text, voice_id, file_path, task_info))
+                # 연극 TTS는 항상 Murf 사용 (코루틴은 장면 묶음 여부를 정한 뒤 생성)
+                tasks.append((task_info, None))
 
-            for i in range(0, len(tasks), batch_size):
-                batch = tasks[i:i + batch_size]
-                await asyncio.gather(*batch, return_exceptions=True)
-                await self._notify_job_status_change(job_id)
+            tasks = await self._build_play_tasks(job_id, tasks)
+            await self.jobs.save(job_id, include_files=True)
+            await self._run_sliding_window(job_id, tasks, batch_size)
 
             job["status"] = TTSJobStatus.COMPLETED
             job["end_time"] = datetime.now()
+            await self.jobs.save(job_id)
+            await self._auto_stitch_chapter(job_id)
             await self._notify_job_completion(job_id)
 
         except Exception as e:
@@ -875,8 +1197,243 @@ class TTSService:
                 self.jobs[job_id]["status"] = TTSJobStatus.FAILED
                 self.jobs[job_id]["end_time"] = datetime.now()
                 self.jobs[job_id]["error"] = str(e)
+                await self.jobs.save(job_id)
                 await self._notify_job_completion(job_id)
                
+    def _dedup_key(self, text: str, voice: str, gender: Optional[str] = None) -> tuple:
+        return tts_audio_cache.normalize_text(text), voice or "", gender or ""
+
+    def _record_dedup_stats(self, job: Dict[str, Any], duplicates: Dict[tuple, tuple]):
+        """작업 내 중복 제거 통계 (생성 대상 중 결과를 공유한 비율)"""
+        unique = len(duplicates)
+        shared = sum(len(dups) for _, dups in duplicates.values())
+        job["dedup"] = {
+            "unique": unique,
+            "duplicates": shared,
+            "ratio": round(shared / (unique + shared), 3) if unique + shared else 0.0,
+        }
+        if shared:
+            logger.info(f"♻️ 작업 내 중복 문장 {shared}개는 생성 결과 공유 (고유 {unique}개)")
+
+    async def _with_duplicates(self, job_id: str, coroutine, pairs: List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]):
+        """대표 항목을 생성한 뒤 같은 문장 항목들에 결과(NCP URL, duration)를 복사 - 인덱스마다 진행 알림 전송"""
+        try:
+            await coroutine
+        except Exception as e:
+            logger.error(f"❌ 대표 항목 생성 예외 (job {job_id}): {str(e)}")
+
+        job = self.jobs[job_id]
+        for primary, duplicates in pairs:
+            for task_info in duplicates:
+                for field in ("ncp_url", "duration", "end_time", "generation_time", "error", "chunks", "cached"):
+                    if field in primary:
+                        task_info[field] = primary[field]
+                task_info["deduplicated_from"] = primary["text_index"]
+                if primary.get("status") == "completed":
+                    task_info["status"] = "completed"
+                    job["completed_files"] += 1
+                else:
+                    task_info["status"] = "failed"
+                    job["failed_files"] += 1
+
+                notification_service.emit_progress(job_id, {
+                    "filename": task_info["filename"],
+                    "text_index": task_info["text_index"],
+                    "status": task_info["status"],
+                    "ncp_url": task_info.get("ncp_url"),
+                    "duration": task_info.get("duration"),
+                }, _job_counters(job))
+
+    def _murf_text(self, text: str) -> str:
+        """Murf 요청/캐시 키에 쓰는 대사 텍스트 (_murf_generate와 같은 정리)"""
+        return ' '.join(strip_rich_text_tags(text).split()).replace('\\"', '"')
+
+    async def _murf_cache_lookup(self, task_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        locale = self._murf_locale(task_info["language"])
+        return await tts_audio_cache.get(
+            "murf", self._get_tts_model_name("murf", locale), task_info["voice"], self._murf_text(task_info["text"])
+        )
+
+    async def _complete_murf_from_cache(self, job_id: str, task_info: Dict[str, Any], cached: Dict[str, Any]):
+        """캐시에 있는 대사를 Murf 호출 없이 완료 처리 (장면 묶음 전에 걸러낸 항목)"""
+        job = self.jobs[job_id]
+        task_info["status"] = "completed"
+        task_info["end_time"] = datetime.now().isoformat()
+        task_info["ncp_url"] = cached["ncp_url"]
+        task_info["cached"] = True
+        if cached.get("duration"):
+            task_info["duration"] = cached["duration"]
+        job["completed_files"] += 1
+
+        notification_service.emit_progress(job_id, {
+            "filename": task_info["filename"],
+            "text_index": task_info["text_index"],
+            "status": "completed",
+            "ncp_url": cached["ncp_url"],
+            "duration": task_info.get("duration"),
+        }, _job_counters(job))
+
+    async def _build_play_tasks(self, job_id: str, entries: List) -> List:
+        """연극 작업 목록 구성 - 코루틴이 None인 항목은 Murf 대사
+
+        같은 (정규화 텍스트, 목소리) 대사는 한 번만 생성합니다. 장면 배치 모드면 캐시에 있는 대사를 먼저
+        걸러낸 뒤 같은 목소리의 연속 대사를 Murf 요청 하나로 묶고(Murf는 요청당 화자 1명),
+        나머지는 기존처럼 대사별로 요청합니다.
+        """
+        tasks: List = []
+        group: List[Dict[str, Any]] = []
+
+        # 같은 (정규화 텍스트, 목소리) 대사는 첫 항목만 생성하고 결과를 공유
+        duplicates: Dict[tuple, tuple] = {}
+        unique_entries = []
+        for task_info, coroutine in entries:
+            if coroutine is None:
+                key = self._dedup_key(task_info["text"], task_info["voice"])
+                if key in duplicates:
+                    duplicates[key][1].append(task_info)
+                    continue
+                duplicates[key] = (task_info, [])
+            unique_entries.append((task_info, coroutine))
+        self._record_dedup_stats(self.jobs[job_id], {key: ([primary] + dups, dups) for key, (primary, dups) in duplicates.items()})
+        followers = {id(primary): dups for primary, dups in duplicates.values() if dups}
+
+        # 장면 묶음은 캐시를 보지 않고 합성하므로, 이미 캐시에 있는 대사는 묶기 전에 제외
+        # (대사별 모드에서는 _murf_generate가 캐시를 확인)
+        cached: Dict[int, Dict[str, Any]] = {}
+        if settings.play_tts_scene_batching:
+            murf_infos = [info for info, coroutine in unique_entries if coroutine is None]
+            hits = await asyncio.gather(*(self._murf_cache_lookup(info) for info in murf_infos))
+            cached = {id(info): hit for info, hit in zip(murf_infos, hits) if hit}
+
+        def add(infos_group: List[Dict[str, Any]], coroutine):
+            pairs = [(info, followers[id(info)]) for info in infos_group if id(info) in followers]
+            infos = list(infos_group) + [dup for _, dups in pairs for dup in dups]
+            tasks.append((infos, self._with_duplicates(job_id, coroutine, pairs) if pairs else coroutine))
+
+        def flush():
+            if len(group) > 1:
+                add(group, self._process_murf_scene(job_id, list(group)))
+            elif group:
+                info = group[0]
+                add(group, self._process_single_murf(job_id, info["text"], info["voice"], info["file_path"], info))
+            group.clear()
+
+        max_lines = settings.play_tts_scene_max_lines if settings.play_tts_scene_batching else 1
+        for task_info, coroutine in unique_entries:
+            if coroutine is not None:
+                flush()
+                tasks.append((task_info, coroutine))
+                continue
+            if id(task_info) in cached:
+                flush()
+                add([task_info], self._complete_murf_from_cache(job_id, task_info, cached[id(task_info)]))
+                continue
+            if group and (
+                len(group) >= max_lines
+                or group[-1]["voice"] != task_info["voice"]
+                or group[-1]["text_index"] + 1 != task_info["text_index"]
+                or sum(len(info["text"]) for info in group) + len(task_info["text"]) > settings.play_tts_scene_max_chars
+            ):
+                flush()
+            group.append(task_info)
+        flush()
+        return tasks
+
+    def _scene_cut_points(self, texts: List[str], word_durations) -> Optional[List[float]]:
+        """Murf 단어 타임스탬프로 대사 경계 시각 계산 (단어 수가 맞지 않으면 None)"""
+        if not word_durations:
+            return None
+        counts = [len(text.split()) for text in texts]
+        if sum(counts) != len(word_durations) or not all(counts):
+            return None
+
+        cuts: List[float] = []
+        position = 0
+        for count in counts[:-1]:
+            position += count
+            previous_end = getattr(word_durations[position - 1], "end_ms", None)
+            next_start = getattr(word_durations[position], "start_ms", None)
+            if previous_end is None or next_start is None:
+                return None
+            cuts.append((previous_end + next_start) / 2000)
+        return cuts
+
+    async def _process_murf_scene(self, job_id: str, infos: List[Dict[str, Any]]):
+        """같은 목소리의 연속 대사를 Murf 요청 하나로 합성한 뒤 대사별 클립으로 분할
+
+        경계는 Murf 단어 타임스탬프 → 무음 구간 검출 순으로 찾고, 둘 다 실패하면 대사별 요청으로 처리합니다.
+        클립은 대사별 파일명으로 업로드되므로 files 출력 형식은 대사별 모드와 같습니다.
+        """
+        job = self.jobs[job_id]
+        scene_start = datetime.now()
+        locale = self._murf_locale(infos[0]["language"])
+        voice_id = infos[0]["voice"]
+        cache_model = self._get_tts_model_name("murf", locale)
+        texts = [self._murf_text(info["text"]) for info in infos]
+        for info in infos:
+            info["status"] = "processing"
+
+        async def fallback(reason: str):
+            # 장면 작업이 윈도우 슬롯 1개를 점유하고 있으므로 대사별 요청은 순서대로 (작업 동시성 폭을 넘지 않음)
+            logger.warning(f"↩️ 장면 배치 실패, 대사별 요청으로 처리 ({len(infos)}줄): {reason}")
+            for info in infos:
+                await self._process_single_murf(job_id, info["text"], info["voice"], info["file_path"], info)
+
+        try:
+            result = await self._murf_synthesize(
+                settings.play_tts_scene_separator.join(texts), voice_id, locale, job_id, with_timestamps=True
+            ) if self.murf_client else None
+            if result is None:
+                return await fallback("Murf 합성 실패")
+            audio, word_durations = result
+
+            cuts = self._scene_cut_points(texts, word_durations)
+            if cuts is None:
+                total = get_mp3_duration(audio) or 0.0
+                lengths = [len(text) for text in texts]
+                expected = [total * sum(lengths[:i + 1]) / sum(lengths) for i in range(len(texts) - 1)]
+                cuts = await asyncio.to_thread(find_silence_cuts, audio, expected)
+            if cuts is None:
+                return await fallback("대사 경계를 찾지 못함")
+
+            clips = split_mp3(audio, cuts)
+            if len(clips) != len(infos) or not all(clips):
+                return await fallback("클립 분할 실패")
+
+            date_folder = datetime.now().strftime("%Y%m%d")
+            async with murf_phase_metrics.timed("upload"):
+                urls = await asyncio.gather(*(
+                    ncp_storage.put_bytes(
+                        clip, f"{settings.naver_bucket_tts_folder}/{date_folder}/{os.path.basename(info['file_path'])}",
+                        content_type="audio/mpeg"
+                    )
+                    for clip, info in zip(clips, infos)
+                ))
+        except Exception as e:
+            return await fallback(str(e))
+
+        generation_time = (datetime.now() - scene_start).total_seconds()
+        logger.info(f"🎬 장면 배치 완료: {len(infos)}줄 → Murf 요청 1회 ({generation_time:.3f}초)")
+        for info, text, clip, url in zip(infos, texts, clips, urls):
+            duration = get_mp3_duration(clip)
+            info["status"] = "completed"
+            info["end_time"] = datetime.now().isoformat()
+            info["ncp_url"] = url
+            info["generation_time"] = generation_time
+            info["scene_batched"] = True
+            if duration:
+                info["duration"] = duration
+            job["completed_files"] += 1
+            await tts_audio_cache.put("murf", cache_model, voice_id, text, url, duration, size_bytes=len(clip))
+
+            notification_service.emit_progress(job_id, {
+                "filename": info["filename"],
+                "text_index": info["text_index"],
+                "status": info["status"],
+                "ncp_url": url,
+                "duration": info.get("duration"),
+            }, _job_counters(job))
+
     async def _process_single_murf(
         self,
         job_id: str,
@@ -896,7 +1453,7 @@ class TTSService:
         clean_text = strip_rich_text_tags(text)
 
         try:
-            success, remote_url, duration = await self._murf_generate(text=clean_text, voice_id=voice_id, file_path=file_path, language=task_info["language"])
+            success, remote_url, duration = await self._murf_generate(text=clean_text, voice_id=voice_id, file_path=file_path, language=task_info["language"], job_id=job_id)
 
             # 문장별 생성 시간 계산 및 로그
             sentence_duration = (datetime.now() - sentence_start_time).total_seconds()
@@ -928,16 +1485,17 @@ class TTSService:
             job["failed_files"] += 1
 
             logger.error(f"❌ Murf TTS 생성 예외 (문장 {task_info['text_index']}): {sentence_duration:.3f}초 - {str(e)} - {text[:50]}...")
-    
-    # TODO: 기존 TTS와 병합 혹은 리팩터링 필요
-    async def _murf_generate(self, text: str, voice_id: str, file_path: str, language: str) -> tuple[bool, Optional[str], Optional[float]]:
-        log_prefix = f"Content: {text}, Voice: {voice_id}"
-        logger.info(f"TTS 요청 (Murf) - {log_prefix}")
-
-        if not self.murf_client:
-            logger.error("MurfAI 클라이언트가 초기화되지 않았습니다. MURF_API_KEY를 확인하세요.")
-            return False, None, None
 
+        # 파일 단위 진행 알림 (연결이 있을 때만)
+        notification_service.emit_progress(job_id, {
+            "filename": task_info["filename"],
+            "text_index": task_info["text_index"],
+            "status": task_info["status"],
+            "ncp_url": task_info.get("ncp_url"),
+            "duration": task_info.get("duration"),
+        }, _job_counters(job))
+    
+    def _murf_locale(self, language: Optional[str]) -> str:
         language_code_map_for_murf = {
                 'zh-CN': 'zh-CN', 'zh': 'zh-CN', 'zh-HK': 'zh-CN', 'zh-TW': 'zh-CN', 'chinese': 'zh-CN',
                 'ko': 'ko-KR', 'ko-KR': 'ko-KR', 'korean': 'ko-KR',
@@ -945,153 +1503,174 @@ class TTSService:
                 'en': 'en-US', 'en-US': 'en-US', 'en-UK': 'en-GB', 'english': 'en-US',
                 'es': 'es-MX', 'id': 'hi-IN', 'hi': 'hi-IN', 'fr': 'fr-FR', 'de': 'de-DE', 'it': 'it-IT'
             }
-        locale = language_code_map_for_murf.get(language.lower() if language else 'en', 'en-US')
+        return language_code_map_for_murf.get(language.lower() if language else 'en', 'en-US')
 
-        try:
-            text = ' '.join(text.split()).replace('\\"', '"')
-            max_text_length = 3000                  #api 요청 당 최대 3000자 입력 가능
-            if len(text) > max_text_length:
-                logger.warning(f"텍스트 길이 초과로 자름 - {log_prefix}")
-                text = text[:max_text_length]
-
-            async with asyncio.Semaphore(1):
-                max_attempts = 5
-                attempt = 0
-                last_error = None
-                audio_data = None
-
-                while attempt < max_attempts:
-                    attempt += 1
+    async def _murf_synthesize(
+        self, text: str, voice_id: str, locale: str, job_id: Optional[str] = None, with_timestamps: bool = False
+    ):
+        """Murf API 호출 (재시도 포함) → MP3 바이트, 실패 시 None
+        with_timestamps=True면 (MP3 바이트, 단어별 타임스탬프) 반환
+        """
+        log_prefix = f"Content: {text}, Voice: {voice_id}"
+        rate_limiter = get_rate_limiter("murf")
+        api_timeout = settings.murf_api_timeout
+
+        # 동시 호출 수는 스케줄러 슬롯(murf_tts_max_inflight, 프로세스 전역)으로 제한
+        max_attempts = 5
+        attempt = 0
+        last_error = None
+        current_audio_data = None
+
+        while attempt < max_attempts:
+            attempt += 1
+            try:
+                # 스케줄러 슬롯 → 공유 레이트 리미터 토큰 순으로 획득 후 호출
+                async with tts_scheduler.slot("murf", job_id):
+                    await rate_limiter.acquire()
+
+                    # API 호출 시간 추적
+                    api_call_start = datetime.now()
+                    logger.info(f"🌐 Murf API 호출 시작 (시도 {attempt}/{max_attempts})")
+
+                    # API 호출에만 타임아웃 적용
                     try:
-                        # API 호출 시간 추적
-                        api_call_start = datetime.now()
-                        logger.info(f"🌐 Murf API 호출 시작 (시도 {attempt}/{max_attempts})")
+                        async with asyncio.timeout(api_timeout), murf_phase_metrics.timed("api"):
+                            response = await self.murf_client.text_to_speech.generate(
+                                multi_native_locale=locale,
+                                text=text,
+                                voice_id=voice_id,
+                                encode_as_base_64=False,
+                                style="Conversational",
+                                format="MP3"
+                            )
+                    except asyncio.TimeoutError:
+                        api_call_duration = (datetime.now() - api_call_start).total_seconds()
+                        logger.error(f"❌ Murf API 호출 자체가 타임아웃 ({api_timeout:g}초)")
+                        logger.error(f"   • 실제 소요 시간: {api_call_duration:.3f}초")
+                        logger.error(f"   • 텍스트 길이: {len(text)}자")
+                        logger.error(f"   • 원인: Murf 서버 응답 지연 또는 네트워크 문제")
+                        raise
+
+                api_call_duration = (datetime.now() - api_call_start).total_seconds()
+                logger.info(f"✅ Murf API 호출 완료: {api_call_duration:.3f}초")
+                rate_limiter.record_success(api_call_duration)
+
+                # 응답 데이터 처리 시작
+                current_audio_data = None
+
+                # 1단계: base64 인코딩된 오디오 확인
+                encoded_audio = getattr(response, "encoded_audio", None)
+                if encoded_audio:
+                    current_audio_data = base64.b64decode(encoded_audio)
+                else:
+                    # 2단계: audio_file URL 다운로드
+                    audio_url = getattr(response, "audio_file", None)
+                    if not audio_url and isinstance(response, dict):
+                        audio_url = response.get("audio_file")
 
-                        # API 호출에만 타임아웃 적용 (30초)
+                    if isinstance(audio_url, str) and audio_url.startswith("http"):
                         try:
-                            async with asyncio.timeout(30):
-                                response = await self.murf_client.text_to_speech.generate(
-                                    multi_native_locale=locale,
-                                    text=text,
-                                    voice_id=voice_id,
-                                    encode_as_base_64=False,
-                                    style="Conversational",
-                                    format="MP3"
-                                )
+                            # 공유 연결 풀로 다운로드 (요청마다 TLS 핸드셰이크 없음)
+                            async with asyncio.timeout(settings.murf_download_timeout), murf_phase_metrics.timed("download"):
+                                current_audio_data = await murf_http_client.download(audio_url)
                         except asyncio.TimeoutError:
-                            api_call_duration = (datetime.now() - api_call_start).total_seconds()
-                            logger.error(f"❌ Murf API 호출 자체가 타임아웃 (30초)")
-                            logger.error(f"   • 실제 소요 시간: {api_call_duration:.3f}초")
-                            logger.error(f"   • 텍스트 길이: {len(text)}자")
-                            logger.error(f"   • 원인: Murf 서버 응답 지연 또는 네트워크 문제")
-                            raise
+                            raise ValueError(f"Audio file 다운로드 타임아웃: {audio_url}")
 
-                        api_call_duration = (datetime.now() - api_call_start).total_seconds()
-                        logger.info(f"✅ Murf API 호출 완료: {api_call_duration:.3f}초")
+                # 3단계: 최종 검증
+                if not isinstance(current_audio_data, (bytes, bytearray)):
+                    logger.error(f"❌ 오디오 데이터 획득 실패 - response 타입: {type(response)}")
+                    raise ValueError(f"Murf 응답에서 오디오 바이트를 얻지 못함 (타입: {type(current_audio_data)})")
 
-                        # 응답 데이터 처리 시작
-                        current_audio_data = None
+                # 성공: 오디오 데이터를 받았으면 루프 종료
+                logger.info(f"✅ TTS 생성 성공 (시도 {attempt}/{max_attempts}) - {log_prefix}")
+                break
 
-                        # 1단계: base64 인코딩된 오디오 확인
-                        encoded_audio = getattr(response, "encoded_audio", None)
-                        if encoded_audio:
-                            current_audio_data = base64.b64decode(encoded_audio)
-                        else:
-                            # 2단계: audio_file URL 다운로드
-                            audio_url = getattr(response, "audio_file", None)
-                            if not audio_url and isinstance(response, dict):
-                                audio_url = response.get("audio_file")
-
-                            if isinstance(audio_url, str) and audio_url.startswith("http"):
-                                try:
-                                    async with asyncio.timeout(60):
-                                        async with httpx.AsyncClient() as client:
-                                            r = await client.get(audio_url, timeout=60)
-                                            r.raise_for_status()
-                                            current_audio_data = r.content
-                                except asyncio.TimeoutError:
-                                    raise ValueError(f"Audio file 다운로드 타임아웃: {audio_url}")
-
-                        # 3단계: 최종 검증
-                        if not isinstance(current_audio_data, (bytes, bytearray)):
-                            logger.error(f"❌ 오디오 데이터 획득 실패 - response 타입: {type(response)}")
-                            raise ValueError(f"Murf 응답에서 오디오 바이트를 얻지 못함 (타입: {type(current_audio_data)})")
-
-                        # 성공: 오디오 데이터를 받았으면 루프 종료
-                        logger.info(f"✅ TTS 생성 성공 (시도 {attempt}/{max_attempts}) - {log_prefix}")
-                        break
+            except asyncio.TimeoutError:
+                last_error = asyncio.TimeoutError(f"API 호출 타임아웃 ({api_timeout:g}초)")
+                reason = f"API 타임아웃 ({api_timeout:g}초)"
+                logger.warning(f"⚠️ TTS 재시도 ({attempt}/{max_attempts}) - {log_prefix}. 사유: {reason}")
+                # 재시도 간격은 리미터가 조절
+                rate_limiter.record_timeout()
+                if attempt >= max_attempts: break
+                continue
+            except Exception as e:
+                last_error = e
+                reason = f"API 오류: {str(e)}"
+                logger.warning(f"⚠️ TTS 재시도 ({attempt}/{max_attempts}) - {log_prefix}. 사유: {reason}")
+                if attempt >= max_attempts: break
+                if is_rate_limit_error(e):
+                    # 429는 리미터 속도를 낮추고 리미터 대기로 재시도
+                    rate_limiter.record_rate_limited()
+                else:
+                    await asyncio.sleep(random.uniform(1, 3) * attempt)
+                continue
 
-                    except asyncio.TimeoutError:
-                        last_error = asyncio.TimeoutError("API 호출 타임아웃 (30초)")
-                        reason = "API 타임아웃 (30초)"
-                        logger.warning(f"⚠️ TTS 재시도 ({attempt}/{max_attempts}) - {log_prefix}. 사유: {reason}")
-                        if attempt >= max_attempts: break
-                        await asyncio.sleep(random.uniform(1, 3))
-                        continue
-                    except Exception as e:
-                        last_error = e
-                        reason = f"API 오류: {str(e)}"
-                        logger.warning(f"⚠️ TTS 재시도 ({attempt}/{max_attempts}) - {log_prefix}. 사유: {reason}")
-                        if attempt >= max_attempts: break
-                        await asyncio.sleep(random.uniform(1, 3) * attempt)
-                        continue
+        if current_audio_data is None:
+            logger.error(f"TTS 최종 실패 (Murf) - {log_prefix}. 마지막 오류: {last_error}")
+            return None
+        if with_timestamps:
+            return bytes(current_audio_data), getattr(response, "word_durations", None)
+        return bytes(current_audio_data)
 
-                if current_audio_data is None:
-                    logger.error(f"TTS 최종 실패 (Murf) - {log_prefix}. 마지막 오류: {last_error}")
-                    return (False, None, None)
+    # TODO: 기존 TTS와 병합 혹은 리팩터링 필요
+    async def _murf_generate(self, text: str, voice_id: str, file_path: str, language: str, job_id: Optional[str] = None) -> tuple[bool, Optional[str], Optional[float]]:
+        log_prefix = f"Content: {text}, Voice: {voice_id}"
+        logger.info(f"TTS 요청 (Murf) - {log_prefix}")
 
-                try:
-                    # Gemini와 동일한 NCP 경로 생성: TTS/20250110/filename.mp3
-                    bucket_name = settings.naver_bucket_name
-                    filename = os.path.basename(file_path)
-                    date_folder = datetime.now().strftime("%Y%m%d")
-                    ncp_path = f"{settings.naver_bucket_tts_folder}/{date_folder}/{filename}"
-
-                    # Duration 계산을 위해 임시로 로컬 파일 저장
-                    temp_file_path = None
-                    duration = None
-                    try:
-                        # 로컬에 임시 저장 (duration 계산용)
-                        temp_file_path = file_path  # 이미 로컬 경로가 제공됨
-                        with open(temp_file_path, 'wb') as f:
-                            f.write(current_audio_data)
-
-                        # Duration 계산
-                        duration = self._get_mp3_duration(temp_file_path)
-                        logger.info(f"🎵 MP3 duration: {duration:.2f}초" if duration else "⚠️ Duration 계산 실패")
-                    except Exception as duration_error:
-                        logger.warning(f"⚠️ Duration 계산 실패: {str(duration_error)}")
-
-                    # S3에 업로드 (public-read ACL 적용)
-                    upload_start = datetime.now()
-                    self.s3_client.upload_fileobj(
-                        BytesIO(current_audio_data),
-                        bucket_name,
-                        ncp_path,
-                        ExtraArgs={'ACL': 'public-read'}
-                    )
-                    upload_duration = (datetime.now() - upload_start).total_seconds()
+        if not self.murf_client:
+            logger.error("MurfAI 클라이언트가 초기화되지 않았습니다. MURF_API_KEY를 확인하세요.")
+            return False, None, None
 
-                    # 최종 URL 생성 (Gemini와 동일한 포맷)
-                    final_url = f"{bucket_name}/{ncp_path}"
+        locale = self._murf_locale(language)
 
-                    # Gemini와 동일한 로그 포맷
-                    logger.info(f"✅ Successfully uploaded to NCP: {final_url}")
-                    logger.info(f"☁️ NCP 업로드: {upload_duration:.3f}초")
-                    logger.info(f"TTS 성공 (Murf) - {log_prefix}, URL: {final_url}")
+        try:
+            text = ' '.join(text.split()).replace('\\"', '"')
+            max_text_length = 3000                  #api 요청 당 최대 3000자 입력 가능
 
-                    # 로컬 임시 파일 삭제
-                    if temp_file_path and os.path.exists(temp_file_path):
-                        try:
-                            os.remove(temp_file_path)
-                            logger.info(f"🗑️ 로컬 파일 삭제 완료: {temp_file_path}")
-                        except Exception as e:
-                            logger.warning(f"⚠️ 로컬 파일 삭제 실패: {temp_file_path} - {str(e)}")
-
-                    return (True, final_url, duration)
-                except Exception as s3_error:
-                    logger.error(f"S3 업로드 실패 - {log_prefix}. 오류: {str(s3_error)}")
+            cache_model = self._get_tts_model_name("murf", locale)
+            cached = await tts_audio_cache.get("murf", cache_model, voice_id, text)
+            if cached:
+                return (True, cached["ncp_url"], cached["duration"])
+
+            if len(text) > max_text_length or self._is_long_text(text):
+                # 긴 텍스트는 자르지 않고 문장 단위 청크로 나눠 동시에 합성
+                current_audio_data, _, _ = await self._synthesize_long_text(
+                    "murf", text, voice_id, job_id=job_id, locale=locale
+                )
+            else:
+                current_audio_data = await self._murf_synthesize(text, voice_id, locale, job_id)
+                if current_audio_data is None:
                     return (False, None, None)
+
+            try:
+                # Gemini와 동일한 NCP 경로 생성: TTS/20250110/filename.mp3
+                filename = os.path.basename(file_path)
+                date_folder = datetime.now().strftime("%Y%m%d")
+                ncp_path = f"{settings.naver_bucket_tts_folder}/{date_folder}/{filename}"
+
+                # Duration 계산 (메모리 상의 MP3 프레임 헤더 해석)
+                duration = get_mp3_duration(current_audio_data)
+                logger.info(f"🎵 MP3 duration: {duration:.2f}초" if duration else "⚠️ Duration 계산 실패")
+
+                # S3에 업로드 (public-read ACL 적용, 이벤트 루프 비차단)
+                upload_start = datetime.now()
+                async with murf_phase_metrics.timed("upload"):
+                    final_url = await ncp_storage.put_bytes(current_audio_data, ncp_path, content_type="audio/mpeg")
+                upload_duration = (datetime.now() - upload_start).total_seconds()
+
+                # Gemini와 동일한 로그 포맷
+                logger.info(f"✅ Successfully uploaded to NCP: {final_url}")
+                logger.info(f"☁️ NCP 업로드: {upload_duration:.3f}초")
+                logger.info(f"TTS 성공 (Murf) - {log_prefix}, URL: {final_url}")
+
+                await tts_audio_cache.put(
+                    "murf", cache_model, voice_id, text, final_url, duration,
+                    size_bytes=len(current_audio_data)
+                )
+                return (True, final_url, duration)
+            except Exception as s3_error:
+                logger.error(f"S3 업로드 실패 - {log_prefix}. 오류: {str(s3_error)}")
+                return (False, None, None)
             
         except Exception as e:
             logger.exception(f"Murf TTS 처리 중 심각한 오류 - {log_prefix}. 오류: {str(e)}")
@@ -1134,22 +1713,6 @@ class TTSService:
                 logger.info(f"▶️ Job {job_id} resumed due to connection recovery")
                 break
     
-    async def _background_connection_monitor(self, job_id: str, batch_idx: int):
-        """백그라운드 연결 모니터링 (비동기, 논블로킹)"""
-        try:
-            # 빠른 연결 상태만 확인 (상세 정보 없이)
-            has_connections = await notification_service.has_active_connections(job_id)
-            
-            if not has_connections:
-                logger.warning(f"⚠️ 배치 {batch_idx + 1}: 활성 연결 없음 (백그라운드 감지)")
-            else:
-                # 연결이 있을 때만 간단히 로깅 (선택적)
-                logger.debug(f"💓 배치 {batch_idx + 1}: 연결 상태 양호")
-                
-        except Exception as e:
-            # 백그라운드 모니터링 실패해도 메인 작업에 영향 없음
-            logger.warning(f"⚠️ 배치 {batch_idx + 1}: 백그라운드 연결 확인 실패 - {str(e)}")
-
     async def _perform_connection_health_check(self, job_id: str):
         """연결 상태 건강성 확인 (상세 정보 포함)"""
         job = self.jobs[job_id]
@@ -1176,53 +1739,6 @@ class TTSService:
         else:
             logger.error(f"❌ No connection health info for job {job_id}")
     
-    async def _optimized_batch_delay(self, job_id: str, batch_idx: int):
-        """최적화된 배치 간 대기 시간 (성능 개선)"""
-        delay_start = datetime.now()
-        
-        # 429 에러 방지를 위한 최소 대기 시간
-        base_delay = 1.0
-        
-        # 연결 상태 확인 (캐시된 결과 사용으로 성능 향상)
-        has_connections = await self._cached_connection_check(job_id)
-        
-        if has_connections:
-            # 연결이 있으면 최소 대기
-            await asyncio.sleep(base_delay)
-        else:
-            await asyncio.sleep(base_delay * 2)
-        
-        delay_duration = (datetime.now() - delay_start).total_seconds()
-        logger.debug(f"⏰ 배치 간 대기 완료: {delay_duration:.3f}초")
-
-    async def _cached_connection_check(self, job_id: str) -> bool:
-        """캐시된 연결 상태 확인 (성능 최적화)"""
-        # 캐시 시간: 5초 (기존 10초에서 단축)
-        if not hasattr(self, '_connection_cache'):
-            self._connection_cache = {}
-        
-        current_time = datetime.now()
-        cache_key = job_id
-        
-        # 캐시된 결과가 있고 5초 이내면 재사용
-        if (cache_key in self._connection_cache and 
-            (current_time - self._connection_cache[cache_key]['timestamp']).total_seconds() < 5):
-            return self._connection_cache[cache_key]['has_connections']
-        
-        # 캐시가 없거나 만료된 경우 새로 확인
-        has_connections = await notification_service.has_active_connections(job_id)
-        self._connection_cache[cache_key] = {
-            'has_connections': has_connections,
-            'timestamp': current_time
-        }
-        
-        return has_connections
-
-    async def _smart_delay_with_connection_check(self, job_id: str, base_delay: float):
-        """연결 상태를 확인하면서 지능적으로 대기 (429 에러 방지 포함) - 호환성 유지"""
-        # 기존 함수 호환성을 위해 유지하되, 최적화된 로직 사용
-        await self._optimized_batch_delay(job_id, 0)
-    
     async def _generate_single_file(
         self,
         text: str,
@@ -1244,13 +1760,13 @@ class TTSService:
             logger.info(f"⏱️ 파일 생성 시작: {task_info['filename']} at {start_time.strftime('%H:%M:%S.%f')[:-3]}")
 
             # 파일 처리 시작 알림 (연결이 있을 때만)
-            if await notification_service.has_active_connections(job_id):
-                await notification_service.notify_job_progress(job_id, {
-                    "filename": task_info["filename"],
-                    "status": "processing",
-                    "text": text[:50] + "..." if len(text) > 50 else text,
-                    "voice": voice
-                })
+            notification_service.emit_progress(job_id, {
+                "filename": task_info["filename"],
+                "text_index": task_info["text_index"],
+                "status": "processing",
+                "text": text[:50] + "..." if len(text) > 50 else text,
+                "voice": voice
+            }, _job_counters(job))
 
             # Rich Text 태그 제거
             clean_text = strip_rich_text_tags(text)
@@ -1263,7 +1779,21 @@ class TTSService:
             ncp_url = None
             is_rate_limit = False
 
-            if tts_provider == "murf":
+            # 동일 문장이 이미 생성되어 있으면 provider 호출/업로드 생략 (Murf는 _murf_generate에서 처리)
+            cached = None
+            result_provider = "openai" if tts_provider == "openai" else "gemini"
+            result_voice = voice
+            if tts_provider != "murf":
+                cached = await tts_audio_cache.get(
+                    result_provider, self._get_tts_model_name(result_provider), voice, clean_text
+                )
+
+            if cached:
+                success = True
+                ncp_url = cached["ncp_url"]
+                task_info["duration"] = cached["duration"]
+                task_info["cached"] = True
+            elif tts_provider == "murf":
                 logger.info(f"🎤 Murf TTS로 생성 중...")
                 # Murf로 생성
                 language = job.get("language", "en")  # 기본값 en
@@ -1271,45 +1801,94 @@ class TTSService:
                     text=clean_text,
                     voice_id=voice,
                     file_path=file_path,
-                    language=language
+                    language=language,
+                    job_id=job_id
                 )
                 # Duration을 task_info에 저장
                 if success and duration:
                     task_info["duration"] = duration
+            elif self._is_long_text(clean_text):
+                # 긴 문단은 헤지 대신 문장 단위 청크 동시 합성으로 지연을 제한 (Gemini 429면 OpenAI로 전환)
+                openai_voice = self._select_openai_voice_by_gender(gender_hint)
+                new_filename = self._generate_filename(task_info["text_index"], openai_voice, gender_hint)
+                new_file_path = os.path.join(os.path.dirname(file_path), new_filename)
+                success, ncp_url, duration, chunks, fell_back = await self._generate_long_tts(
+                    result_provider, clean_text, voice, file_path, job_id=job_id,
+                    fallback=(openai_voice, new_file_path)
+                )
+                if fell_back:
+                    # task_info 업데이트 (헤지/429 전환과 동일)
+                    task_info["voice"] = openai_voice
+                    task_info["filename"] = new_filename
+                    task_info["file_path"] = new_file_path
+                    task_info["gender_hint"] = self._get_clean_gender_value(gender_hint)
+                    result_provider = "openai"
+                    result_voice = openai_voice
+                task_info["duration"] = duration
+                if chunks:
+                    task_info["chunks"] = chunks
             elif tts_provider == "openai":
                 logger.info(f"🤖 OpenAI TTS로 생성 중...")
                 # OpenAI로 생성
-                success, ncp_url = await self.openai_repo.generate_tts(
-                    text=clean_text,
-                    voice=voice,
-                    filename=file_path
-                )
+                async with tts_scheduler.slot("openai", job_id):
+                    success, ncp_url, duration = await self.openai_repo.generate_tts(
+                        text=clean_text,
+                        voice=voice,
+                        filename=file_path,
+                        with_duration=True
+                    )
+                task_info["duration"] = duration
             else:  # gemini (기본값)
                 logger.info(f"🌟 Gemini TTS로 생성 중...")
-                # Gemini로 생성 (기존 로직)
-                success, ncp_url, is_rate_limit = await self.gemini_repo.generate_tts(
-                    text=clean_text,
-                    voice=voice,  # 이미 문자열임
-                    filename=file_path,
-                    gender_hint=gender_hint
+                # 요청된 성별 힌트에 맞는 OpenAI 보이스 (헤지 요청/429 전환용)
+                openai_voice = self._select_openai_voice_by_gender(gender_hint)
+                new_filename = self._generate_filename(task_info["text_index"], openai_voice, gender_hint)
+                new_file_path = os.path.join(os.path.dirname(file_path), new_filename)
+
+                async def _gemini_call(mark_started=None):
+                    async with tts_scheduler.slot("gemini", job_id):
+                        return await self.gemini_repo.generate_tts(
+                            text=clean_text,
+                            voice=voice,  # 이미 문자열임
+                            filename=file_path,
+                            gender_hint=gender_hint,
+                            with_duration=True,
+                            on_started=mark_started
+                        )
+
+                async def _openai_call(mark_started=None):
+                    async with tts_scheduler.slot("openai", job_id):
+                        openai_success, openai_url, openai_duration = await self.openai_repo.generate_tts(
+                            text=clean_text,
+                            voice=openai_voice,
+                            filename=new_file_path,
+                            with_duration=True,
+                            on_started=mark_started
+                        )
+                    return openai_success, openai_url, False, openai_duration
+
+                # Gemini가 최근 응답 시간 분위수 안에 끝나지 않으면 OpenAI도 호출해 먼저 성공한 결과 사용
+                winner, result, hedged = await hedged_request(
+                    "gemini", "openai", self._get_clean_gender_value(gender_hint),
+                    _gemini_call, _openai_call, is_success=lambda r: r[0]
                 )
+                success, ncp_url, is_rate_limit, duration = result
 
-                if not success and is_rate_limit:
+                # 헤지로 OpenAI가 이미 시도됐다면 같은 파일에 대해 다시 호출하지 않음
+                if winner == "primary" and not success and is_rate_limit and not hedged:
                     logger.warning("↩️ Falling back to OpenAI TTS due to Gemini 429")
-                    # 요청된 성별 힌트에 맞는 OpenAI 보이스 선택
-                    openai_voice = self._select_openai_voice_by_gender(gender_hint)
-                    new_filename = self._generate_filename(task_info["text_index"], openai_voice, gender_hint)
-                    new_file_path = os.path.join(os.path.dirname(file_path), new_filename)
+                    winner = "secondary"
+                    success, ncp_url, is_rate_limit, duration = await _openai_call()
+
+                if winner == "secondary":
                     # task_info 업데이트
                     task_info["voice"] = openai_voice
                     task_info["filename"] = new_filename
                     task_info["file_path"] = new_file_path
                     task_info["gender_hint"] = self._get_clean_gender_value(gender_hint)
-                    success, ncp_url = await self.openai_repo.generate_tts(
-                        text=clean_text,
-                        voice=openai_voice,
-                        filename=new_file_path
-                    )
+                    result_provider = "openai"
+                    result_voice = openai_voice
+                task_info["duration"] = duration
 
             api_end = datetime.now()
             api_duration = (api_end - api_start).total_seconds()
@@ -1337,187 +1916,132 @@ class TTSService:
                 task_info["end_time"] = datetime.now().isoformat()
                 task_info["ncp_url"] = ncp_url
 
-                # MP3 파일의 duration 계산 (Murf는 이미 계산됨)
-                if tts_provider != "murf":
-                    file_path = task_info.get("file_path", "")
-                    if file_path and os.path.exists(file_path):
-                        duration = self._get_mp3_duration(file_path)
-                        task_info["duration"] = duration
-
-                        # NCP 업로드 성공 후 로컬 파일 삭제
-                        try:
-                            os.remove(file_path)
-                            logger.info(f"🗑️ 로컬 파일 삭제 완료: {file_path}")
-                        except Exception as e:
-                            logger.warning(f"⚠️ 로컬 파일 삭제 실패: {file_path} - {str(e)}")
-                    else:
-                        task_info["duration"] = None
-                # Murf는 _murf_generate()에서 이미 duration을 계산하여 task_info에 저장함
+                # duration은 각 repository가 메모리 상의 MP3에서 계산하여 반환함
+                if tts_provider != "murf" and not cached:
+                    await tts_audio_cache.put(
+                        result_provider, self._get_tts_model_name(result_provider), result_voice,
+                        clean_text, ncp_url, task_info.get("duration")
+                    )
 
                 job["completed_files"] += 1
                 
                 # 파일 완료 알림 (연결이 있을 때만)
-                if await notification_service.has_active_connections(job_id):
-                    await notification_service.notify_job_progress(job_id, {
-                        "filename": task_info["filename"],
-                        "status": "completed",
-                        # "download_url": f"/api/v1/tts/download/{task_info['filename']}"
-                    })
+                notification_service.emit_progress(job_id, {
+                    "filename": task_info["filename"],
+                    "text_index": task_info["text_index"],
+                    "status": "completed",
+                    "ncp_url": ncp_url,
+                    "duration": task_info.get("duration"),
+                    # "download_url": f"/api/v1/tts/download/{task_info['filename']}"
+                }, _job_counters(job))
             else:
                 task_info["status"] = "failed"
                 task_info["end_time"] = datetime.now().isoformat()
                 job["failed_files"] += 1
                 
                 # 파일 실패 알림 (연결이 있을 때만)
-                if await notification_service.has_active_connections(job_id):
-                    await notification_service.notify_job_progress(job_id, {
-                        "filename": task_info["filename"],
-                        "status": "failed",
-                        "error": "TTS 생성 실패"
-                    })
+                notification_service.emit_progress(job_id, {
+                    "filename": task_info["filename"],
+                    "text_index": task_info["text_index"],
+                    "status": "failed",
+                    "error": "TTS 생성 실패"
+                }, _job_counters(job))
                 
         except Exception as e:
-            error_str = str(e).lower()
-            is_rate_limit = (
-                "429" in error_str or 
-                "rate limit" in error_str or 
-                "too many requests" in error_str or
-                "quota exceeded" in error_str
-            )
+            is_rate_limit = is_rate_limit_error(e)
             
             task_info["status"] = "failed"
             task_info["end_time"] = datetime.now().isoformat()
             task_info["error"] = str(e)
             job["failed_files"] += 1
             
-            # 429 에러인 경우 추가 대기 시간 적용
+            # 429 에러인 경우 고정 대기 대신 공유 리미터에 반영 (다른 작업들도 함께 속도 조절)
             if is_rate_limit:
-                logger.warning(f"⚠️ Rate limit error detected for {task_info['filename']}, applying additional delay...")
-                await asyncio.sleep(settings.tts_rate_limit_delay)  # 설정된 대기 시간
+                logger.warning(f"⚠️ Rate limit error detected for {task_info['filename']}, slowing down shared limiter...")
+                get_rate_limiter(job.get("tts_provider", "gemini")).record_rate_limited()
             
             # 파일 에러 알림 (연결이 있을 때만)
-            if await notification_service.has_active_connections(job_id):
-                await notification_service.notify_job_progress(job_id, {
-                    "filename": task_info["filename"],
-                    "status": "failed",
-                    "error": str(e),
-                    "is_rate_limit": is_rate_limit
-                })
+            notification_service.emit_progress(job_id, {
+                "filename": task_info["filename"],
+                "text_index": task_info["text_index"],
+                "status": "failed",
+                "error": str(e),
+                "is_rate_limit": is_rate_limit
+            }, _job_counters(job))
             
             logger.error(f"❌ Single file generation failed: {str(e)}")
     
     async def _notify_job_status_change(self, job_id: str):
-        """작업 상태 변경 알림 (연결 상태 확인 포함)"""
-        job_status = self.get_job_status(job_id)
-        if job_status and await notification_service.has_active_connections(job_id):
-            await notification_service.broadcast_job_update(job_id, job_status)
+        """작업 상태 변경 알림 (카운터만 이벤트 버스에 전달, 파일 목록은 스냅샷 요청 시에만)"""
+        job = await self.jobs.aget(job_id)
+        if job is not None:
+            notification_service.emit_job_update(job_id, _job_counters(job))
     
     async def _notify_job_completion(self, job_id: str):
         """작업 완료 알림 (연결 상태 확인 포함)"""
-        job_status = self.get_job_status(job_id)
-        if job_status:
+        job = await self.jobs.aget(job_id)
+        if job is not None:
             # 완료 알림은 연결이 없어도 시도 (재연결 시 받을 수 있도록)
-            await notification_service.notify_job_completion(job_id, job_status)
+            await notification_service.notify_job_completion(job_id, _job_counters(job))
     
-    def pause_job(self, job_id: str) -> bool:
-        """작업 일시 중단"""
-        if job_id in self.jobs:
-            self.jobs[job_id]["paused"] = True
-            logger.info(f"⏸️ Job {job_id} paused")
-            return True
-        return False
+    async def pause_job(self, job_id: str) -> bool:
+        """작업 일시 중단 (다른 워커가 실행 중이면 브로커로 전달)"""
+        if not await self.jobs.acontains(job_id):
+            return False
+        notification_service.send_job_control(job_id, "pause")
+        return True
     
-    def resume_job(self, job_id: str) -> bool:
-        """작업 재개"""
-        if job_id in self.jobs:
-            self.jobs[job_id]["paused"] = False
-            logger.info(f"▶️ Job {job_id} resumed")
-            return True
-        return False
+    async def resume_job(self, job_id: str) -> bool:
+        """작업 재개 (다른 워커가 실행 중이면 브로커로 전달)"""
+        if not await self.jobs.acontains(job_id):
+            return False
+        notification_service.send_job_control(job_id, "resume")
+        return True
     
-    def _check_ffprobe_available(self) -> bool:
-        """ffprobe 사용 가능 여부 확인 (캐시됨)"""
-        if not hasattr(self, '_ffprobe_checked'):
-            try:
-                result = subprocess.run(['ffprobe', '-version'], 
-                                      capture_output=True, text=True, timeout=5)
-                self._ffprobe_available = result.returncode == 0
-                if self._ffprobe_available:
-                    logger.info("✅ ffprobe 사용 가능")
-                else:
-                    logger.error("❌ ffprobe 사용 불가")
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                self._ffprobe_available = False
-                logger.error("❌ ffprobe 설치되지 않음")
-            self._ffprobe_checked = True
-        return self._ffprobe_available
-
-    def _get_mp3_duration_ffmpeg(self, file_path: str) -> Optional[float]:
-        """ffprobe를 사용한 정확한 duration 계산 (우선순위)"""
-        if not self._check_ffprobe_available():
-            return None
-            
-        if not os.path.exists(file_path):
-            logger.warning(f"⚠️ MP3 파일을 찾을 수 없음: {file_path}")
-            return None
-            
-        try:
-            import time
-            exec_start = time.time()
-
-            # ffprobe 명령어로 정확한 duration 추출
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-show_entries',
-                'format=duration', '-of', 'csv=p=0', file_path
-            ], capture_output=True, text=True, timeout=10)
-
-            exec_time = time.time() - exec_start
+    async def stitch_chapter(self, job_id: str) -> Dict[str, Any]:
+        """완료된 배치/연극 작업의 파일들을 챕터 MP3 하나로 이어 붙이고 오프셋 표와 함께 업로드
 
-            if result.returncode == 0 and result.stdout.strip():
-                duration = float(result.stdout.strip())
-                logger.info(f"🎯 ffprobe duration: {duration:.2f}초")
-
-                return round(duration, 2)
-            else:
-                stderr_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                logger.error(f"⚠️ ffprobe 실행 실패: {stderr_msg} (실행시간: {exec_time:.3f}초)")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            logger.error(f"⚠️ ffprobe timeout: {file_path}")
-            return None
+        이미 생성된 챕터가 있으면 그대로 반환합니다. 작업이 없으면 KeyError, 완료 전이면 ValueError.
+        """
+        job = await self.jobs.aget(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if job["status"] != TTSJobStatus.COMPLETED:
+            raise ValueError(f"Job {job_id} is not completed (status: {job['status'].value})")
+        if job.get("chapter"):
+            return job["chapter"]
+
+        task = _chapter_tasks.get(job_id)
+        if task is None:
+            task = asyncio.create_task(self._build_chapter(job_id, job))
+            _chapter_tasks[job_id] = task
+            task.add_done_callback(lambda _: _chapter_tasks.pop(job_id, None))
+        # 요청 하나가 끊겨도 다른 대기자를 위해 생성은 계속 진행
+        return await asyncio.shield(task)
+
+    async def _build_chapter(self, job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        folder = settings.naver_bucket_play_folder if job.get("kind") == "play" else settings.naver_bucket_tts_folder
+        chapter = await chapter_stitcher.stitch(job_id, list(job["files"]), SILENT_AUDIO_URL, folder)
+        job["chapter"] = chapter
+        await self.jobs.save_detached(job_id, job)
+        return chapter
+
+    async def _auto_stitch_chapter(self, job_id: str):
+        """작업 완료 직후 챕터 자동 생성 (설정 시, 실패해도 작업 결과에는 영향 없음)"""
+        if not settings.tts_chapter_auto_stitch:
+            return
+        try:
+            await self.stitch_chapter(job_id)
         except Exception as e:
-            logger.error(f"⚠️ ffprobe duration 계산 오류: {str(e)}")
-            return None
+            logger.warning(f"⚠️ 챕터 자동 생성 실패 (job {job_id}): {str(e)}")
 
-    def _get_mp3_duration(self, file_path: str) -> Optional[float]:
-        """MP3 파일의 재생 시간을 초 단위로 계산 (ffprobe만 사용)"""
-        import time
-
-        calc_start = time.time()
-        logger.info(f"🔍 Duration 계산 시작: {os.path.basename(file_path)}")
-
-        # ffprobe로 duration 계산
-        ffprobe_start = time.time()
-        duration = self._get_mp3_duration_ffmpeg(file_path)
-        if duration is not None:
-            ffprobe_time = time.time() - ffprobe_start
-            total_time = time.time() - calc_start
-            logger.info(f"⏰ Duration 계산 완료 (ffprobe): {ffprobe_time:.3f}초 (총 {total_time:.3f}초)")
-            return duration
-
-        total_time = time.time() - calc_start
-        logger.error(f"❌ Duration 계산 실패 (ffprobe 사용 불가): {total_time:.3f}초 소요")
-        return None
-    
-    def get_job_status(self, job_id: str) -> Optional[JobStatusResponse]:
+    async def get_job_status(self, job_id: str) -> Optional[JobStatusResponse]:
         """작업 상태 조회 (연결 정보 포함)"""
         
-        if job_id not in self.jobs:
+        job = await self.jobs.aget(job_id)
+        if job is None:
             return None
         
-        job = self.jobs[job_id]
-        
         progress = 0.0
         if job["total_files"] > 0:
             progress = (job["completed_files"] + job["failed_files"]) / job["total_files"]
@@ -1532,28 +2056,56 @@ class TTSService:
             total_files=job["total_files"],
             completed_files=job["completed_files"],
             failed_files=job["failed_files"],
-            files=job["files"]
+            files=job["files"],
+            dedup=job.get("dedup"),
+            chapter=job.get("chapter")
         )
     
-    def get_all_jobs(self) -> List[Dict[str, Any]]:
-        """모든 작업 상태 조회"""
-        
-        result = []
-        for job_id, job in self.jobs.items():
-            progress = 0.0
-            if job["total_files"] > 0:
-                progress = (job["completed_files"] + job["failed_files"]) / job["total_files"]
-            
-            result.append({
-                "job_id": job_id,
-                "status": job["status"],
-                "progress": progress,
-                "total_files": job["total_files"],
-                "completed_files": job["completed_files"],
-                "failed_files": job["failed_files"],
-                "start_time": job["start_time"].isoformat(),
-                "paused": job.get("paused", False),
-                "connection_checks": job.get("connection_checks", 0)
-            })
-        
-        return result
\ No newline at end of file
+    async def get_all_jobs(self, limit: int = 100, offset: int = 0, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """작업 상태 목록 조회 (최신순, 저장소 인덱스 조회를 스레드에서 실행)"""
+        return await asyncio.to_thread(self.jobs.list_jobs, limit=limit, offset=offset, status=status)
+
+    def _prepare_resumed_files(self, job: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """재개 작업이면 파일 목록을 정리해 반환 (새 작업이면 None)
+
+        완료된 파일은 그대로 두고, 나머지는 pending으로 되돌려 다시 생성합니다.
+        """
+        files = job.get("files") or []
+        if not files or len(files) != job["total_files"]:
+            job["files"] = []
+            return None
+
+        files.sort(key=lambda f: f["text_index"])
+        for task_info in files:
+            if task_info.get("status") != "completed":
+                task_info["status"] = "pending"
+                task_info.pop("error", None)
+        job["completed_files"] = sum(1 for f in files if f["status"] == "completed")
+        job["failed_files"] = 0
+        logger.info(f"♻️ 작업 재개 - 완료 {job['completed_files']}개 건너뜀, 남은 파일 {len(files) - job['completed_files']}개")
+        return files
+
+    async def resume_unfinished_jobs(self) -> int:
+        """재시작 전에 끝나지 않은 작업을 이어서 처리 (앱 시작 시 호출)"""
+        job_ids = await asyncio.to_thread(self.jobs.load_unfinished)
+        for job_id in job_ids:
+            job = self.jobs[job_id]
+            job["paused"] = False
+            if job.get("kind") == "play":
+                asyncio.create_task(self._process_play_tts(job_id))
+            else:
+                asyncio.create_task(self._process_batch_tts(job_id))
+        if job_ids:
+            logger.info(f"♻️ 미완료 TTS 작업 {len(job_ids)}개 재개")
+        return len(job_ids)
+
+    async def run_job_lease_heartbeat(self):
+        """멀티 워커: 소유 작업의 lease를 주기적으로 갱신하고, lease가 끊긴(죽은 워커) 작업을 이어받음"""
+        interval = max(1.0, self.jobs.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.jobs.renew_leases)
+                await self.resume_unfinished_jobs()
+            except Exception as e:
+                logger.warning(f"⚠️ TTS 작업 lease 갱신 실패: {str(e)}")
@@ -0,0 +1,125 @@
+import asyncio
+import math
+import time
+from typing import Dict, Any, Optional, Callable, Hashable, List
+
+# 로깅 설정
+from app.utils.logger.setup import setup_logger
+logger = setup_logger('heartbeat_wheel')
+
+# callback(now) → 다음 실행까지 간격(초), None이면 타이머 종료
+TimerCallback = Callable[[float], Optional[float]]
+
+
+class _Timer:
+    __slots__ = ("rounds", "callback")
+
+    def __init__(self, rounds: int, callback: TimerCallback):
+        self.rounds = rounds
+        self.callback = callback
+
+
+class TimerWheel:
+    """해시 타이머 휠 - 모든 연결의 하트비트/유휴 검사를 태스크 하나로 처리
+
+    연결마다 asyncio 태스크와 타이머를 두는 대신, tick마다 현재 슬롯에 걸린
+    타이머만 실행합니다. 등록/취소는 O(1), tick 비용은 그 슬롯의 타이머 수에 비례합니다.
+    콜백은 동기 함수로 짧게 끝나야 합니다 (송신 큐에 넣기 등).
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512):
+        self.tick = tick
+        self.slots = slots
+
+        self._wheel: List[Dict[Hashable, _Timer]] = [{} for _ in range(slots)]
+        self._index: Dict[Hashable, int] = {}
+        self._cursor = 0
+        self._task: Optional[asyncio.Task] = None
+        self._loop = None
+
+        # 통계
+        self._ticks = 0
+        self._fired = 0
+        self._tick_cost_total = 0.0
+        self._tick_cost_max = 0.0
+        self._max_fired_per_tick = 0
+        self._max_lag = 0.0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def schedule(self, key: Hashable, delay: float, callback: TimerCallback):
+        """delay초 뒤에 callback 실행 (같은 key가 있으면 교체)"""
+        self.cancel(key)
+        self._insert(key, delay, callback)
+        self._ensure_running()
+
+    def cancel(self, key: Hashable):
+        slot = self._index.pop(key, None)
+        if slot is not None:
+            self._wheel[slot].pop(key, None)
+
+    def _insert(self, key: Hashable, delay: float, callback: TimerCallback):
+        ticks = max(1, math.ceil(delay / self.tick))
+        slot = (self._cursor + ticks) % self.slots
+        self._wheel[slot][key] = _Timer((ticks - 1) // self.slots, callback)
+        self._index[key] = slot
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        next_tick = time.monotonic() + self.tick
+        while self._index:
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            now = time.monotonic()
+            self._max_lag = max(self._max_lag, now - next_tick)
+            # 루프가 크게 밀렸으면 밀린 tick만큼 한 번에 처리
+            while next_tick <= now:
+                self._advance(now)
+                next_tick += self.tick
+
+    def _advance(self, now: float):
+        started = time.perf_counter()
+        self._cursor = (self._cursor + 1) % self.slots
+        slot = self._wheel[self._cursor]
+        fired = 0
+
+        for key, timer in list(slot.items()):
+            if timer.rounds > 0:
+                timer.rounds -= 1
+                continue
+            del slot[key]
+            del self._index[key]
+            fired += 1
+            try:
+                next_delay = timer.callback(now)
+            except Exception as e:
+                logger.error(f"❌ Heartbeat timer callback failed ({key}): {str(e)}")
+                continue
+            if next_delay is not None and key not in self._index:
+                self._insert(key, next_delay, timer.callback)
+
+        cost = time.perf_counter() - started
+        self._ticks += 1
+        self._fired += fired
+        self._tick_cost_total += cost
+        self._tick_cost_max = max(self._tick_cost_max, cost)
+        self._max_fired_per_tick = max(self._max_fired_per_tick, fired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tick": self.tick,
+            "slots": self.slots,
+            "timers": len(self._index),
+            "running": self._task is not None and not self._task.done(),
+            "ticks": self._ticks,
+            "fired": self._fired,
+            "max_fired_per_tick": self._max_fired_per_tick,
+            "avg_tick_cost_ms": round(self._tick_cost_total / self._ticks * 1000, 3) if self._ticks else 0.0,
+            "max_tick_cost_ms": round(self._tick_cost_max * 1000, 3),
+            "max_tick_lag_ms": round(self._max_lag * 1000, 3),
+        }
@@ -1,52 +1,397 @@
-from typing import Dict, Set, Any, Optional
+from typing import Dict, Set, Any, Optional, List, Callable, Deque
 import asyncio
 import time
+from collections import deque
 from datetime import datetime
 from fastapi import WebSocket
-from app.models.voice.tts import JobStatusResponse
+from app.config import settings
+from app.services.voice.tts.broker import notification_broker, ControlHandler
+from app.services.voice.tts.heartbeat import TimerWheel
 
 # 로깅 설정
 from app.utils.logger.setup import setup_logger
 logger = setup_logger('notification')
 
+# job_id → 전체 상태 스냅샷 (type="snapshot", 파일 목록 포함) 또는 None
+SnapshotProvider = Callable[[str], Optional[Dict[str, Any]]]
+# 큐가 가득 차도 재동기화를 일으키지 않고 버려도 되는 메시지
+_DROPPABLE_TYPES = ("heartbeat", "server_ping")
+# 큐가 넘쳐 변경분을 버리더라도 반드시 전달해야 하는 메시지
+_TERMINAL_TYPES = ("completion",)
+# compact 스냅샷에 남기는 파일 필드
+_COMPACT_FILE_KEYS = ("text_index", "status", "ncp_url", "duration")
+# WebSocket 송신 작업에 소켓을 닫으라고 알리는 내부 메시지
+_CLOSE_MARKER = {"type": "_close"}
+
+
+class _ClientState:
+    """연결 하나의 하트비트 상태 (타이머 휠에서 사용)"""
+    __slots__ = ("job_id", "kind", "queue", "connected_at", "last_seen", "interval", "max_idle")
+
+    def __init__(self, job_id: str, kind: str, queue: asyncio.Queue, interval: float, max_idle: float):
+        self.job_id = job_id
+        self.kind = kind
+        self.queue = queue
+        self.connected_at = time.time()
+        self.last_seen = self.connected_at
+        self.interval = interval
+        self.max_idle = max_idle
+
+
 class NotificationService:
-    """실시간 알림을 위한 서비스 (WebSocket, SSE) - 하트비트 개선"""
+    """실시간 알림을 위한 서비스 (WebSocket, SSE) - 하트비트 개선
     
-    def __init__(self):
+    - 파일 진행 이벤트는 작업별로 짧은 구간(notification_coalesce_ms) 동안 모아
+      변경된 파일 + 카운터만 담은 job_update(delta) 한 건으로 전송합니다.
+    - 클라이언트마다 크기가 제한된 큐를 두고 바로 넣기만 하므로 느린 클라이언트가
+      작업 처리를 막지 않습니다. 큐가 넘치면 쌓인 변경분 대신 전체 스냅샷을 보냅니다.
+    - 멀티 워커에서는 브로커를 통해 다른 워커에 연결된 클라이언트에게도 메시지를 전달합니다.
+    - 하트비트/유휴 검사는 연결별 태스크 대신 타이머 휠 하나가 모든 연결을 처리합니다.
+    - seq가 붙은 메시지는 작업별 링 버퍼에 보관되어, SSE 재연결 시 Last-Event-ID 이후분만 재전송합니다.
+    """
+    
+    def __init__(self, broker=None):
         # WebSocket 연결 관리
         self.websocket_connections: Dict[str, Set[WebSocket]] = {}
-        # SSE 연결 관리  
+        # WebSocket별 송신 큐와 송신 작업
+        self._ws_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._ws_senders: Dict[WebSocket, asyncio.Task] = {}
+        # SSE 연결 관리
         self.sse_connections: Dict[str, Set[asyncio.Queue]] = {}
         # 연결 상태 추적
         self.connection_health: Dict[str, Dict[str, Any]] = {}
-        # 하트비트 작업 관리
-        self.heartbeat_tasks: Dict[str, asyncio.Task] = {}
-        
-    def _calculate_heartbeat_interval(self, job_id: str, total_files: int = 0) -> int:
-        """배치 크기와 처리 시간에 따른 적응적 하트비트 간격 계산"""
-        if total_files == 0:
-            return 15  # 기본값
-        
-        # 파일 수에 따른 동적 간격 (최소 10초, 최대 30초)
-        base_interval = min(30, max(10, total_files // 2))
+        # 하트비트 관리 (WebSocket 또는 SSE 큐 → 연결 상태)
+        self.wheel = TimerWheel(tick=settings.notification_heartbeat_tick)
+        self._clients: Dict[Any, _ClientState] = {}
+        # 워커 간 메시지/제어 브로커
+        self.broker = broker or notification_broker
+        self.broker.set_handlers(self._on_broker_message, self._on_broker_control)
+        self._control_handlers: List[ControlHandler] = []
+        self._snapshot_provider: Optional[SnapshotProvider] = None
+        
+        # 이벤트 병합 (job_id → 대기 중인 변경분)
+        self.coalesce_window = settings.notification_coalesce_ms / 1000
+        self.client_queue_size = settings.notification_client_queue_size
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._seq: Dict[str, int] = {}
+        # 재연결 재전송용 작업별 링 버퍼 (seq가 연속인 메시지만 보관)
+        self.replay_buffer_size = settings.notification_replay_buffer_size
+        self._history: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._unobserved: Set[str] = set()
+        
+        # 통계
+        self._events = 0
+        self._flushed = 0
+        self._dropped = 0
+        self._resyncs = 0
+    
+    async def start(self):
+        """브로커 연결 시작 (앱 시작 시 호출)"""
+        await self.broker.start()
+    
+    async def stop(self):
+        """브로커 연결 종료 (앱 종료 시 호출)"""
+        for job_id in list(self._pending):
+            self._flush_job(job_id)
+        await self.broker.stop()
+    
+    def register_control_handler(self, handler: ControlHandler):
+        """작업 제어 핸들러 등록 - handler(job_id, action)는 이 워커에서 처리했으면 True"""
+        self._control_handlers.append(handler)
+    
+    def register_snapshot_provider(self, provider: SnapshotProvider):
+        """재동기화/요청 시 보낼 전체 상태 스냅샷 생성 함수 등록"""
+        self._snapshot_provider = provider
+    
+    def build_snapshot(self, job_id: str, compact: bool = False) -> Optional[Dict[str, Any]]:
+        """작업 전체 상태 스냅샷 (파일 목록 포함, compact면 파일별 핵심 필드만)"""
+        if self._snapshot_provider is None:
+            return None
+        snapshot = self._snapshot_provider(job_id)
+        if snapshot is not None:
+            snapshot["seq"] = self._seq.get(job_id, 0)
+            if compact:
+                snapshot["compact"] = True
+                snapshot["files"] = [
+                    {key: f.get(key) for key in _COMPACT_FILE_KEYS} for f in snapshot.get("files", [])
+                ]
+        return snapshot
+    
+    def send_job_control(self, job_id: str, action: str) -> bool:
+        """작업 제어(pause/resume) - 로컬에서 처리하지 못하면 다른 워커로 전달"""
+        if self._on_broker_control(job_id, action):
+            return True
+        self.broker.send_control(job_id, action)
+        return False
+    
+    def _on_broker_control(self, job_id: str, action: str) -> bool:
+        return any(handler(job_id, action) for handler in self._control_handlers)
+    
+    async def _on_broker_message(self, job_id: str, message: Dict[str, Any]):
+        """다른 워커에서 발행된 작업 메시지를 이 워커의 로컬 연결에 전달"""
+        if "seq" in message:
+            self._seq[job_id] = max(self._seq.get(job_id, 0), message["seq"])
+            self._record(job_id, message)
+        self._deliver_local(job_id, message)
+        if message.get("type") == "completion":
+            self._schedule_cleanup_after_completion(job_id)
+    
+    def _has_local_connections(self, job_id: str) -> bool:
+        return bool(self.websocket_connections.get(job_id)) or bool(self.sse_connections.get(job_id))
+    
+    def _is_watched(self, job_id: str) -> bool:
+        return self._has_local_connections(job_id) or self.broker.has_remote_subscribers(job_id)
+    
+    # ------------------------------------------------------------------
+    # 클라이언트 큐 (논블로킹 전송)
+    # ------------------------------------------------------------------
+    def _offer(self, job_id: str, queue: asyncio.Queue, message: Dict[str, Any]) -> bool:
+        """클라이언트 큐에 메시지 추가 - 가득 차면 쌓인 메시지를 버리고 스냅샷으로 재동기화"""
+        try:
+            queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
+        
+        if message.get("type") in _DROPPABLE_TYPES:
+            self._dropped += 1
+            return False
         
-        # 연결 수가 많으면 더 자주 체크
-        total_connections = (
-            len(self.websocket_connections.get(job_id, set())) + 
-            len(self.sse_connections.get(job_id, set()))
-        )
+        while not queue.empty():
+            queue.get_nowait()
+            self._dropped += 1
+        self._resyncs += 1
+        logger.warning(f"⚠️ Client queue overflow for job {job_id}, resyncing with snapshot")
+        
+        snapshot = self.build_snapshot(job_id)
+        if snapshot is not None:
+            queue.put_nowait(snapshot)
+        if snapshot is None or message.get("type") in _TERMINAL_TYPES:
+            queue.put_nowait(message)
+        return True
+    
+    def _deliver_local(self, job_id: str, message: Dict[str, Any]) -> bool:
+        """이 워커의 WebSocket/SSE 연결 큐에 메시지 추가 (대기 없음)"""
+        sent_count = 0
+        for websocket in self.websocket_connections.get(job_id, ()):
+            queue = self._ws_queues.get(websocket)
+            if queue is not None and self._offer(job_id, queue, message):
+                sent_count += 1
+        for queue in self.sse_connections.get(job_id, ()):
+            if self._offer(job_id, queue, message):
+                sent_count += 1
+        return sent_count > 0
+    
+    def _publish(self, job_id: str, message: Dict[str, Any]) -> bool:
+        """로컬 연결에 전달하고, 다른 워커에 구독자가 있으면 브로커로 발행"""
+        self._record(job_id, message)
+        remote = self.broker.has_remote_subscribers(job_id)
+        if remote:
+            self.broker.publish(job_id, message)
+        return self._deliver_local(job_id, message) or remote
+    
+    async def _ws_sender(self, job_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """WebSocket 하나의 송신 큐를 비우는 작업 (느린 소켓은 자기 큐만 채움)"""
+        try:
+            while True:
+                message = await queue.get()
+                if message is _CLOSE_MARKER:
+                    await websocket.close()
+                    return
+                await websocket.send_json(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"❌ WebSocket send failed for job {job_id}: {str(e)}")
+            asyncio.create_task(self.remove_websocket_connection(job_id, websocket))
+    
+    def send_to_websocket(self, job_id: str, websocket: WebSocket, message: Dict[str, Any]) -> bool:
+        """특정 WebSocket 하나에 메시지 전송 (스냅샷 요청 응답 등)"""
+        queue = self._ws_queues.get(websocket)
+        return queue is not None and self._offer(job_id, queue, message)
+    
+    # ------------------------------------------------------------------
+    # 재연결 재전송 (Last-Event-ID)
+    # ------------------------------------------------------------------
+    def _record(self, job_id: str, message: Dict[str, Any]):
+        """seq가 있는 메시지를 링 버퍼에 보관 (seq가 건너뛰면 이전 기록은 버림)"""
+        seq = message.get("seq")
+        if seq is None:
+            return
+        history = self._history.get(job_id)
+        if history is None:
+            history = self._history[job_id] = deque(maxlen=self.replay_buffer_size)
+        elif history and history[-1]["seq"] != seq - 1:
+            history.clear()
+        history.append(message)
+
+    def get_replay(self, job_id: str, last_event_id: int) -> Optional[List[Dict[str, Any]]]:
+        """last_event_id 이후 놓친 메시지 목록 (버퍼가 이미 넘어갔으면 None → 스냅샷 필요)"""
+        current = self._seq.get(job_id)
+        if current is None or last_event_id > current:
+            return None
+        if last_event_id == current:
+            return []
+        history = self._history.get(job_id)
+        if not history or history[0]["seq"] > last_event_id + 1:
+            return None
+        return [message for message in history if message["seq"] > last_event_id]
+
+    def current_seq(self, job_id: str) -> int:
+        return self._seq.get(job_id, 0)
+
+    def _mark_unobserved(self, job_id: str):
+        """구독자가 없어 이벤트를 건너뜀 - seq를 한 칸 올려 재연결 시 스냅샷을 받도록 함"""
+        if job_id in self._seq and job_id not in self._unobserved:
+            self._unobserved.add(job_id)
+            self._next_seq(job_id)
+            self._history.pop(job_id, None)
+
+    def create_sse_queue(self) -> asyncio.Queue:
+        """SSE 연결용 크기 제한 큐 생성"""
+        return asyncio.Queue(maxsize=self.client_queue_size)
+    
+    # ------------------------------------------------------------------
+    # 이벤트 병합
+    # ------------------------------------------------------------------
+    def emit_progress(self, job_id: str, file_data: Dict[str, Any], counters: Optional[Dict[str, Any]] = None):
+        """파일 진행 이벤트 (text_index 기준으로 병합되어 다음 flush에 전송)"""
+        if not self._is_watched(job_id):
+            self._mark_unobserved(job_id)
+            return
+        pending = self._pending_for(job_id)
+        pending["files"].setdefault(file_data["text_index"], {}).update(file_data)
+        if counters:
+            pending["counters"] = counters
+    
+    def emit_job_update(self, job_id: str, counters: Dict[str, Any]):
+        """작업 카운터/상태 변경 이벤트 (다음 flush에 최신 값만 전송)"""
+        if not self._is_watched(job_id):
+            self._mark_unobserved(job_id)
+            return
+        self._pending_for(job_id)["counters"] = counters
+    
+    def _pending_for(self, job_id: str) -> Dict[str, Any]:
+        self._events += 1
+        self._unobserved.discard(job_id)
+        pending = self._pending.get(job_id)
+        if pending is None:
+            pending = self._pending[job_id] = {"files": {}, "counters": None}
+            loop = asyncio.get_running_loop()
+            self._flush_handles[job_id] = loop.call_later(self.coalesce_window, self._flush_job, job_id)
+        return pending
+    
+    def _next_seq(self, job_id: str) -> int:
+        seq = self._seq.get(job_id, 0) + 1
+        self._seq[job_id] = seq
+        return seq
+    
+    def _flush_job(self, job_id: str):
+        """모아 둔 변경분을 job_update(delta) 한 건으로 전송"""
+        handle = self._flush_handles.pop(job_id, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self._pending.pop(job_id, None)
+        if not pending:
+            return
         
-        if total_connections > 5:
-            base_interval = max(5, base_interval // 2)
+        message = {
+            "type": "job_update",
+            "delta": True,
+            "job_id": job_id,
+            "seq": self._next_seq(job_id),
+            "files": [pending["files"][index] for index in sorted(pending["files"])],
+            "timestamp": datetime.now().isoformat(),
+        }
+        if pending["counters"]:
+            message.update(pending["counters"])
         
-        return base_interval
+        self._flushed += 1
+        self._publish(job_id, message)
     
+    # ------------------------------------------------------------------
+    # 하트비트 (타이머 휠)
+    # ------------------------------------------------------------------
+    def _register_client(self, key: Any, client: _ClientState):
+        self._clients[key] = client
+        self.wheel.schedule(key, client.interval, lambda now, key=key: self._heartbeat(key))
+
+    def _unregister_client(self, key: Any):
+        self._clients.pop(key, None)
+        self.wheel.cancel(key)
+
+    def _heartbeat(self, key: Any) -> Optional[float]:
+        """연결 하나의 하트비트 - 송신 큐에 넣기만 하고 다음 간격 반환 (None이면 종료)"""
+        client = self._clients.get(key)
+        if client is None:
+            return None
+
+        current_time = time.time()
+        if client.kind == "websocket":
+            idle_time = current_time - client.last_seen
+            if client.max_idle and idle_time > client.max_idle:
+                # 클라이언트 응답이 없으면 타임아웃 알림 후 송신 작업이 소켓을 닫음
+                logger.warning(f"⏰ WebSocket connection timeout for job {client.job_id} (idle: {idle_time:.1f}s)")
+                self._offer(client.job_id, client.queue, {
+                    "type": "connection_timeout",
+                    "idle_time": idle_time,
+                    "max_idle_time": client.max_idle
+                })
+                if client.queue.full():
+                    client.queue.get_nowait()
+                client.queue.put_nowait(_CLOSE_MARKER)
+                return None
+            message = {
+                "type": "server_ping",
+                "timestamp": current_time,
+                "job_id": client.job_id,
+                "connection_duration": current_time - client.connected_at,
+                "expected_pong": True
+            }
+        else:
+            message = {
+                "type": "heartbeat",
+                "timestamp": current_time,
+                "job_id": client.job_id,
+                "connection_status": "active",
+                "connection_duration": current_time - client.connected_at,
+                "heartbeat_interval": client.interval
+            }
+
+        self._offer(client.job_id, client.queue, message)
+        health_info = self.connection_health.get(client.job_id)
+        if health_info is not None:
+            health_info['last_heartbeat'] = current_time
+        return client.interval
+
+    def touch_websocket(self, websocket: WebSocket):
+        """클라이언트에서 메시지를 받음 (유휴 타임아웃 갱신)"""
+        client = self._clients.get(websocket)
+        if client is not None:
+            client.last_seen = time.time()
+
+    def set_heartbeat_interval(self, websocket: WebSocket, interval: float):
+        """클라이언트가 요청한 하트비트 간격으로 재설정"""
+        client = self._clients.get(websocket)
+        if client is not None:
+            client.interval = interval
+            self.wheel.schedule(websocket, interval, lambda now, key=websocket: self._heartbeat(key))
+
     async def add_websocket_connection(self, job_id: str, websocket: WebSocket):
         """WebSocket 연결 추가 - 연결 상태 추적 포함"""
         if job_id not in self.websocket_connections:
             self.websocket_connections[job_id] = set()
         
         self.websocket_connections[job_id].add(websocket)
+        queue = asyncio.Queue(maxsize=self.client_queue_size)
+        self._ws_queues[websocket] = queue
+        self._ws_senders[websocket] = asyncio.create_task(self._ws_sender(job_id, websocket, queue))
+        self._register_client(websocket, _ClientState(
+            job_id, "websocket", queue,
+            settings.notification_ws_ping_interval, settings.notification_ws_max_idle,
+        ))
+        self.broker.subscribe(job_id)
         
         # 연결 상태 초기화
         if job_id not in self.connection_health:
@@ -61,12 +406,15 @@ class NotificationService:
         self.connection_health[job_id]['websocket_count'] = len(self.websocket_connections[job_id])
         
         logger.info(f"📡 WebSocket connected for job {job_id} (total: {len(self.websocket_connections[job_id])})")
-        
-        # 하트비트 작업 시작
-        await self._start_heartbeat_task(job_id)
     
     async def remove_websocket_connection(self, job_id: str, websocket: WebSocket):
         """WebSocket 연결 제거"""
+        self._unregister_client(websocket)
+        self._ws_queues.pop(websocket, None)
+        sender = self._ws_senders.pop(websocket, None)
+        if sender is not None and sender is not asyncio.current_task():
+            sender.cancel()
+        
         if job_id in self.websocket_connections:
             self.websocket_connections[job_id].discard(websocket)
             
@@ -77,8 +425,10 @@ class NotificationService:
             # 연결이 없으면 딕셔너리에서 제거
             if not self.websocket_connections[job_id]:
                 del self.websocket_connections[job_id]
-                # 하트비트 작업 정리
-                await self._cleanup_heartbeat_task(job_id)
+                if not self._has_local_connections(job_id):
+                    self.broker.unsubscribe(job_id)
+                # 연결 상태 정리
+                self._cleanup_connection_health(job_id)
         
         logger.info(f"📡 WebSocket disconnected for job {job_id}")
     
@@ -88,6 +438,10 @@ class NotificationService:
             self.sse_connections[job_id] = set()
         
         self.sse_connections[job_id].add(queue)
+        self._register_client(queue, _ClientState(
+            job_id, "sse", queue, settings.notification_sse_heartbeat_interval, 0,
+        ))
+        self.broker.subscribe(job_id)
         
         # 연결 상태 초기화
         if job_id not in self.connection_health:
@@ -102,12 +456,10 @@ class NotificationService:
         self.connection_health[job_id]['sse_count'] = len(self.sse_connections[job_id])
         
         logger.info(f"📡 SSE connected for job {job_id} (total: {len(self.sse_connections[job_id])})")
-        
-        # 하트비트 작업 시작
-        await self._start_heartbeat_task(job_id)
     
     async def remove_sse_connection(self, job_id: str, queue: asyncio.Queue):
         """SSE 연결 제거"""
+        self._unregister_client(queue)
         if job_id in self.sse_connections:
             self.sse_connections[job_id].discard(queue)
             
@@ -118,142 +470,21 @@ class NotificationService:
             # 연결이 없으면 딕셔너리에서 제거
             if not self.sse_connections[job_id]:
                 del self.sse_connections[job_id]
-                # 하트비트 작업 정리
-                await self._cleanup_heartbeat_task(job_id)
+                if not self._has_local_connections(job_id):
+                    self.broker.unsubscribe(job_id)
+                # 연결 상태 정리
+                self._cleanup_connection_health(job_id)
         
         logger.info(f"📡 SSE disconnected for job {job_id}")
     
-    async def _start_heartbeat_task(self, job_id: str):
-        """하트비트 작업 시작"""
-        if job_id in self.heartbeat_tasks:
-            return  # 이미 실행 중
-        
-        async def heartbeat_worker():
-            while (job_id in self.websocket_connections and self.websocket_connections[job_id]) or \
-                (job_id in self.sse_connections and self.sse_connections[job_id]):
-                
-                interval = self._calculate_heartbeat_interval(job_id)
-                await asyncio.sleep(interval)
-                
-                # 연결 상태 확인 및 하트비트 전송
-                await self._perform_heartbeat_check(job_id)
-        
-        self.heartbeat_tasks[job_id] = asyncio.create_task(heartbeat_worker())
-        logger.info(f"💓 Heartbeat task started for job {job_id}")
-    
-    async def _cleanup_heartbeat_task(self, job_id: str):
-        """하트비트 작업 정리"""
-        if job_id in self.heartbeat_tasks:
-            self.heartbeat_tasks[job_id].cancel()
-            try:
-                await self.heartbeat_tasks[job_id]
-            except asyncio.CancelledError:
-                pass
-            del self.heartbeat_tasks[job_id]
-            logger.info(f"💓 Heartbeat task cleaned up for job {job_id}")
-        
-        # 연결 상태 정보도 정리
-        if job_id in self.connection_health:
-            # 모든 연결이 없을 때만 정리
-            if (job_id not in self.websocket_connections or not self.websocket_connections[job_id]) and \
-                (job_id not in self.sse_connections or not self.sse_connections[job_id]):
-                del self.connection_health[job_id]
-    
-    async def _perform_heartbeat_check(self, job_id: str):
-        """연결 상태 확인 및 하트비트 전송"""
-        if job_id not in self.connection_health:
-            return
-        
-        current_time = time.time()
-        health_info = self.connection_health[job_id]
-        
-        # WebSocket 연결 상태 확인
-        if job_id in self.websocket_connections:
-            await self._check_websocket_health(job_id)
-        
-        # SSE 하트비트 전송
-        if job_id in self.sse_connections:
-            await self._send_sse_heartbeat(job_id)
-        
-        # 하트비트 시간 업데이트
-        health_info['last_heartbeat'] = current_time
-        
-        logger.debug(f"💓 Heartbeat performed for job {job_id} - WS: {health_info['websocket_count']}, SSE: {health_info['sse_count']}")
-    
-    async def _check_websocket_health(self, job_id: str):
-        """WebSocket 연결 상태 확인"""
-        if job_id not in self.websocket_connections:
-            return
-        
-        disconnected = set()
-        active_count = 0
-        
-        for websocket in self.websocket_connections[job_id].copy():
-            try:
-                # 핑 전송으로 연결 상태 확인
-                await websocket.send_json({
-                    "type": "heartbeat",
-                    "timestamp": time.time(),
-                    "job_id": job_id
-                })
-                active_count += 1
-            except Exception as e:
-                logger.warning(f"❌ WebSocket ping failed for job {job_id}: {str(e)}")
-                disconnected.add(websocket)
-        
-        # 끊어진 연결 제거
-        for websocket in disconnected:
-            await self.remove_websocket_connection(job_id, websocket)
-        
-        # 연결 상태 업데이트
-        if job_id in self.connection_health:
-            self.connection_health[job_id]['websocket_count'] = active_count
-    
-    async def _send_sse_heartbeat(self, job_id: str):
-        """SSE 하트비트 전송"""
-        if job_id not in self.sse_connections:
-            return
-        
-        heartbeat_data = {
-            "type": "heartbeat",
-            "timestamp": time.time(),
-            "job_id": job_id,
-            "connection_status": "active"
-        }
-        
-        disconnected = set()
-        active_count = 0
-        
-        for queue in self.sse_connections[job_id].copy():
-            try:
-                # 큐가 가득 찬 경우 대비
-                if queue.qsize() > 100:  # 큐 크기 제한
-                    logger.warning(f"⚠️ SSE queue full for job {job_id}, clearing old messages")
-                    while not queue.empty():
-                        try:
-                            queue.get_nowait()
-                        except asyncio.QueueEmpty:
-                            break
-                
-                await queue.put(heartbeat_data)
-                active_count += 1
-            except Exception as e:
-                logger.warning(f"❌ SSE heartbeat failed for job {job_id}: {str(e)}")
-                disconnected.add(queue)
-        
-        # 끊어진 연결 제거
-        for queue in disconnected:
-            await self.remove_sse_connection(job_id, queue)
-        
-        # 연결 상태 업데이트
-        if job_id in self.connection_health:
-            self.connection_health[job_id]['sse_count'] = active_count
+    def _cleanup_connection_health(self, job_id: str):
+        """모든 연결이 끊긴 작업의 연결 상태 정보 정리"""
+        if job_id in self.connection_health and not self._has_local_connections(job_id):
+            del self.connection_health[job_id]
     
     async def has_active_connections(self, job_id: str) -> bool:
-        """활성 연결이 있는지 확인"""
-        ws_count = len(self.websocket_connections.get(job_id, set()))
-        sse_count = len(self.sse_connections.get(job_id, set()))
-        return ws_count > 0 or sse_count > 0
+        """활성 연결이 있는지 확인 (다른 워커에 연결된 클라이언트 포함)"""
+        return self._is_watched(job_id)
     
     async def get_connection_health(self, job_id: str) -> Optional[Dict[str, Any]]:
         """연결 상태 정보 반환"""
@@ -266,164 +497,54 @@ class NotificationService:
         
         return health_info
     
-    async def broadcast_job_update(self, job_id: str, job_status: JobStatusResponse):
-        """작업 상태 업데이트를 모든 연결된 클라이언트에게 브로드캐스트 - 재시도 로직 포함"""
-        
-        message_data = {
-            "type": "job_update",  # 이 줄이 누락되었을 수 있음
-            "job_id": job_id,
-            "status": job_status.status.value,
-            "progress": job_status.progress,
-            "total_files": job_status.total_files,
-            "completed_files": job_status.completed_files,
-            "failed_files": job_status.failed_files,
-            "timestamp": datetime.now().isoformat(),
-            "files": job_status.files
-        }
-        
-        logger.info(f"📡 Broadcasting job update for {job_id}: {job_status.status.value} ({int(job_status.progress * 100)}%)")
-        
-        # 활성 연결이 없으면 경고
-        if not await self.has_active_connections(job_id):
-            logger.warning(f"⚠️ No active connections for job {job_id}")
-            return False
-        
-        # WebSocket으로 브로드캐스트 (재시도 포함)
-        ws_success = await self._broadcast_websocket_with_retry(job_id, message_data)
-        
-        # SSE로 브로드캐스트 (재시도 포함)
-        sse_success = await self._broadcast_sse_with_retry(job_id, message_data)
-        
-        return ws_success or sse_success
-    
-    async def _broadcast_websocket_with_retry(self, job_id: str, message_data: Dict[str, Any], max_retries: int = 3) -> bool:
-        """WebSocket 브로드캐스트 (재시도 로직 포함)"""
-        if job_id not in self.websocket_connections:
-            return False
-        
-        for attempt in range(max_retries):
-            disconnected = set()
-            sent_count = 0
-            
-            for websocket in self.websocket_connections[job_id].copy():
-                try:
-                    await websocket.send_json(message_data)
-                    sent_count += 1
-                except Exception as e:
-                    logger.warning(f"❌ WebSocket send failed (attempt {attempt + 1}): {str(e)}")
-                    disconnected.add(websocket)
-            
-            # 끊어진 연결 제거
-            for websocket in disconnected:
-                await self.remove_websocket_connection(job_id, websocket)
-            
-            if sent_count > 0:
-                logger.debug(f"📡 WebSocket broadcast sent to {sent_count} connections for job {job_id}")
-                return True
-            
-            if attempt < max_retries - 1:
-                await asyncio.sleep(0.5 * (attempt + 1))  # 지수 백오프
-        
-        return False
-    
-    async def _broadcast_sse_with_retry(self, job_id: str, message_data: Dict[str, Any], max_retries: int = 3) -> bool:
-        """SSE 브로드캐스트 (재시도 로직 포함)"""
-        if job_id not in self.sse_connections:
-            return False
-        
-        for attempt in range(max_retries):
-            disconnected = set()
-            sent_count = 0
-            
-            for queue in self.sse_connections[job_id].copy():
-                try:
-                    # 큐 크기 체크
-                    if queue.qsize() > 50:
-                        logger.warning(f"⚠️ SSE queue size warning for job {job_id}: {queue.qsize()}")
-                    
-                    await queue.put(message_data)
-                    sent_count += 1
-                except Exception as e:
-                    logger.warning(f"❌ SSE send failed (attempt {attempt + 1}): {str(e)}")
-                    disconnected.add(queue)
-            
-            # 끊어진 연결 제거
-            for queue in disconnected:
-                await self.remove_sse_connection(job_id, queue)
-            
-            if sent_count > 0:
-                logger.debug(f"📡 SSE broadcast sent to {sent_count} connections for job {job_id}")
-                return True
-            
-            if attempt < max_retries - 1:
-                await asyncio.sleep(0.5 * (attempt + 1))  # 지수 백오프
+    async def notify_job_completion(self, job_id: str, final_status: Dict[str, Any]):
+        """작업 완료/실패 알림 (대기 중인 변경분을 먼저 보낸 뒤 전송)
         
-        return False
-    
-    async def notify_job_progress(self, job_id: str, progress_data: Dict[str, Any]):
-        """작업 진행상황 알림 (파일 단위) - 연결 상태 확인 포함"""
-        
-        # 활성 연결 확인
-        if not await self.has_active_connections(job_id):
-            logger.warning(f"⚠️ No active connections for progress notification: {job_id}")
-            return False
-        
-        message = {
-            "job_id": job_id,
-            "type": "progress",
-            "data": progress_data,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        logger.debug(f"📡 Notifying progress for job {job_id}: {progress_data.get('filename', 'unknown')} - {progress_data.get('status', 'unknown')}")
-        
-        # WebSocket으로 진행상황 알림
-        ws_success = await self._broadcast_websocket_with_retry(job_id, message)
-        sse_success = await self._broadcast_sse_with_retry(job_id, message)
-        
-        return ws_success or sse_success
-    
-    async def notify_job_completion(self, job_id: str, final_status: JobStatusResponse):
-        """작업 완료/실패 알림"""
+        Args:
+            final_status: status/progress/total_files/completed_files/failed_files 카운터
+        """
+        self._flush_job(job_id)
         
         completion_message = {
             "job_id": job_id,
             "type": "completion",
-            "status": final_status.status.value,
-            "progress": final_status.progress,
-            "total_files": final_status.total_files,
-            "completed_files": final_status.completed_files,
-            "failed_files": final_status.failed_files,
+            "seq": self._next_seq(job_id),
+            **final_status,
             "timestamp": datetime.now().isoformat(),
-            "message": f"작업이 {final_status.status.value}되었습니다."
+            "message": f"작업이 {final_status['status']}되었습니다."
         }
         
         logger.info(f"🎉 Job {job_id} completed - notifying all clients")
         
         # 완료 알림 브로드캐스트
-        ws_success = await self._broadcast_websocket_with_retry(job_id, completion_message)
-        sse_success = await self._broadcast_sse_with_retry(job_id, completion_message)
+        success = self._publish(job_id, completion_message)
         
         logger.info(f"🎉 Job {job_id} completion notifications sent")
         
-        # 완료 후 하트비트 작업 정리 (약간의 지연 후)
+        self._schedule_cleanup_after_completion(job_id)
+        
+        return success
+    
+    def _schedule_cleanup_after_completion(self, job_id: str):
+        """완료 후 작업 상태 정리 (재연결 재전송 보관 시간 후, 연결은 클라이언트가 끊을 때 정리)"""
         async def cleanup_after_completion():
-            await asyncio.sleep(5)  # 클라이언트가 메시지를 받을 시간 제공
-            await self._cleanup_heartbeat_task(job_id)
+            await asyncio.sleep(settings.notification_replay_ttl_seconds)  # 재연결한 클라이언트가 놓친 메시지를 받을 시간 제공
+            self._cleanup_connection_health(job_id)
+            self._seq.pop(job_id, None)
+            self._history.pop(job_id, None)
+            self._unobserved.discard(job_id)
         
         asyncio.create_task(cleanup_after_completion())
-        
-        return ws_success or sse_success
     
     def get_connection_stats(self) -> Dict[str, Any]:
         """연결 통계 반환 - 상태 정보 포함"""
         stats = {
             "websocket_connections": {
-                job_id: len(connections) 
+                job_id: len(connections)
                 for job_id, connections in self.websocket_connections.items()
             },
             "sse_connections": {
-                job_id: len(connections) 
+                job_id: len(connections)
                 for job_id, connections in self.sse_connections.items()
             },
             "total_websocket_jobs": len(self.websocket_connections),
@@ -439,10 +560,25 @@ class NotificationService:
                 }
                 for job_id, health in self.connection_health.items()
             },
-            "active_heartbeat_tasks": len(self.heartbeat_tasks)
+            "heartbeat": {
+                "clients": len(self._clients),
+                **self.wheel.get_stats(),
+            },
+            "event_bus": {
+                "coalesce_window_ms": settings.notification_coalesce_ms,
+                "client_queue_size": self.client_queue_size,
+                "events": self._events,
+                "flushed_messages": self._flushed,
+                "dropped_messages": self._dropped,
+                "resyncs": self._resyncs,
+                "pending_jobs": len(self._pending),
+                "replay_jobs": len(self._history),
+                "replay_buffer_size": self.replay_buffer_size,
+            },
+            "broker": self.broker.get_stats(),
         }
         
         return stats
 
 # 전역 알림 서비스 인스턴스
-notification_service = NotificationService()
\ No newline at end of file
+notification_service = NotificationService()
@@ -0,0 +1,341 @@
+"""
+LLM 응답 캐시 (메모리 LRU + SQLite 디스크 계층)
+temperature 0 호출은 같은 입력에 같은 응답을 돌려주므로, 같은 책 재교정/재요약/언어 감지 등
+반복 호출을 프로바이더 호출 없이 처리합니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('llm_cache')
+
+# 디스크 TTL/개수/용량 정리 주기 (초) - 저장할 때마다 테이블을 훑지 않도록 주기적으로만 실행
+_PURGE_INTERVAL_SECONDS = 300.0
+# 용량 초과 시 한 번에 읽어 지우는 LRU 항목 수
+_EVICT_BATCH = 500
+
+
+def _normalize_content(content: Any) -> Any:
+    """줄바꿈/앞뒤 공백만 정규화 (프롬프트 안의 서식은 응답에 영향을 주므로 유지)"""
+    if isinstance(content, str):
+        return content.replace("\r\n", "\n").strip()
+    if isinstance(content, list):
+        return [_normalize_content(part) for part in content]
+    if isinstance(content, dict):
+        return {key: _normalize_content(value) for key, value in content.items()}
+    return content
+
+
+class LLMResponseCache:
+    """결정적 LLM 호출 응답 캐시
+
+    (실제 provider, 모델명, 정규화된 메시지 목록, 생성 파라미터)의 해시를 키로 응답 메시지를 저장합니다.
+    - 메모리 LRU(memory_entries개) → SQLite 순으로 조회, 디스크 적중은 메모리로 올림
+    - 디스크는 TTL, 최대 개수, 최대 용량(MB)을 넘으면 오래 사용되지 않은 항목부터 제거
+    - 적중 시 원래 호출에 걸렸던 시간을 절약 시간으로 집계
+    """
+
+    def __init__(
+        self, db_path: Optional[str], memory_entries: int, max_entries: int,
+        max_bytes: int, ttl_seconds: int, enabled: bool = True,
+    ):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        # cache_key → (메시지 dict, 원래 호출 시간, 저장 시각)
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], float, float]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        # 디스크 항목 수/용량 (연결 시 1회 계산 후 증감, 정리 때 재계산)
+        self._disk_entries: Optional[int] = None
+        self._disk_bytes = 0
+
+        # 통계
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._stores = 0
+        self._evictions = 0
+        self._errors = 0
+        self._latency_saved = 0.0
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: List[BaseMessage], params: Dict[str, Any]) -> str:
+        """캐시 키 생성 (SHA-256)"""
+        payload = json.dumps(
+            [
+                provider,
+                model or "",
+                [[message.type, _normalize_content(message.content)] for message in messages],
+                params,
+            ],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    model TEXT,
+                    payload TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    latency REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created_at ON llm_cache (created_at)")
+            conn.commit()
+            self._recount(conn)
+            self._conn = conn
+        return self._conn
+
+    def _get_disk(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], float, float]]:
+        conn = self._connect()
+        if conn is None:
+            return None
+        now = time.time()
+        row = conn.execute(
+            "SELECT payload, latency, created_at, size_bytes FROM llm_cache WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        payload, latency, created_at, size_bytes = row
+        if self.ttl_seconds and now - created_at > self.ttl_seconds:
+            conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (cache_key,))
+            conn.commit()
+            self._evictions += 1
+            self._disk_entries -= 1
+            self._disk_bytes -= size_bytes
+            return None
+        conn.execute(
+            "UPDATE llm_cache SET last_access = ?, hit_count = hit_count + 1 WHERE cache_key = ?", (now, cache_key)
+        )
+        conn.commit()
+        return json.loads(payload), latency, created_at
+
+    def _put_disk(self, cache_key: str, provider: str, model: str, message: Dict[str, Any], latency: float):
+        conn = self._connect()
+        if conn is None:
+            return
+        now = time.time()
+        payload = json.dumps(message, ensure_ascii=False, default=str)
+        size_bytes = len(payload.encode("utf-8"))
+        previous = conn.execute("SELECT size_bytes FROM llm_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO llm_cache
+                (cache_key, provider, model, payload, size_bytes, latency, created_at, last_access, hit_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+            """,
+            (cache_key, provider, model, payload, size_bytes, latency, now, now),
+        )
+        if previous is None:
+            self._disk_entries += 1
+        else:
+            self._disk_bytes -= previous[0]
+        self._disk_bytes += size_bytes
+        self._purge_disk(conn, now)
+        conn.commit()
+
+    def _recount(self, conn: sqlite3.Connection):
+        self._disk_entries, self._disk_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+        ).fetchone()
+
+    def _purge_disk(self, conn: sqlite3.Connection, now: float):
+        """TTL 만료 → 개수 → 용량 순으로 오래 사용되지 않은 항목부터 제거 (LRU)
+
+        _PURGE_INTERVAL_SECONDS마다 한 번만 실행하며, 항목 수/용량도 이때 다시 계산합니다
+        (멀티 워커가 같은 파일을 쓰면 워커별 증감 값이 어긋날 수 있으므로).
+        """
+        if now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        evicted = 0
+        if self.ttl_seconds:
+            evicted += conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+        self._recount(conn)
+        if self.max_entries and self._disk_entries > self.max_entries:
+            evicted += conn.execute(
+                "DELETE FROM llm_cache WHERE cache_key IN (SELECT cache_key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (self._disk_entries - self.max_entries,),
+            ).rowcount
+            self._recount(conn)
+        while self.max_bytes and self._disk_bytes > self.max_bytes:
+            rows = conn.execute(
+                "SELECT cache_key, size_bytes FROM llm_cache ORDER BY last_access ASC LIMIT ?", (_EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            stale = []
+            for key, size in rows:
+                if self._disk_bytes <= self.max_bytes:
+                    break
+                stale.append((key,))
+                self._disk_bytes -= size
+            conn.executemany("DELETE FROM llm_cache WHERE cache_key = ?", stale)
+            self._disk_entries -= len(stale)
+            evicted += len(stale)
+        self._evictions += evicted
+
+    # ------------------------------------------------------------------
+    # 메모리 계층
+    # ------------------------------------------------------------------
+    def _remember(self, cache_key: str, entry: Tuple[Dict[str, Any], float, float]):
+        self._memory[cache_key] = entry
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup_sync(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                message, latency, created_at = entry
+                if not self.ttl_seconds or time.time() - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(cache_key)
+                    self._memory_hits += 1
+                    return message, latency
+                del self._memory[cache_key]
+
+            entry = self._get_disk(cache_key)
+            if entry is None:
+                return None
+            self._remember(cache_key, entry)
+            self._disk_hits += 1
+            return entry[0], entry[1]
+
+    def _store_sync(self, cache_key: str, provider: str, model: str, message: Dict[str, Any], latency: float):
+        with self._lock:
+            self._remember(cache_key, (message, latency, time.time()))
+            self._put_disk(cache_key, provider, model, message, latency)
+
+    # ------------------------------------------------------------------
+    # 조회/저장
+    # ------------------------------------------------------------------
+    def get(self, cache_key: str) -> Optional[BaseMessage]:
+        """동기 조회 (invoke 경로)"""
+        try:
+            entry = self._lookup_sync(cache_key)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ LLM 캐시 조회 실패 (미스로 처리): {str(e)}")
+            entry = None
+        return self._hit_or_miss(entry)
+
+    async def aget(self, cache_key: str) -> Optional[BaseMessage]:
+        """비동기 조회 - 메모리 적중은 바로 반환, 디스크 조회는 스레드에서 실행"""
+        try:
+            with self._lock:
+                entry = self._memory.get(cache_key)
+            if entry is not None and (not self.ttl_seconds or time.time() - entry[2] <= self.ttl_seconds):
+                entry = self._lookup_sync(cache_key)
+            else:
+                entry = await asyncio.to_thread(self._lookup_sync, cache_key)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ LLM 캐시 조회 실패 (미스로 처리): {str(e)}")
+            entry = None
+        return self._hit_or_miss(entry)
+
+    def _hit_or_miss(self, entry: Optional[Tuple[Dict[str, Any], float]]) -> Optional[BaseMessage]:
+        if entry is None:
+            self._misses += 1
+            return None
+        message, latency = entry
+        self._latency_saved += latency
+        return messages_from_dict([message])[0]
+
+    def put(self, cache_key: str, provider: str, model: str, response: Any, latency: float):
+        """동기 저장 (응답이 메시지일 때만)"""
+        if not isinstance(response, BaseMessage):
+            return
+        try:
+            self._store_sync(cache_key, provider, model, message_to_dict(response), latency)
+            self._stores += 1
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ LLM 캐시 저장 실패: {str(e)}")
+
+    async def aput(self, cache_key: str, provider: str, model: str, response: Any, latency: float):
+        """비동기 저장 (응답이 메시지일 때만)"""
+        if not isinstance(response, BaseMessage):
+            return
+        try:
+            await asyncio.to_thread(self._store_sync, cache_key, provider, model, message_to_dict(response), latency)
+            self._stores += 1
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ LLM 캐시 저장 실패: {str(e)}")
+
+    def record_bypass(self):
+        """캐시 대상이 아닌 호출 (옵트아웃, temperature > 0, 스트리밍 등)"""
+        self._bypassed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self._memory_hits + self._disk_hits
+        lookups = hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            # 저장소를 조회하지 않고 유지 중인 항목 수 사용 (아직 연결 전이면 None)
+            "disk_entries": self._disk_entries if self.enabled else None,
+            "hits": hits,
+            "memory_hits": self._memory_hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "bypassed": self._bypassed,
+            "stores": self._stores,
+            "evictions": self._evictions,
+            "errors": self._errors,
+            "latency_saved_seconds": round(self._latency_saved, 3),
+        }
+
+
+# 전역 LLM 응답 캐시 인스턴스
+llm_response_cache = LLMResponseCache(
+    db_path=os.path.join(settings.llm_cache_dir, "llm_cache.sqlite3") if settings.llm_cache_dir else None,
+    memory_entries=settings.llm_cache_memory_entries,
+    max_entries=settings.llm_cache_max_entries,
+    max_bytes=settings.llm_cache_max_mb * 1024 * 1024,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    enabled=settings.llm_cache_enabled,
+)
@@ -4,29 +4,86 @@ API 요청에서 모델을 받고, 환경변수로 설정을 관리
 """
 
 import os
+import time
 import asyncio
+import threading
 from app.utils.logger.setup import setup_logger
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Tuple
 from langchain_core.runnables.base import Runnable
-from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage
+from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage, convert_to_messages
+from langchain_core.prompt_values import PromptValue
 from langchain_core.outputs import LLMResult
 from langchain_core.callbacks import CallbackManagerForLLMRun, AsyncCallbackManagerForLLMRun
 
 from app.config import settings
+from app.utils.language.cache import llm_response_cache
+from app.utils.language.singleflight import llm_single_flight
+from app.utils.language.governor import llm_governor, estimate_tokens
+from app.utils.language.health import llm_provider_health, ProviderUnavailableError, is_provider_failure
 
 logger = setup_logger('language_generator')
 
 class UnifiedLanguageModel(Runnable):
     """통합 언어 모델 클래스 - 환경변수 기반 설정 및 LangChain 호환"""
     
+    # provider별 API 키 환경변수 (키가 없으면 클라이언트를 만들지 않고 우회 대상에서도 제외)
+    _API_KEY_ENV = {"openai": "OPENAI_API_KEY", "gemini": "GEMINI_API_KEY"}
+
     def __init__(self):
         super().__init__()
-        self.models: Dict[str, Optional[Runnable]] = {}
-        self._initialize_models()
-    
-    def _initialize_models(self):
-        """사용 가능한 모든 언어 모델을 환경변수 설정으로 초기화합니다."""
+        # provider 클라이언트는 처음 사용할 때 생성 (import 시점에 provider SDK를 불러오지 않음)
+        self._models: Dict[str, Optional[Runnable]] = {}
+        self._init_lock = threading.Lock()
+        self._init_seconds: Dict[str, float] = {}
+
+    @property
+    def models(self) -> Dict[str, Optional[Runnable]]:
+        """전체 provider 클라이언트 (아직 만들지 않은 것은 이 시점에 생성)"""
+        return {name: self._client(name) for name in self._API_KEY_ENV}
+
+    def _client(self, provider: str) -> Optional[Runnable]:
+        """provider 클라이언트 (최초 1회만 생성, 스레드/이벤트 루프 어디서 불러도 한 번만 만듦)"""
+        if provider in self._models:
+            return self._models[provider]
+        if provider not in self._API_KEY_ENV:
+            return None
+        with self._init_lock:
+            if provider not in self._models:
+                started = time.perf_counter()
+                self._models[provider] = self._build_client(provider)
+                self._init_seconds[provider] = time.perf_counter() - started
+                logger.info(f"{provider} client init took {self._init_seconds[provider]:.2f}s")
+        return self._models[provider]
+
+    def _configured(self, provider: str) -> bool:
+        """클라이언트를 만들지 않고 사용 가능 여부 추정 (생성에 실패한 provider는 제외)"""
+        if provider in self._models:
+            return self._models[provider] is not None
+        env = self._API_KEY_ENV.get(provider)
+        return bool(env and os.getenv(env))
+
+    async def _aclient(self, provider: str) -> Optional[Runnable]:
+        """비동기 경로용 - 아직 만들지 않았으면 SDK import/생성을 스레드에서 해 이벤트 루프를 막지 않음"""
+        if provider in self._models:
+            return self._models[provider]
+        return await asyncio.to_thread(self._client, provider)
+
+    async def awarm(self):
+        """설정된 provider 클라이언트를 스레드에서 미리 생성 (시작 후 백그라운드 예열용)"""
+        for provider in self._API_KEY_ENV:
+            if self._configured(provider):
+                await asyncio.to_thread(self._client, provider)
+
+    def _build_client(self, provider: str) -> Optional[Runnable]:
+        """provider 클라이언트를 환경변수 설정으로 생성합니다."""
         
+        if provider == "openai":
+            return self._build_openai()
+        if provider == "gemini":
+            return self._build_gemini()
+        return None
+
+    def _build_openai(self) -> Optional[Runnable]:
         # OpenAI 모델 초기화
         try:
             from langchain_openai import ChatOpenAI
@@ -34,49 +91,69 @@ class UnifiedLanguageModel(Runnable):
             
             if "gpt-5" in openai_model.lower():
                 # GPT-5 models don't support temperature parameter
-                self.models["openai"] = ChatOpenAI(
+                model = ChatOpenAI(
                     model=openai_model,
                     max_tokens=int(settings.openai_max_tokens),
                     api_key=os.getenv("OPENAI_API_KEY"),
                 )
             else:
-                self.models["openai"] = ChatOpenAI(
+                model = ChatOpenAI(
                     model=openai_model,
                     temperature=float(settings.openai_temperature),
                     max_tokens=int(settings.openai_max_tokens),
                     api_key=os.getenv("OPENAI_API_KEY"),
                 )
             logger.info(f"OpenAI model ({openai_model}) initialized successfully")
+            return model
         except ImportError:
             logger.warning("langchain_openai not available")
-            self.models["openai"] = None
+            return None
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI model: {e}")
-            self.models["openai"] = None
-        
+            return None
+
+    def _build_gemini(self) -> Optional[Runnable]:
         # Google Gemini 모델 초기화
         try:
             from langchain_google_genai import ChatGoogleGenerativeAI
-            self.models["gemini"] = ChatGoogleGenerativeAI(
+            model = ChatGoogleGenerativeAI(
                 model=settings.gemini_model,
                 temperature=settings.gemini_temperature,
                 max_output_tokens=int(settings.gemini_max_tokens),
                 google_api_key=os.getenv("GEMINI_API_KEY")
             )
             logger.info("Gemini model initialized successfully")
+            return model
         except ImportError:
             logger.warning("langchain_google_genai not available")
-            self.models["gemini"] = None
+            return None
         except Exception as e:
             logger.error(f"Failed to initialize Gemini model: {e}")
-            self.models["gemini"] = None
-    
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """LLM 호출 계층 통계 (클라이언트 생성, 응답 캐시, 단일 비행, 거버너, provider 상태)"""
+        return {
+            "clients": {
+                name: {
+                    "initialized": name in self._models,
+                    "available": self._configured(name),
+                    "init_seconds": round(self._init_seconds.get(name, 0.0), 3),
+                }
+                for name in self._API_KEY_ENV
+            },
+            "cache": llm_response_cache.get_stats(),
+            "single_flight": llm_single_flight.get_stats(),
+            "governor": llm_governor.get_stats(),
+            "health": llm_provider_health.get_stats(),
+        }
+
     def get_available_models(self) -> list:
         """사용 가능한 모델 목록을 반환합니다."""
-        return [name for name, model in self.models.items() if model is not None]
+        return [name for name in self._API_KEY_ENV if self._configured(name)]
     
-    def _get_model(self, model_name: str) -> Runnable:
-        """지정된 모델을 반환하거나 대체 모델을 찾습니다."""
+    def _provider_for(self, model_name: str) -> str:
+        """모델명에 해당하는 provider (사용 가능 여부는 확인하지 않음)"""
         
         # 모델명을 provider로 매핑
         model_mapping = {
@@ -104,52 +181,243 @@ class UnifiedLanguageModel(Runnable):
             else:
                 # 직접 provider명인 경우
                 provider = model_name
+        return provider
+
+    # 대체 모델 우선순위 정의
+    _FALLBACK_ORDER = ("gemini", "openai")
+
+    def _resolve_provider(self, model_name: str) -> str:
+        """지정된 모델의 provider를 반환하거나 대체 provider를 찾습니다."""
+        provider = self._provider_for(model_name)
         
         # 요청된 provider의 모델이 사용 가능한지 확인
-        if provider in self.models and self.models[provider] is not None:
-            return self.models[provider]
-        
-        # 대체 모델 우선순위 정의
-        fallback_order = ["gemini", "openai"]
+        if self._client(provider) is not None:
+            return provider
         
         logger.warning(f"Requested model '{model_name}' (provider: {provider}) not available, trying fallbacks...")
         
-        for fallback in fallback_order:
-            if fallback != provider and self.models.get(fallback) is not None:
+        for fallback in self._FALLBACK_ORDER:
+            if fallback != provider and self._client(fallback) is not None:
                 logger.info(f"Using fallback model: {fallback}")
-                return self.models[fallback]
+                return fallback
         
         raise RuntimeError(f"No available language models found. Requested: {model_name}")
+
+    async def _aresolve_provider(self, model_name: str) -> str:
+        """_resolve_provider의 비동기 버전 (대체 provider 클라이언트도 스레드에서 생성)"""
+        provider = self._provider_for(model_name)
+        if await self._aclient(provider) is not None:
+            return provider
+
+        logger.warning(f"Requested model '{model_name}' (provider: {provider}) not available, trying fallbacks...")
+
+        for fallback in self._FALLBACK_ORDER:
+            if fallback != provider and await self._aclient(fallback) is not None:
+                logger.info(f"Using fallback model: {fallback}")
+                return fallback
+
+        raise RuntimeError(f"No available language models found. Requested: {model_name}")
     
-    # LangChain Runnable 인터페이스 구현
-    def invoke(self, input: Any, config: Optional[Dict] = None, **kwargs: Any) -> Any:
-        """동기적으로 언어 모델을 호출합니다."""
-        
-        # config에서 모델명 추출
+    def _route(self, model_name: str, primary: Optional[str] = None) -> List[str]:
+        """호출할 provider 순서 (요청 provider 우선, 서킷이 열렸거나 느리면 정상 provider를 앞으로)"""
+        primary = primary or self._resolve_provider(model_name)
+        alternates = [name for name in ("gemini", "openai") if name != primary and self._configured(name)]
+        return llm_provider_health.rank([primary] + alternates)
+
+    def _equivalent_model(self, model_name: str, provider: str) -> str:
+        """다른 provider로 우회할 때 사용할 대응 모델명"""
+        equivalents = {
+            "gpt-5": "gemini-2.5-pro",
+            "gpt-4o": "gemini-2.5-pro",
+            "gpt-5-mini": "gemini-2.5-flash",
+            "gpt-4o-mini": "gemini-2.5-flash",
+            "gemini-2.5-pro": "gpt-4o",
+            "gemini-2.5-flash": "gpt-4o-mini",
+            "gemini-2.0-flash": "gpt-4o-mini",
+        }
+        equivalent = equivalents.get(model_name)
+        if equivalent and self._provider_for(equivalent) == provider:
+            return equivalent
+        # 대응 모델이 없으면 해당 provider에 설정된 모델
+        return {"openai": settings.openai_model, "gemini": settings.gemini_model}.get(provider) or provider
+
+    def _pick(self, model_name: str) -> Tuple[str, Runnable]:
+        """라우팅 순서에서 클라이언트 생성에 성공한 첫 provider"""
+        for provider in self._route(model_name):
+            llm = self._client(provider)
+            if llm is not None:
+                return provider, llm
+        raise RuntimeError(f"No available language models found. Requested: {model_name}")
+
+    async def _apick(self, model_name: str) -> Tuple[str, Runnable]:
+        """_pick의 비동기 버전 (클라이언트 생성은 스레드에서)"""
+        for provider in self._route(model_name, await self._aresolve_provider(model_name)):
+            llm = await self._aclient(provider)
+            if llm is not None:
+                return provider, llm
+        raise RuntimeError(f"No available language models found. Requested: {model_name}")
+
+    def _get_model(self, model_name: str) -> Runnable:
+        """지정된 모델을 반환하거나 대체 모델을 찾습니다."""
+        return self._pick(model_name)[1]
+
+    def _resolve_model_name(self, config: Optional[Dict], kwargs: Dict[str, Any]) -> str:
+        """config 또는 kwargs에서 모델명 추출 (없으면 기본 모델)"""
         model_name = None
         if config and isinstance(config, dict):
             model_name = config.get("model")
         if not model_name:
             model_name = kwargs.get("model", settings.default_llm_model)
-        
-        llm = self._get_model(model_name)
-        
+        return model_name
+
+    def _prepare_input(self, input: Any) -> Any:
+        """입력 타입에 따라 모델에 전달할 입력으로 변환"""
+        if isinstance(input, str):
+            return [HumanMessage(content=input)]
+        if isinstance(input, dict):
+            # dict 형태의 입력 (체인에서 오는 경우), text가 없으면 다른 키들을 조합해서 프롬프트 생성
+            return [HumanMessage(content=input["text"] if "text" in input else str(input))]
+        return input
+
+    def _cache_key(
+        self, provider: str, llm: Runnable, prepared: Any, config: Optional[Dict], kwargs: Dict[str, Any], use_cache: bool
+    ) -> Optional[str]:
+        """응답 캐시 키 (결정적 호출이 아니거나 옵트아웃이면 None)"""
+        if not llm_response_cache.enabled:
+            return None
+        temperature = getattr(llm, "temperature", None)
+        if not use_cache or (isinstance(config, dict) and config.get("cache") is False) \
+                or temperature is None or temperature > 0:
+            llm_response_cache.record_bypass()
+            return None
         try:
-            # 입력 타입에 따라 처리
-            if isinstance(input, str):
-                response = llm.invoke([HumanMessage(content=input)], config=config, **kwargs)
-            elif isinstance(input, dict):
-                # dict 형태의 입력 (체인에서 오는 경우)
-                if "text" in input:
-                    response = llm.invoke([HumanMessage(content=input["text"])], config=config, **kwargs)
+            messages = convert_to_messages(prepared.to_messages() if isinstance(prepared, PromptValue) else prepared)
+        except Exception:
+            llm_response_cache.record_bypass()
+            return None
+        params = {
+            "temperature": temperature,
+            "max_tokens": getattr(llm, "max_tokens", None) or getattr(llm, "max_output_tokens", None),
+            **{key: value for key, value in kwargs.items() if key != "model"},
+        }
+        return llm_response_cache.make_key(provider, self._model_id(llm), messages, params)
+
+    @staticmethod
+    def _model_id(llm: Runnable) -> str:
+        return getattr(llm, "model_name", None) or getattr(llm, "model", None) or ""
+
+    def _estimate_prompt_tokens(self, llm: Runnable, prepared: Any) -> int:
+        """거버너 TPM 예약용 프롬프트 토큰 추정"""
+        try:
+            messages = convert_to_messages(prepared.to_messages() if isinstance(prepared, PromptValue) else prepared)
+        except Exception:
+            return estimate_tokens(self._model_id(llm), [str(prepared)])
+        texts, images = [], 0
+        for message in messages:
+            if isinstance(message.content, str):
+                texts.append(message.content)
+                continue
+            for part in message.content:
+                if isinstance(part, str):
+                    texts.append(part)
+                elif isinstance(part, dict) and part.get("type") == "text":
+                    texts.append(part.get("text", ""))
                 else:
-                    # 다른 키들을 조합해서 프롬프트 생성
-                    prompt_text = str(input)
-                    response = llm.invoke([HumanMessage(content=prompt_text)], config=config, **kwargs)
-            elif isinstance(input, list):
-                response = llm.invoke(input, config=config, **kwargs)
+                    images += 1
+        return estimate_tokens(self._model_id(llm), texts, images)
+
+    async def _governed_ainvoke(
+        self, provider: str, llm: Runnable, prepared: Any, config: Optional[Dict], kwargs: Dict[str, Any]
+    ) -> Any:
+        """거버너 예산 안에서 프로바이더 호출 (결과는 provider 상태에 기록)"""
+        if not llm_provider_health.acquire(provider):
+            raise ProviderUnavailableError(f"{provider} circuit is open")
+
+        max_output = getattr(llm, "max_tokens", None) or getattr(llm, "max_output_tokens", None)
+        started = None
+        try:
+            async with llm_governor.slot(provider, self._estimate_prompt_tokens(llm, prepared), max_output) as grant:
+                started = time.monotonic()
+                response = await asyncio.wait_for(
+                    llm.ainvoke(prepared, config=config, **kwargs), timeout=settings.llm_attempt_timeout or None
+                )
+                grant.record_usage(response)
+        except Exception as e:
+            if is_provider_failure(e):
+                llm_provider_health.record(provider, False, time.monotonic() - started if started else 0.0)
             else:
-                response = llm.invoke(input, config=config, **kwargs)
+                llm_provider_health.abandon(provider)
+            raise
+        except BaseException:
+            llm_provider_health.abandon(provider)
+            raise
+        llm_provider_health.record(provider, True, time.monotonic() - started)
+        return response
+
+    async def _ainvoke_provider(
+        self, provider: str, prepared: Any, config: Optional[Dict], kwargs: Dict[str, Any], use_cache: bool
+    ) -> Any:
+        """provider 1곳에 호출 (캐시 → 단일 비행 → 거버너 순)"""
+        llm = await self._aclient(provider)
+        if llm is None:
+            raise ProviderUnavailableError(f"{provider} client is not available")
+
+        # temperature 0 호출은 같은 입력이면 캐시된 응답 반환
+        cache_key = self._cache_key(provider, llm, prepared, config, kwargs, use_cache)
+        if not cache_key:
+            return await self._governed_ainvoke(provider, llm, prepared, config, kwargs)
+
+        cached = await llm_response_cache.aget(cache_key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit ({provider})")
+            return cached
+        # 같은 키로 진행 중인 호출이 있으면 새로 보내지 않고 그 결과를 함께 기다림
+        return await llm_single_flight.do(
+            cache_key, lambda: self._ainvoke_and_store(provider, llm, prepared, config, kwargs, cache_key)
+        )
+
+    def _for_provider(
+        self, model_name: str, provider: str, config: Optional[Dict], kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[Dict], Dict[str, Any]]:
+        """우회 호출용 config/kwargs (모델명을 대응 모델로 교체)"""
+        equivalent = self._equivalent_model(model_name, provider)
+        logger.info(f"↪️ {model_name} 대신 {provider} ({equivalent})로 호출합니다")
+        if isinstance(config, dict) and config.get("model"):
+            config = {**config, "model": equivalent}
+        if kwargs.get("model"):
+            kwargs = {**kwargs, "model": equivalent}
+        return config, kwargs
+
+    async def _ainvoke_and_store(
+        self, provider: str, llm: Runnable, prepared: Any, config: Optional[Dict], kwargs: Dict[str, Any], cache_key: str
+    ) -> Any:
+        """프로바이더 호출 후 응답 캐시에 저장"""
+        started = time.monotonic()
+        response = await self._governed_ainvoke(provider, llm, prepared, config, kwargs)
+        await llm_response_cache.aput(cache_key, provider, self._model_id(llm), response, time.monotonic() - started)
+        return response
+
+    # LangChain Runnable 인터페이스 구현
+    def invoke(self, input: Any, config: Optional[Dict] = None, **kwargs: Any) -> Any:
+        """동기적으로 언어 모델을 호출합니다."""
+        
+        use_cache = kwargs.pop("cache", True)
+        model_name = self._resolve_model_name(config, kwargs)
+        provider, llm = self._pick(model_name)
+        prepared = self._prepare_input(input)
+
+        cache_key = self._cache_key(provider, llm, prepared, config, kwargs, use_cache)
+        if cache_key:
+            cached = llm_response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"LLM cache hit ({model_name})")
+                return cached
+        
+        try:
+            started = time.monotonic()
+            response = llm.invoke(prepared, config=config, **kwargs)
+            if cache_key:
+                llm_response_cache.put(cache_key, provider, self._model_id(llm), response, time.monotonic() - started)
             
             logger.debug(f"Successfully called {model_name} model")
             return response
@@ -161,34 +429,46 @@ class UnifiedLanguageModel(Runnable):
     async def ainvoke(self, input: Any, config: Optional[Dict] = None, **kwargs: Any) -> Any:
         """비동기적으로 언어 모델을 호출합니다."""
         
-        # config에서 모델명 추출
-        model_name = None
-        if config and isinstance(config, dict):
-            model_name = config.get("model")
-        if not model_name:
-            model_name = kwargs.get("model", settings.default_llm_model)
-        
-        llm = self._get_model(model_name)
+        use_cache = kwargs.pop("cache", True)
+        model_name = self._resolve_model_name(config, kwargs)
+        primary = await self._aresolve_provider(model_name)
+        providers = self._route(model_name, primary)
+        prepared = self._prepare_input(input)
+        max_attempts = max(1, settings.llm_max_attempts)
+        llm_provider_health.record_request()
         
         try:
-            # 입력 타입에 따라 처리
-            if isinstance(input, str):
-                response = await llm.ainvoke([HumanMessage(content=input)], config=config, **kwargs)
-            elif isinstance(input, dict):
-                # dict 형태의 입력 (체인에서 오는 경우)
-                if "text" in input:
-                    response = await llm.ainvoke([HumanMessage(content=input["text"])], config=config, **kwargs)
+            # provider 장애(타임아웃/5xx/429)면 다음 provider로 - 시도 횟수와 재시도 예산 안에서만
+            attempts = 0
+            last_error: Optional[Exception] = None
+            for provider in providers:
+                if attempts >= max_attempts:
+                    break
+                if attempts and not llm_provider_health.try_retry():
+                    logger.warning(f"⚠️ LLM 재시도 예산 소진 - {model_name} 호출을 재시도하지 않습니다")
+                    break
+                if provider == primary:
+                    call_config, call_kwargs = config, kwargs
                 else:
-                    # 다른 키들을 조합해서 프롬프트 생성
-                    prompt_text = str(input)
-                    response = await llm.ainvoke([HumanMessage(content=prompt_text)], config=config, **kwargs)
-            elif isinstance(input, list):
-                response = await llm.ainvoke(input, config=config, **kwargs)
-            else:
-                response = await llm.ainvoke(input, config=config, **kwargs)
+                    call_config, call_kwargs = self._for_provider(model_name, provider, config, kwargs)
+                try:
+                    response = await self._ainvoke_provider(provider, prepared, call_config, call_kwargs, use_cache)
+                except ProviderUnavailableError as e:
+                    # 호출을 보내지 않았으므로 시도 횟수에 포함하지 않음
+                    last_error = e
+                    continue
+                except Exception as e:
+                    if not is_provider_failure(e):
+                        raise
+                    last_error = e
+                    attempts += 1
+                    logger.warning(f"⚠️ {provider} 호출 실패 ({type(e).__name__}: {e})")
+                    continue
+                
+                logger.debug(f"Successfully called {model_name} model")
+                return response
             
-            logger.debug(f"Successfully called {model_name} model")
-            return response
+            raise last_error
             
         except RuntimeError as e:
             if "attached to a different loop" in str(e):
@@ -242,26 +522,19 @@ class UnifiedLanguageModel(Runnable):
         if not model_name:
             model_name = kwargs.get("model", settings.default_llm_model)
         
-        llm = self._get_model(model_name)
+        provider, llm = await self._apick(model_name)
+        prepared = self._prepare_input(input)
+        max_output = getattr(llm, "max_tokens", None) or getattr(llm, "max_output_tokens", None)
         
         try:
-            if isinstance(input, str):
-                async for chunk in llm.astream([HumanMessage(content=input)], config=config, **kwargs):
-                    yield chunk
-            elif isinstance(input, dict):
-                if "text" in input:
-                    async for chunk in llm.astream([HumanMessage(content=input["text"])], config=config, **kwargs):
-                        yield chunk
-                else:
-                    prompt_text = str(input)
-                    async for chunk in llm.astream([HumanMessage(content=prompt_text)], config=config, **kwargs):
-                        yield chunk
-            elif isinstance(input, list):
-                async for chunk in llm.astream(input, config=config, **kwargs):
-                    yield chunk
-            else:
-                async for chunk in llm.astream(input, config=config, **kwargs):
+            # 스트림이 끝날 때까지 거버너 슬롯 점유
+            async with llm_governor.slot(provider, self._estimate_prompt_tokens(llm, prepared), max_output) as grant:
+                used_tokens = 0
+                async for chunk in llm.astream(prepared, config=config, **kwargs):
+                    # 청크의 usage_metadata는 증분값
+                    used_tokens += (getattr(chunk, "usage_metadata", None) or {}).get("total_tokens", 0)
                     yield chunk
+                grant.record_tokens(used_tokens)
                     
         except Exception as e:
             logger.error(f"Error async streaming from {model_name} model: {e}")
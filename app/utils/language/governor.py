@@ -0,0 +1,299 @@
+"""
+LLM 호출 거버너 (provider별 RPM/TPM 예산 + 동시 호출 수 제한 + 엔드포인트 간 공정 대기열)
+300페이지 교정처럼 한 요청이 수백 개의 호출을 한꺼번에 보내도 provider 한도 안에서 나눠 보내
+429 폭주를 막고, 다른 엔드포인트 요청이 그 뒤에 오래 밀리지 않게 합니다.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Deque, List
+
+from app.config import settings
+from app.utils.language.health import is_rate_limit_failure
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('llm_governor')
+
+# 현재 요청의 엔드포인트 (미들웨어에서 설정, 공정 대기열의 단위)
+llm_endpoint: ContextVar[str] = ContextVar("llm_endpoint", default="default")
+
+_WINDOW = 60.0
+_ENCODING_NAMES = ("cl100k_base", "o200k_base")
+_encodings: Dict[str, Any] = {}
+
+
+def load_encodings():
+    """tiktoken 인코딩을 미리 불러옴 (BPE 파일 다운로드가 있을 수 있으므로 시작 시 스레드에서 호출)"""
+    for name in _ENCODING_NAMES:
+        if name in _encodings:
+            continue
+        try:
+            import tiktoken
+            _encodings[name] = tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.warning(f"⚠️ tiktoken 인코딩({name})을 불러오지 못해 글자 수로 토큰을 추정합니다: {e}")
+            _encodings[name] = None
+
+
+def _get_encoding(model: str):
+    """모델에 맞는 tiktoken 인코딩 (아직 불러오지 않았거나 실패했으면 None → 글자 수 기반 추정)
+
+    요청 경로에서는 인코딩을 불러오지 않습니다 (load_encodings 참고).
+    """
+    name = "o200k_base" if any(prefix in (model or "") for prefix in ("gpt-4o", "gpt-5", "o1", "o3")) else "cl100k_base"
+    return _encodings.get(name)
+
+
+def estimate_tokens(model: str, texts: List[str], images: int = 0) -> int:
+    """프롬프트 토큰 수 추정 (Gemini도 tiktoken 기준 근사치, 이미지는 장당 고정값)"""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        tokens = sum(len(encoding.encode(text, disallowed_special=())) for text in texts)
+    else:
+        tokens = sum(len(text) for text in texts) // 3
+    # 메시지 구분 토큰 여유분 + 이미지
+    return tokens + 4 * len(texts) + images * settings.llm_governor_image_tokens
+
+
+class _Grant:
+    """승인된 호출 1건 - 호출 후 실제 사용 토큰으로 TPM 기록을 보정"""
+
+    def __init__(self, entry: List[float]):
+        self._entry = entry
+
+    def record_usage(self, response: Any):
+        usage = getattr(response, "usage_metadata", None) or {}
+        if isinstance(usage, dict):
+            self.record_tokens(usage.get("total_tokens") or 0)
+
+    def record_tokens(self, total: int):
+        if total:
+            self._entry[1] = float(total)
+
+
+class _ProviderGovernor:
+    """provider 하나의 1분 슬라이딩 윈도우 예산과 엔드포인트별 대기열"""
+
+    def __init__(self, name: str, rpm: int, tpm: int, max_inflight: int):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_inflight = max_inflight
+        self.in_flight = 0
+        self._window: Deque[List[float]] = deque()  # [시각, 토큰]
+        self._waiting: "OrderedDict[str, Deque[tuple]]" = OrderedDict()  # endpoint → (future, tokens, 대기 시작)
+        self._waiting_count = 0
+        self._cooldown_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # 통계
+        self._admitted = 0
+        self._rate_limited = 0
+        self._waits: Deque[float] = deque(maxlen=500)
+        self._max_wait = 0.0
+
+    def reset(self):
+        """이벤트 루프가 바뀌면 이전 루프의 대기자는 깨울 수 없으므로 비움"""
+        self.in_flight = 0
+        self._waiting.clear()
+        self._waiting_count = 0
+        self._timer = None
+
+    def _expire(self, now: float):
+        while self._window and now - self._window[0][0] >= _WINDOW:
+            self._window.popleft()
+
+    def _delay_for(self, tokens: int, now: float) -> float:
+        """tokens 크기 호출을 지금 보낼 수 있으면 0, 아니면 예산이 생길 때까지 남은 시간(초)"""
+        if now < self._cooldown_until:
+            return self._cooldown_until - now
+        self._expire(now)
+        delay = 0.0
+        if self.rpm and len(self._window) >= self.rpm:
+            delay = self._window[len(self._window) - self.rpm][0] + _WINDOW - now
+        if self.tpm and self._window:
+            used = sum(entry[1] for entry in self._window)
+            # 한도보다 큰 호출은 윈도우가 빌 때까지 기다린 뒤 단독으로 보냄
+            excess = used + min(tokens, self.tpm) - self.tpm
+            for entry in self._window:
+                if excess <= 0:
+                    break
+                excess -= entry[1]
+                delay = max(delay, entry[0] + _WINDOW - now)
+        return max(0.0, delay)
+
+    def _admit(self, tokens: int, now: float) -> List[float]:
+        entry = [now, float(tokens)]
+        self._window.append(entry)
+        self.in_flight += 1
+        self._admitted += 1
+        return entry
+
+    def _record_wait(self, waited: float):
+        self._waits.append(waited)
+        self._max_wait = max(self._max_wait, waited)
+
+    async def acquire(self, endpoint: str, tokens: int) -> List[float]:
+        now = time.monotonic()
+        if self._waiting_count == 0 and (not self.max_inflight or self.in_flight < self.max_inflight) \
+                and self._delay_for(tokens, now) == 0:
+            self._record_wait(0.0)
+            return self._admit(tokens, now)
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (future, tokens, now)
+        self._waiting.setdefault(endpoint, deque()).append(waiter)
+        self._waiting_count += 1
+        self._pump()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 승인 직후 취소됨 → 슬롯 반납 (보내지 않은 호출이므로 토큰 예약은 되돌림)
+                future.result()[1] = 0.0
+                self.release()
+            else:
+                queue = self._waiting.get(endpoint)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    self._waiting_count -= 1
+                    if not queue:
+                        del self._waiting[endpoint]
+                self._pump()
+            raise
+
+    def _pump(self):
+        """엔드포인트 사이를 라운드 로빈으로 돌며 예산 안에서 대기자를 승인"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiting:
+            if self.max_inflight and self.in_flight >= self.max_inflight:
+                return  # release() 시 다시 호출됨
+            endpoint, queue = next(iter(self._waiting.items()))
+            future, tokens, enqueued = queue[0]
+            if future.done():
+                queue.popleft()
+                self._waiting_count -= 1
+                if not queue:
+                    del self._waiting[endpoint]
+                continue
+            now = time.monotonic()
+            delay = self._delay_for(tokens, now)
+            if delay > 0:
+                # 맨 앞 대기자가 들어갈 수 있을 때 다시 시도 (큰 호출이 계속 밀리지 않도록 순서 유지)
+                self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+                return
+            queue.popleft()
+            self._waiting_count -= 1
+            if queue:
+                self._waiting.move_to_end(endpoint)  # 다음 차례는 다른 엔드포인트
+            else:
+                del self._waiting[endpoint]
+            self._record_wait(now - enqueued)
+            future.set_result(self._admit(tokens, now))
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        if self._waiting:
+            self._pump()
+
+    def record_rate_limited(self):
+        """429를 받으면 잠시 새 호출을 멈춤 (진행 중인 호출과 대기열은 유지)"""
+        self._rate_limited += 1
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + settings.llm_governor_429_cooldown)
+        logger.warning(f"⚠️ [{self.name}] LLM 429 수신 - {settings.llm_governor_429_cooldown:g}초 동안 새 호출 보류")
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._expire(now)
+        waits = sorted(self._waits)
+        return {
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "max_inflight": self.max_inflight,
+            "in_flight": self.in_flight,
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": int(sum(entry[1] for entry in self._window)),
+            "queue_depth": self._waiting_count,
+            "queue_by_endpoint": {endpoint: len(queue) for endpoint, queue in self._waiting.items()},
+            "admitted": self._admitted,
+            "rate_limited": self._rate_limited,
+            "cooldown_remaining": round(max(0.0, self._cooldown_until - now), 1),
+            "wait_avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "wait_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3) if waits else 0.0,
+            "wait_max": round(self._max_wait, 3),
+        }
+
+
+class LLMGovernor:
+    """프로세스 전역 LLM 호출 거버너
+
+    - provider별 분당 요청 수(RPM), 분당 토큰 수(TPM), 동시 호출 수 제한 (워커가 여러 개면 워커 수로 나눔)
+    - 프롬프트 토큰은 tiktoken으로 추정하고 응답 토큰 예상치를 더해 예약, 호출 후 실제 사용량으로 보정
+    - 예산이 없으면 엔드포인트별 대기열에서 라운드 로빈으로 승인 (한 엔드포인트가 독점하지 않음)
+    - 429를 받으면 해당 provider의 새 호출을 잠시 멈춤
+    """
+
+    def __init__(self):
+        self._providers: Dict[str, _ProviderGovernor] = {}
+        self._loop = None
+
+    def _get(self, provider: str) -> _ProviderGovernor:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            for governor in self._providers.values():
+                governor.reset()
+
+        governor = self._providers.get(provider)
+        if governor is None:
+            limits = {
+                "gemini": (settings.gemini_llm_rpm, settings.gemini_llm_tpm, settings.gemini_llm_max_inflight),
+                "openai": (settings.openai_llm_rpm, settings.openai_llm_tpm, settings.openai_llm_max_inflight),
+            }
+            rpm, tpm, max_inflight = limits.get(provider, limits["openai"])
+            workers = settings.get_worker_count()
+            governor = _ProviderGovernor(
+                provider, rpm // workers if rpm else 0, tpm // workers if tpm else 0,
+                max(1, max_inflight // workers) if max_inflight else 0,
+            )
+            self._providers[provider] = governor
+        return governor
+
+    @asynccontextmanager
+    async def slot(self, provider: str, prompt_tokens: int, max_output_tokens: Optional[int] = None):
+        """호출 1건 동안 예산/슬롯 점유 - yield된 grant.record_usage(response)로 실제 토큰 보정"""
+        if not settings.llm_governor_enabled:
+            yield _Grant([0.0, 0.0])
+            return
+
+        governor = self._get(provider)
+        output_tokens = min(max_output_tokens or settings.llm_governor_output_tokens, settings.llm_governor_output_tokens)
+        endpoint = llm_endpoint.get()
+        started = time.monotonic()
+        entry = await governor.acquire(endpoint, prompt_tokens + output_tokens)
+        waited = time.monotonic() - started
+        if waited > 5.0:
+            logger.info(f"⏳ [{provider}] LLM 거버너 대기 {waited:.2f}초 (endpoint={endpoint}, tokens≈{prompt_tokens})")
+        try:
+            yield _Grant(entry)
+        except Exception as e:
+            if is_rate_limit_failure(e):
+                governor.record_rate_limited()
+            raise
+        finally:
+            governor.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.llm_governor_enabled,
+            "providers": {name: governor.get_stats() for name, governor in self._providers.items()},
+        }
+
+
+# 전역 LLM 거버너 (UnifiedLanguageModel의 모든 비동기 호출이 거침)
+llm_governor = LLMGovernor()
@@ -0,0 +1,299 @@
+"""
+LLM provider 상태 추적 (롤링 에러율/p95 지연, 서킷 브레이커, 재시도 예산)
+런타임에 provider가 타임아웃/5xx를 내기 시작하면 호출을 정상 provider로 돌리고,
+장애 중에도 재시도가 폭증하지 않도록 전체 요청 대비 재시도 비율을 제한합니다.
+"""
+
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Dict, Any, Deque, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('llm_health')
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderUnavailableError(RuntimeError):
+    """서킷이 열려 있어 호출을 보내지 않음 (다른 provider로 넘어가도 재시도 예산을 쓰지 않음)"""
+
+
+# provider SDK를 import하지 않고 클래스 이름(MRO)으로 판별하는 장애성 예외
+_FAILURE_TYPE_NAMES = frozenset({
+    # openai
+    "APITimeoutError", "APIConnectionError", "InternalServerError", "RateLimitError",
+    # google (google.genai.errors / google.api_core.exceptions)
+    "ServerError", "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "TooManyRequests",
+    "BadGateway", "GatewayTimeout",
+    # httpx (ConnectError/ReadTimeout 등은 하위 클래스)
+    "TimeoutException", "NetworkError", "RemoteProtocolError",
+})
+
+# 타입/상태 코드로 판별할 수 없을 때만 쓰는 메시지 표식 (단어 경계 기준)
+_FAILURE_MESSAGE = re.compile(
+    r"\b(?:timed out|internal server error|service unavailable|bad gateway|gateway timeout|overloaded"
+    r"|too many requests|rate limit(?:ed)?|resource[_ ]exhausted|quota exceeded"
+    r"|(?:error code|status(?: code)?)[: ]+(?:429|5\d\d))\b",
+    re.IGNORECASE,
+)
+
+# 레이트 리밋/쿼터 초과 예외 (거버너의 429 쿨다운 판별용)
+_RATE_LIMIT_TYPE_NAMES = frozenset({"RateLimitError", "ResourceExhausted", "TooManyRequests"})
+_RATE_LIMIT_MESSAGE = re.compile(
+    r"\b(?:too many requests|rate limit(?:ed)?|resource[_ ]exhausted|quota exceeded"
+    r"|(?:error code|status(?: code)?)[: ]+429)\b",
+    re.IGNORECASE,
+)
+
+
+def _error_chain(error: BaseException):
+    """감싼 예외까지 __cause__/__context__ 체인 순회 (순환 방지)"""
+    current: Optional[BaseException] = error
+    seen = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """SDK 예외의 HTTP 상태 코드 (openai status_code, google code, httpx response.status_code)"""
+    for source in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "code"):
+            value = getattr(source, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    return None
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """provider 장애로 볼 에러인지 (타임아웃, 연결 실패, 5xx, 429) - 잘못된 요청, 파싱/검증 에러 등은 제외
+
+    예외 타입과 상태 코드로 먼저 판별하고(감싼 예외는 __cause__ 체인을 따라 확인),
+    둘 다 없을 때만 메시지 표식을 단어 경계로 검사합니다.
+    """
+    for current in _error_chain(error):
+        if isinstance(current, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+            return True
+        if any(cls.__name__ in _FAILURE_TYPE_NAMES for cls in type(current).__mro__):
+            return True
+        status = _status_code(current)
+        if status is not None:
+            return status in (408, 429) or status >= 500
+    return bool(_FAILURE_MESSAGE.search(str(error)))
+
+
+def is_rate_limit_failure(error: BaseException) -> bool:
+    """429 / 쿼터 초과 에러인지 - is_provider_failure와 같은 순서(타입 → 상태 코드 → 메시지)로 판별"""
+    for current in _error_chain(error):
+        if any(cls.__name__ in _RATE_LIMIT_TYPE_NAMES for cls in type(current).__mro__):
+            return True
+        status = _status_code(current)
+        if status is not None:
+            return status == 429
+    return bool(_RATE_LIMIT_MESSAGE.search(str(error)))
+
+
+class _ProviderHealth:
+    """provider 하나의 롤링 윈도우와 서킷 상태"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self._samples: Deque[Tuple[float, bool, float]] = deque()  # (시각, 성공 여부, 지연)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._opens = 0
+        self._rejected = 0
+
+    def _expire(self, now: float):
+        while self._samples and now - self._samples[0][0] > settings.llm_health_window_seconds:
+            self._samples.popleft()
+
+    def error_rate(self, now: float) -> float:
+        self._expire(now)
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok, _ in self._samples if not ok) / len(self._samples)
+
+    def p95(self, now: float) -> float:
+        self._expire(now)
+        latencies = sorted(latency for _, ok, latency in self._samples if ok)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def is_degraded(self, now: float) -> bool:
+        """성공 응답의 p95가 기준보다 느린 상태"""
+        if not settings.llm_slow_p95_seconds:
+            return False
+        self._expire(now)
+        ok_count = sum(1 for _, ok, _ in self._samples if ok)
+        return ok_count >= settings.llm_breaker_min_requests and self.p95(now) > settings.llm_slow_p95_seconds
+
+    def available(self, now: float) -> bool:
+        """지금 호출을 보낼 수 있는 상태인지 (상태 변경 없음)"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now - self._opened_at >= settings.llm_breaker_open_seconds
+        return not self._probe_in_flight
+
+    def acquire(self, now: float) -> bool:
+        """호출 허용 여부 - 열린 지 충분히 지났으면 반개방으로 바꾸고 탐색 호출 1건만 허용"""
+        if self.state == OPEN and now - self._opened_at >= settings.llm_breaker_open_seconds:
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"🔎 [{self.name}] 서킷 반개방 - 탐색 호출 허용")
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self._rejected += 1
+        return False
+
+    def record(self, ok: bool, latency: float, now: float):
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            if ok:
+                # 탐색 성공 → 이전 실패 기록은 버리고 다시 닫음
+                self.state = CLOSED
+                self._samples.clear()
+                self._samples.append((now, ok, latency))
+                logger.info(f"✅ [{self.name}] 탐색 호출 성공 - 서킷 닫힘")
+            else:
+                self._open(now, "탐색 호출 실패")
+            return
+        if self.state == OPEN:
+            # 열리기 전에 나간 호출의 결과 - 상태에는 반영하지 않음
+            return
+
+        self._samples.append((now, ok, latency))
+        self._expire(now)
+        if not ok and len(self._samples) >= settings.llm_breaker_min_requests \
+                and self.error_rate(now) >= settings.llm_breaker_error_rate:
+            self._open(now, f"에러율 {self.error_rate(now):.0%}")
+
+    def abandon(self):
+        """탐색 호출이 결과 없이 취소된 경우 다음 탐색을 허용"""
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+
+    def _open(self, now: float, reason: str):
+        self.state = OPEN
+        self._opened_at = now
+        self._opens += 1
+        logger.warning(
+            f"🚫 [{self.name}] 서킷 열림 ({reason}) - {settings.llm_breaker_open_seconds:g}초 동안 다른 provider로 우회"
+        )
+
+    def get_stats(self, now: float) -> Dict[str, Any]:
+        self._expire(now)
+        return {
+            "state": self.state,
+            "requests_in_window": len(self._samples),
+            "error_rate": round(self.error_rate(now), 4),
+            "p95_latency": round(self.p95(now), 3),
+            "degraded": self.is_degraded(now),
+            "opens": self._opens,
+            "rejected": self._rejected,
+        }
+
+
+class ProviderHealthTracker:
+    """provider별 상태와 전역 재시도 예산
+
+    - 윈도우(llm_health_window_seconds) 안의 호출 결과로 에러율과 성공 응답 p95 지연을 계산
+    - 최소 호출 수 이상에서 에러율이 기준을 넘으면 서킷을 열고, 일정 시간 뒤 탐색 호출 1건으로 복구 확인
+    - 재시도는 윈도우 내 요청 수의 일정 비율(최소 llm_retry_budget_min건)까지만 허용
+    """
+
+    def __init__(self):
+        self._providers: Dict[str, _ProviderHealth] = {}
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._retries_total = 0
+        self._retries_denied = 0
+        self._rerouted = 0
+
+    def _get(self, provider: str) -> _ProviderHealth:
+        health = self._providers.get(provider)
+        if health is None:
+            health = self._providers[provider] = _ProviderHealth(provider)
+        return health
+
+    def rank(self, providers: List[str]) -> List[str]:
+        """호출 순서 결정 - 정상 → 느림 → 서킷 열림 순 (같은 등급이면 원래 우선순위 유지)"""
+        if not settings.llm_breaker_enabled:
+            return providers
+        now = time.monotonic()
+
+        def grade(provider: str) -> int:
+            health = self._get(provider)
+            if not health.available(now):
+                return 2
+            return 1 if health.is_degraded(now) else 0
+
+        ranked = sorted(providers, key=grade)
+        if ranked and providers and ranked[0] != providers[0]:
+            self._rerouted += 1
+        return ranked
+
+    def acquire(self, provider: str) -> bool:
+        if not settings.llm_breaker_enabled:
+            return True
+        return self._get(provider).acquire(time.monotonic())
+
+    def record(self, provider: str, ok: bool, latency: float):
+        if settings.llm_breaker_enabled:
+            self._get(provider).record(ok, latency, time.monotonic())
+
+    def abandon(self, provider: str):
+        if settings.llm_breaker_enabled:
+            self._get(provider).abandon()
+
+    def _expire(self, now: float):
+        window = settings.llm_health_window_seconds
+        for samples in (self._requests, self._retries):
+            while samples and now - samples[0] > window:
+                samples.popleft()
+
+    def record_request(self):
+        now = time.monotonic()
+        self._expire(now)
+        self._requests.append(now)
+
+    def try_retry(self) -> bool:
+        """재시도 예산이 남아 있으면 1건 차감하고 True"""
+        now = time.monotonic()
+        self._expire(now)
+        budget = max(settings.llm_retry_budget_min, int(len(self._requests) * settings.llm_retry_budget_ratio))
+        if len(self._retries) >= budget:
+            self._retries_denied += 1
+            return False
+        self._retries.append(now)
+        self._retries_total += 1
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._expire(now)
+        return {
+            "enabled": settings.llm_breaker_enabled,
+            "providers": {name: health.get_stats(now) for name, health in self._providers.items()},
+            "rerouted": self._rerouted,
+            "retries": self._retries_total,
+            "retries_in_window": len(self._retries),
+            "retries_denied": self._retries_denied,
+        }
+
+
+# 전역 provider 상태 추적기
+llm_provider_health = ProviderHealthTracker()
@@ -0,0 +1,76 @@
+"""
+LLM 호출 단일 비행(single-flight)
+같은 캐시 키의 호출이 동시에 들어오면 하나만 프로바이더로 보내고 나머지는 그 결과를 함께 기다립니다.
+(캐시는 완료된 호출만 돕기 때문에, 인기 도서 요청이 몰릴 때 동시에 나가는 같은 호출을 합침)
+"""
+
+import asyncio
+from typing import Dict, Any, Callable, Awaitable
+
+from app.utils.logger.setup import setup_logger
+
+logger = setup_logger('llm_single_flight')
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop):
+        self.task = task
+        self.loop = loop
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 진행 중인 호출 공유
+
+    - 첫 호출(leader)이 공유 태스크를 만들고, 같은 키의 후속 호출은 그 태스크를 기다림
+    - 대기자 하나가 취소되어도 다른 대기자가 남아 있으면 공유 호출은 계속 진행 (shield)
+    - 마지막 대기자까지 취소되면 공유 호출도 취소
+    - 예외는 모든 대기자에게 전달되고, 완료된 키는 바로 지워져 다음 호출은 새로 시작
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._abandoned = 0
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+        if call is None or call.loop is not loop or call.task.done():
+            call = _Call(loop.create_task(factory()), loop)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+            logger.debug(f"같은 LLM 호출이 진행 중이라 결과를 공유합니다 (대기자 {call.waiters + 1}명)")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # 결과를 기다리는 호출이 더 없으면 공유 호출도 중단
+                call.task.cancel()
+                self._forget(key, call)
+                self._abandoned += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self._leaders + self._coalesced
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+            "coalesced_ratio": round(self._coalesced / total, 4) if total else 0.0,
+            "abandoned": self._abandoned,
+        }
+
+
+# 전역 LLM 단일 비행 인스턴스
+llm_single_flight = SingleFlight()
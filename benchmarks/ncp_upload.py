@@ -0,0 +1,65 @@
+"""NCP 업로드 동시성 / 이벤트 루프 지연 측정
+
+로컬 S3 호환 서버(MinIO 등)를 대상으로 실행할 수 있습니다.
+
+    docker run -p 9000:9000 -e MINIO_ROOT_USER=minio -e MINIO_ROOT_PASSWORD=minio123 minio/minio server /data
+    NAVER_ENDPOINT_URL=http://localhost:9000 NCP_ADDRESSING_STYLE=path \
+    ACCESS=minio SECRET=minio123 NAVER_BUCKET_NAME=storymate \
+    python -m benchmarks.ncp_upload --count 50 --size-kb 64 --create-bucket
+
+업로드 중 이벤트 루프가 막히면 "loop lag" 값이 크게 증가합니다.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.repositories.storage import ncp_storage
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01):
+    """주기적으로 sleep 하며 예정보다 늦게 깨어난 최대 시간 측정"""
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - start - interval)
+    return max_lag
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="NCP 업로드 벤치마크")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--size-kb", type=int, default=64)
+    parser.add_argument("--create-bucket", action="store_true", help="버킷이 없으면 생성 (로컬 서버용)")
+    args = parser.parse_args()
+
+    if args.create_bucket:
+        try:
+            ncp_storage.s3_client.create_bucket(Bucket=ncp_storage.bucket_name)
+        except Exception as e:
+            print(f"create_bucket: {e}")
+
+    payload = os.urandom(args.size_kb * 1024)
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[ncp_storage.put_bytes(payload, f"BENCH/{i}.mp3") for i in range(args.count)],
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    max_lag = await lag_task
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    print(f"uploads: {args.count} x {args.size_kb}KB, concurrency={ncp_storage.max_concurrency}")
+    print(f"elapsed: {elapsed:.3f}s ({args.count / elapsed:.1f} files/s), failures: {len(failures)}")
+    print(f"max loop lag: {max_lag * 1000:.1f}ms")
+    if failures:
+        print(f"first failure: {failures[0]}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+"""유휴 WebSocket/SSE 연결 수천 개 유지 시 하트비트 비용 측정
+
+1) 프로세스 내부 모드 (기본): NotificationService에 가짜 연결을 붙여 타이머 휠만 측정
+
+    python -m benchmarks.notification_idle_clients --sse 5000 --ws 5000 --duration 30 --interval 2
+
+2) 서버 모드: 실행 중인 서버에 실제 SSE/WebSocket 클라이언트를 연결
+   (job_id는 이미 존재하는 작업이어야 함, ulimit -n 확인)
+
+    python -m benchmarks.notification_idle_clients --url http://localhost:14056 \
+        --job-id <job_id> --sse 1000 --ws 1000 --duration 60
+
+tick 비용과 이벤트 루프 지연이 연결 수에 따라 얼마나 늘어나는지 확인합니다.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01):
+    """주기적으로 sleep 하며 예정보다 늦게 깨어난 최대 시간 측정"""
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - start - interval)
+    return max_lag
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.received = 0
+
+    async def send_json(self, message):
+        self.received += 1
+
+    async def close(self):
+        pass
+
+
+async def run_in_process(args):
+    from app.config import settings
+    settings.notification_ws_ping_interval = args.interval
+    settings.notification_sse_heartbeat_interval = args.interval
+    settings.notification_ws_max_idle = 0  # 가짜 클라이언트는 ping을 보내지 않음
+
+    from app.services.voice.tts.notification import NotificationService
+    from app.services.voice.tts.broker import LocalBroker
+
+    service = NotificationService(broker=LocalBroker())
+    sockets = [_FakeWebSocket() for _ in range(args.ws)]
+    queues = [service.create_sse_queue() for _ in range(args.sse)]
+
+    start = time.perf_counter()
+    for i, websocket in enumerate(sockets):
+        await service.add_websocket_connection(f"job-{i % args.jobs}", websocket)
+    for i, queue in enumerate(queues):
+        await service.add_sse_connection(f"job-{i % args.jobs}", queue)
+    print(f"connected: ws={args.ws} sse={args.sse} in {time.perf_counter() - start:.3f}s")
+
+    async def drain(queue):
+        while True:
+            await queue.get()
+
+    drainers = [asyncio.create_task(drain(queue)) for queue in queues]
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+    await asyncio.sleep(args.duration)
+    stop.set()
+    max_lag = await lag_task
+
+    stats = service.get_connection_stats()["heartbeat"]
+    ws_beats = sum(websocket.received for websocket in sockets)
+    print(f"heartbeats delivered: ws={ws_beats}, timers fired={stats['fired']}")
+    print(f"wheel: {json.dumps(stats)}")
+    print(f"max loop lag: {max_lag * 1000:.1f}ms")
+
+    for task in drainers:
+        task.cancel()
+    for i, websocket in enumerate(sockets):
+        await service.remove_websocket_connection(f"job-{i % args.jobs}", websocket)
+    for i, queue in enumerate(queues):
+        await service.remove_sse_connection(f"job-{i % args.jobs}", queue)
+
+
+async def run_against_server(args):
+    import httpx
+    import websockets
+
+    counts = {"sse_events": 0, "ws_messages": 0, "sse_failed": 0, "ws_failed": 0}
+    stop = asyncio.Event()
+
+    async def sse_client(client: httpx.AsyncClient):
+        try:
+            async with client.stream("GET", f"{args.url}/api/v1/tts/jobs/{args.job_id}/stream") as response:
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        counts["sse_events"] += 1
+                    if stop.is_set():
+                        return
+        except Exception:
+            counts["sse_failed"] += 1
+
+    async def ws_client():
+        ws_url = args.url.replace("http", "ws", 1) + f"/api/v1/tts/jobs/{args.job_id}/ws"
+        try:
+            async with websockets.connect(ws_url) as websocket:
+                while not stop.is_set():
+                    try:
+                        await asyncio.wait_for(websocket.recv(), timeout=1)
+                        counts["ws_messages"] += 1
+                    except asyncio.TimeoutError:
+                        continue
+                    # 서버 유휴 타임아웃에 걸리지 않도록 주기적으로 ping
+                    await websocket.send("ping")
+        except Exception:
+            counts["ws_failed"] += 1
+
+    limits = httpx.Limits(max_connections=args.sse + 10, max_keepalive_connections=0)
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        tasks = [asyncio.create_task(sse_client(client)) for _ in range(args.sse)]
+        tasks += [asyncio.create_task(ws_client()) for _ in range(args.ws)]
+        await asyncio.sleep(args.duration)
+
+        stats = (await client.get(f"{args.url}/api/v1/tts/notifications/stats")).json()
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    print(f"client counts: {json.dumps(counts)}")
+    print(f"server connections: ws={stats['total_websocket_connections']} sse={stats['total_sse_connections']}")
+    print(f"server wheel: {json.dumps(stats.get('heartbeat'))}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="유휴 알림 연결 부하 테스트")
+    parser.add_argument("--sse", type=int, default=2000)
+    parser.add_argument("--ws", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=100, help="프로세스 내부 모드에서 연결을 나눌 작업 수")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--interval", type=int, default=2, help="프로세스 내부 모드의 하트비트 간격(초)")
+    parser.add_argument("--url", default=None, help="서버 모드: 서버 주소")
+    parser.add_argument("--job-id", default=None, help="서버 모드: 구독할 작업 ID")
+    args = parser.parse_args()
+
+    if args.url:
+        if not args.job_id:
+            parser.error("--url 사용 시 --job-id가 필요합니다")
+        await run_against_server(args)
+    else:
+        await run_in_process(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""TTS 오디오 후처리 경로 벤치마크 (파일 1개당 오버헤드)
+
+- 기존: tts_output/에 저장 → ffprobe로 duration 계산 → 파일을 다시 읽어 BytesIO로 업로드 준비 → 삭제
+- 변경: 메모리 상의 MP3 바이트에서 프레임 헤더로 duration 계산 → BytesIO로 업로드 준비
+
+실제 업로드는 제외하고 로컬 오버헤드만 측정합니다.
+
+사용법:
+    python -m benchmarks.tts_audio_path --iterations 200
+    python -m benchmarks.tts_audio_path --mp3 sample.mp3
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from io import BytesIO
+
+from app.repositories.tts.utils import get_mp3_duration
+
+
+def _synthetic_mp3(seconds: float) -> bytes:
+    """MPEG2 Layer3 24kHz mono 64kbps 프레임으로 구성된 MP3 바이트 생성 (Gemini 출력과 동일한 샘플레이트)"""
+    frame = b"\xff\xf3\x84\xc0" + b"\x00" * 188  # 프레임 길이 192바이트, 576샘플
+    frames = int(seconds * 24000 / 576)
+    return frame * frames
+
+
+def _ffprobe_duration(path: str):
+    result = subprocess.run(
+        ["ffprobe", "-v", "quiet", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, timeout=10,
+    )
+    return float(result.stdout.strip()) if result.returncode == 0 and result.stdout.strip() else None
+
+
+def run_disk_path(data: bytes, output_dir: str, index: int, use_ffprobe: bool) -> float:
+    start = time.perf_counter()
+    path = os.path.join(output_dir, f"bench_{index}.mp3")
+    with open(path, "wb") as f:
+        f.write(data)
+    if use_ffprobe:
+        _ffprobe_duration(path)
+    with open(path, "rb") as f:
+        BytesIO(f.read())
+    os.remove(path)
+    return time.perf_counter() - start
+
+
+def run_memory_path(data: bytes) -> float:
+    start = time.perf_counter()
+    get_mp3_duration(data)
+    BytesIO(data)
+    return time.perf_counter() - start
+
+
+def _report(name: str, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))]
+    print(
+        f"{name:<24} mean={statistics.mean(samples_ms):8.3f}ms  "
+        f"p50={statistics.median(samples_ms):8.3f}ms  p95={p95:8.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS 오디오 후처리 경로 벤치마크")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=4.0, help="합성 MP3 길이 (--mp3 미지정 시)")
+    parser.add_argument("--mp3", help="측정에 사용할 실제 MP3 파일")
+    args = parser.parse_args()
+
+    if args.mp3:
+        with open(args.mp3, "rb") as f:
+            data = f.read()
+    else:
+        data = _synthetic_mp3(args.seconds)
+
+    use_ffprobe = shutil.which("ffprobe") is not None
+    print(f"MP3 크기: {len(data)} bytes, 파싱된 duration: {get_mp3_duration(data)}초")
+    if use_ffprobe:
+        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
+            tmp.write(data)
+        print(f"ffprobe duration: {_ffprobe_duration(tmp.name)}초")
+        os.remove(tmp.name)
+    else:
+        print("⚠️ ffprobe가 없어 기존 경로는 디스크 왕복만 측정합니다.")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        disk = [run_disk_path(data, output_dir, i, use_ffprobe) for i in range(args.iterations)]
+    memory = [run_memory_path(data) for _ in range(args.iterations)]
+
+    _report("disk + ffprobe" if use_ffprobe else "disk only", disk)
+    _report("in-memory", memory)
+
+
+if __name__ == "__main__":
+    main()
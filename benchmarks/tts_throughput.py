@@ -0,0 +1,350 @@
+"""배치/연극 TTS 처리량 벤치마크 (실제 API 할당량 없이 오프라인 실행)
+
+별도 프로세스에 가짜 Gemini/OpenAI/Murf/NCP(S3) 서버를 띄우고, 실제 TTSService가
+그 서버를 호출하도록 주소를 바꿔 _process_batch_tts / _process_play_tts 전체 경로를 측정합니다.
+
+    python -m benchmarks.tts_throughput --kind batch --provider openai --sizes 10,100,1000
+    python -m benchmarks.tts_throughput --kind play --sizes 10,100 --latency-median 1.5 --rate-429 0.05
+    python -m benchmarks.tts_throughput --kind batch --provider gemini --latency-sigma 0.8 --audio-cps 12
+
+가짜 서버 옵션:
+  --latency-median/--latency-sigma  응답 지연 (로그 정규 분포, 초)
+  --rate-429                        429 응답 비율
+  --audio-cps                       텍스트 글자 수 → 오디오 길이 (초당 글자 수, 응답 크기 결정)
+
+출력: 작업 크기별 files/sec, 파일당 지연 p50/p95/p99, 이벤트 루프 지연, RSS 증가량, 가짜 서버 요청/429 수.
+Gemini 경로는 PCM → MP3 인코딩에 ffmpeg가 필요합니다. 오디오 캐시는 기본으로 끄고 (--cache로 켬),
+텍스트마다 실행 ID를 붙여 작업 간 캐시/중복 제거가 결과를 왜곡하지 않게 합니다.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import resource
+import socket
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+_BUCKET = "bench"
+# MPEG2 Layer3 24kHz mono 64kbps 프레임 (192바이트, 576샘플)
+_MP3_FRAME = b"\xff\xf3\x84\xc0" + b"\x00" * 188
+
+
+# ----------------------------------------------------------------------
+# 가짜 프로바이더 서버 (별도 프로세스)
+# ----------------------------------------------------------------------
+def _audio_seconds(text: str, cps: float) -> float:
+    return max(0.5, len(text) / cps)
+
+
+def _synthetic_mp3(seconds: float) -> bytes:
+    return _MP3_FRAME * max(1, int(seconds * 24000 / 576))
+
+
+def _decode_aws_chunked(body: bytes) -> bytes:
+    """aws-chunked 전송 본문 (크기;chunk-signature=...\\r\\n데이터\\r\\n ...) 에서 데이터만 추출"""
+    data = bytearray()
+    position = 0
+    while position < len(body):
+        line_end = body.index(b"\r\n", position)
+        size = int(body[position:line_end].split(b";")[0], 16)
+        if size == 0:
+            break
+        data.extend(body[line_end + 2:line_end + 2 + size])
+        position = line_end + 2 + size + 2
+    return bytes(data)
+
+
+def _run_fake_server(port: int, options: dict):
+    from aiohttp import web
+
+    objects = {}
+    stats = {"gemini": 0, "openai": 0, "murf": 0, "murf_audio": 0, "s3_put": 0, "s3_get": 0, "rate_limited": 0}
+
+    async def delay_or_429(provider: str):
+        """지연 후 429 여부 반환"""
+        stats[provider] += 1
+        await asyncio.sleep(min(60.0, random.lognormvariate(math.log(options["latency_median"]), options["latency_sigma"])))
+        if random.random() < options["rate_429"]:
+            stats["rate_limited"] += 1
+            return True
+        return False
+
+    async def gemini(request):
+        body = await request.json()
+        text = body["contents"][0]["parts"][0]["text"]
+        if await delay_or_429("gemini"):
+            return web.json_response(
+                {"error": {"code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"}},
+                status=429,
+            )
+        pcm = b"\x00\x00" * int(_audio_seconds(text, options["audio_cps"]) * 24000)
+        payload = {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"inlineData": {
+                    "mimeType": "audio/L16;codec=pcm;rate=24000",
+                    "data": base64.b64encode(pcm).decode(),
+                }}]},
+                "finishReason": "STOP",
+            }]
+        }
+        if ":streamGenerateContent" in request.path:
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            await response.write(f"data: {json.dumps(payload)}\r\n\r\n".encode())
+            await response.write_eof()
+            return response
+        return web.json_response(payload)
+
+    async def openai(request):
+        body = await request.json()
+        if await delay_or_429("openai"):
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+                status=429,
+            )
+        return web.Response(body=_synthetic_mp3(_audio_seconds(body["input"], options["audio_cps"])), content_type="audio/mpeg")
+
+    async def murf(request):
+        body = await request.json()
+        if await delay_or_429("murf"):
+            return web.json_response({"errorMessage": "Too many requests", "errorCode": 429}, status=429)
+        seconds = _audio_seconds(body["text"], options["audio_cps"])
+        name = f"{uuid.uuid4().hex}.mp3"
+        objects[f"murf/{name}"] = _synthetic_mp3(seconds)
+        words = body["text"].split()
+        step = seconds * 1000 / max(1, len(words))
+        return web.json_response({
+            "audioFile": f"http://127.0.0.1:{port}/murf/audio/{name}",
+            "audioLengthInSeconds": seconds,
+            "consumedCharacterCount": len(body["text"]),
+            "remainingCharacterCount": 1_000_000,
+            "encodedAudio": None,
+            "warning": "",
+            "wordDurations": [
+                {"word": word, "startMs": int(i * step), "endMs": int((i + 1) * step)} for i, word in enumerate(words)
+            ],
+        })
+
+    async def murf_audio(request):
+        stats["murf_audio"] += 1
+        data = objects.pop(f"murf/{request.match_info['name']}", None)
+        if data is None:
+            return web.Response(status=404)
+        return web.Response(body=data, content_type="audio/mpeg")
+
+    async def s3_object(request):
+        key = request.match_info["key"]
+        if request.method == "PUT":
+            stats["s3_put"] += 1
+            body = await request.read()
+            if "aws-chunked" in request.headers.get("Content-Encoding", "") or \
+                    request.headers.get("x-amz-content-sha256", "").startswith("STREAMING-"):
+                body = _decode_aws_chunked(body)
+            objects[key] = body
+            return web.Response(headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+        stats["s3_get"] += 1
+        data = objects.get(key)
+        if data is None:
+            return web.Response(status=404, text="<Error><Code>NoSuchKey</Code></Error>", content_type="application/xml")
+        if request.method == "HEAD":
+            return web.Response(headers={"Content-Length": str(len(data))})
+        return web.Response(body=data, content_type="application/octet-stream")
+
+    async def get_stats(request):
+        return web.json_response({**stats, "stored_objects": len(objects)})
+
+    app = web.Application(client_max_size=256 * 1024 * 1024)
+    app.router.add_post("/gemini/{tail:.*}", gemini)
+    app.router.add_post("/openai/v1/audio/speech", openai)
+    app.router.add_post("/murf/v1/speech/generate", murf)
+    app.router.add_get("/murf/audio/{name}", murf_audio)
+    app.router.add_get("/_stats", get_stats)
+    app.router.add_route("*", "/{key:.+}", s3_object)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"가짜 서버가 {timeout}초 안에 시작되지 않음 (port {port})")
+
+
+def _configure_environment(base_url: str, args):
+    """app 모듈 import 전에 프로바이더 주소/키와 저장소 설정을 가짜 서버용으로 지정"""
+    os.environ.update({
+        "GEMINI_TTS_BASE_URL": f"{base_url}/gemini/",
+        "OPENAI_TTS_BASE_URL": f"{base_url}/openai/v1",
+        "MURF_BASE_URL": f"{base_url}/murf",
+        "NAVER_ENDPOINT_URL": base_url,
+        "NCP_ADDRESSING_STYLE": "path",
+        "NAVER_BUCKET_NAME": _BUCKET,
+        "GEMINI_API_KEY": "bench", "OPENAI_API_KEY": "bench", "MURF_API_KEY": "bench",
+        "ACCESS": "bench", "SECRET": "bench", "NCP_ACCESS_KEY": "bench", "NCP_SECRET_KEY": "bench",
+        "AWS_REQUEST_CHECKSUM_CALCULATION": "when_required",
+        "DEFAULT_TTS_PROVIDER": args.provider,
+        "TTS_CACHE_ENABLED": "true" if args.cache else "false",
+        "TTS_CACHE_DIR": os.path.join(args.workdir, "tts_cache"),
+        "TTS_JOB_STORE_PERSISTENT": "false",
+        "TTS_JOB_RESUME_ON_STARTUP": "false",
+        "PLAY_TTS_SCENE_BATCHING": "true" if args.scene_batching else "false",
+        "NOTIFICATION_BROKER": "local",
+    })
+
+
+# ----------------------------------------------------------------------
+# 측정
+# ----------------------------------------------------------------------
+def _rss_mb() -> float:
+    """현재 RSS (MB) - /proc가 없으면 최대 RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _measure_loop_lag(stop: asyncio.Event, samples: list, interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _file_latency(info: dict):
+    if info.get("start_time") and info.get("end_time"):
+        return (datetime.fromisoformat(info["end_time"]) - datetime.fromisoformat(info["start_time"])).total_seconds()
+    return info.get("generation_time")
+
+
+async def _run_job(service, args, size: int, run_id: str) -> dict:
+    from app.models.voice.tts import TTSRequest, PlayTTSRequest, TTSJobStatus
+
+    sentence = "오늘은 날씨가 맑아서 친구들과 함께 공원에 산책을 나갔습니다"
+    if args.kind == "play":
+        roles = ["철수", "영희"]
+        script = [f"{roles[i % 2]}: {sentence} ({run_id}-{i})" for i in range(size)]
+        response = await service.generate_play_tts(PlayTTSRequest(script=script, language="ko"))
+    else:
+        texts = [f"{sentence} ({run_id}-{i})" for i in range(size)]
+        response = await service.generate_batch_tts(TTSRequest(texts=texts, batch_size=args.batch_size))
+
+    job_id = response.job_id
+    while True:
+        job = service.jobs.get(job_id)
+        if job["status"] in (TTSJobStatus.COMPLETED, TTSJobStatus.FAILED):
+            return job
+        await asyncio.sleep(0.05)
+
+
+async def _fetch_server_stats(base_url: str) -> dict:
+    import httpx
+    async with httpx.AsyncClient() as client:
+        return (await client.get(f"{base_url}/_stats")).json()
+
+
+async def run(args, base_url: str):
+    from app.services.voice.tts.generator import TTSService
+    from app.repositories.tts import get_rate_limiter_stats, tts_scheduler
+
+    service = TTSService()
+    header = f"{'size':>6} {'ok':>6} {'fail':>5} {'wall(s)':>8} {'files/s':>8} " \
+             f"{'p50':>7} {'p95':>7} {'p99':>7} {'lag p99':>8} {'lag max':>8} {'rss +MB':>8}"
+    print(f"kind={args.kind} provider={args.provider if args.kind == 'batch' else 'murf'} "
+          f"latency=lognormal(median={args.latency_median}s, sigma={args.latency_sigma}) 429={args.rate_429:.0%}")
+    print(header)
+
+    for size in args.sizes:
+        before = await _fetch_server_stats(base_url)
+        rss_before = _rss_mb()
+        lag_samples: list = []
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_measure_loop_lag(stop, lag_samples))
+
+        started = time.perf_counter()
+        job = await _run_job(service, args, size, uuid.uuid4().hex[:8] if not args.cache else "cache")
+        wall = time.perf_counter() - started
+        stop.set()
+        await lag_task
+
+        latencies = [value for value in (_file_latency(info) for info in job["files"]) if value is not None]
+        after = await _fetch_server_stats(base_url)
+        print(
+            f"{size:>6} {job['completed_files']:>6} {job['failed_files']:>5} {wall:>8.2f} "
+            f"{job['completed_files'] / wall:>8.2f} "
+            f"{_percentile(latencies, 0.5):>7.2f} {_percentile(latencies, 0.95):>7.2f} {_percentile(latencies, 0.99):>7.2f} "
+            f"{_percentile(lag_samples, 0.99) * 1000:>6.1f}ms {max(lag_samples, default=0) * 1000:>6.1f}ms "
+            f"{_rss_mb() - rss_before:>8.1f}"
+        )
+        requests = {key: after[key] - before.get(key, 0) for key in after if key != "stored_objects"}
+        print(f"       server: {json.dumps(requests)}")
+
+    if args.verbose:
+        print(f"scheduler: {json.dumps(tts_scheduler.get_stats(), ensure_ascii=False)}")
+        print(f"rate limiters: {json.dumps(get_rate_limiter_stats(), ensure_ascii=False)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치/연극 TTS 처리량 벤치마크 (가짜 프로바이더 서버)")
+    parser.add_argument("--kind", choices=["batch", "play"], default="batch")
+    parser.add_argument("--provider", choices=["openai", "gemini", "murf"], default="openai", help="배치 TTS 제공자")
+    parser.add_argument("--sizes", default="10,100,1000", help="작업 크기(텍스트 수) 목록")
+    parser.add_argument("--batch-size", type=int, default=10, help="배치 TTS 동시 처리 수 (1~10)")
+    parser.add_argument("--latency-median", type=float, default=1.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--audio-cps", type=float, default=15.0, help="오디오 초당 글자 수 (응답 크기)")
+    parser.add_argument("--cache", action="store_true", help="오디오 캐시 사용 (같은 텍스트로 반복 실행)")
+    parser.add_argument("--scene-batching", action="store_true", help="연극 TTS 장면 배치 모드")
+    parser.add_argument("--verbose", action="store_true", help="스케줄러/레이트 리미터 상태 출력")
+    args = parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    port = _free_port()
+    options = {
+        "latency_median": args.latency_median,
+        "latency_sigma": args.latency_sigma,
+        "rate_429": args.rate_429,
+        "audio_cps": args.audio_cps,
+    }
+    server = multiprocessing.Process(target=_run_fake_server, args=(port, options), daemon=True)
+    server.start()
+    try:
+        _wait_for_port(port)
+        with tempfile.TemporaryDirectory() as workdir:
+            args.workdir = workdir
+            base_url = f"http://127.0.0.1:{port}"
+            _configure_environment(base_url, args)
+            asyncio.run(run(args, base_url))
+    finally:
+        server.terminate()
+        server.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()